@@ -0,0 +1,165 @@
+"""
+Planejador anytime ARA* (Likhachev, Gordon & Thrun) com prazo por frame.
+
+O astar_search do AIMA roda até o fim: num frame ruim (alvo cercado pelos
+fantasmas) a busca pode levar muitos milissegundos e travar o loop a 60 FPS.
+O ARA* roda um A* ponderado (f = g + w·h) com w alto, que acha um caminho
+rápido, e vai baixando w enquanto sobra tempo. Entre as iterações só os
+estados inconsistentes (INCONS) voltam para a fila, então cada melhoria
+reaproveita a busca anterior.
+
+A cada chamada o resultado traz as ações, o custo, o limite de
+subotimalidade alcançado (custo <= bound · ótimo) e as expansões. Se o
+prazo acaba antes de achar qualquer caminho, a primeira ação vai em direção
+ao estado da fronteira com menor h (bound infinito): o Pac-Man sempre tem
+um passo válido para dar.
+
+Funciona com qualquer Problem do AIMA que tenha h(node) (PacmanGridProblem,
+PacmanSpaceTimeProblem, ...). Os estados ficam em dicionários; o h de cada
+estado é calculado uma única vez.
+"""
+
+import heapq
+import time
+
+from search import Node
+
+INF = float("inf")
+DEFAULT_DEADLINE = 0.002 # 2 ms por chamada
+
+
+class ARAResult:
+    __slots__ = ("solution", "path", "cost", "bound", "expansions", "iterations", "elapsed")
+
+    def __init__(self, solution, path, cost, bound, expansions, iterations, elapsed):
+        self.solution = solution      # Ações do melhor caminho (ou do prefixo até a fronteira)
+        self.path = path              # Estados do caminho, do início ao fim
+        self.cost = cost              # Custo do caminho (INF se nenhum objetivo foi alcançado)
+        self.bound = bound            # custo <= bound · ótimo (1.0: ótimo provado)
+        self.expansions = expansions
+        self.iterations = iterations  # Iterações de w concluídas
+        self.elapsed = elapsed
+
+    @property
+    def complete(self) -> bool:
+        return self.cost < INF
+
+    def __repr__(self):
+        return (f"<ARAResult cost={self.cost} bound={self.bound:.2f} "
+                f"expansions={self.expansions} iterations={self.iterations}>")
+
+
+class ARAStarPlanner:
+    def __init__(self, deadline: float = DEFAULT_DEADLINE, weight: float = 2.5, decrement: float = 0.5,
+                 clock=time.perf_counter):
+        if weight < 1:
+            raise ValueError("weight deve ser >= 1")
+        self.deadline = deadline
+        self.weight = weight
+        self.decrement = decrement
+        self.clock = clock
+        self.last = None # Resultado da última chamada
+        self.calls = 0
+        self.total_expansions = 0
+
+    def search(self, problem, h=None) -> ARAResult:
+        start_time = self.clock()
+        stop = start_time + self.deadline
+        h = h or problem.h
+        hv = {}
+
+        def heuristic(state):
+            value = hv.get(state)
+            if value is None:
+                value = hv[state] = h(Node(state))
+            return value
+
+        start = problem.initial
+        g = {start: 0}
+        parent = {start: None} # estado -> (estado anterior, ação)
+        goal, goal_g = None, INF
+        if problem.goal_test(start):
+            goal, goal_g = start, 0
+
+        w = self.weight
+        open_heap, closed, incons = [], set(), set()
+        counter = 0 # Desempate FIFO no heap (os estados podem não ser comparáveis)
+        heapq.heappush(open_heap, (w * heuristic(start), counter, start))
+        in_open = {start}
+        expansions, iterations, timed_out = 0, 0, False
+        proven = INF # w da última iteração concluída
+
+        while True:
+            # ImprovePath: A* ponderado até o objetivo não poder mais melhorar nesta iteração
+            while open_heap:
+                f, _, state = open_heap[0]
+                if state not in in_open or state in closed:
+                    heapq.heappop(open_heap)
+                    continue
+                if goal_g <= f:
+                    break
+                if self.clock() > stop:
+                    timed_out = True
+                    break
+                heapq.heappop(open_heap)
+                in_open.discard(state)
+                closed.add(state)
+                expansions += 1
+                gs = g[state]
+                for action in problem.actions(state):
+                    child = problem.result(state, action)
+                    cost = problem.path_cost(gs, state, action, child)
+                    if cost < g.get(child, INF):
+                        g[child] = cost
+                        parent[child] = (state, action)
+                        if problem.goal_test(child) and cost < goal_g:
+                            goal, goal_g = child, cost
+                        if child in closed:
+                            incons.add(child)
+                        else:
+                            counter += 1
+                            heapq.heappush(open_heap, (cost + w * heuristic(child), counter, child))
+                            in_open.add(child)
+            if timed_out:
+                break
+            iterations += 1
+            proven = w
+            if w <= 1 or goal is None:
+                break # Ótimo provado (ou não existe caminho)
+            # Próxima iteração: w menor, INCONS de volta à fila e CLOSED esvaziado
+            w = max(1.0, w - self.decrement)
+            in_open |= incons
+            incons, closed = set(), set()
+            open_heap = []
+            for state in in_open:
+                counter += 1
+                open_heap.append((g[state] + w * heuristic(state), counter, state))
+            heapq.heapify(open_heap)
+
+        # Limite de subotimalidade (ε' do ARA*): custo / min(g + h) nos estados pendentes,
+        # e nunca pior que o w da última iteração concluída
+        lower = min((g[s] + heuristic(s) for s in in_open | incons), default=INF)
+        if goal is None:
+            bound = INF
+        elif goal_g <= lower:
+            bound = 1.0
+        else:
+            bound = min(proven, goal_g / lower)
+
+        end = goal
+        if end is None:
+            # Sem caminho ainda: segue até o estado alcançado mais promissor
+            end = min(g, key=lambda s: (heuristic(s), g[s]))
+        solution, path = [], [end]
+        while parent[end] is not None:
+            end, action = parent[end]
+            solution.append(action)
+            path.append(end)
+        solution.reverse()
+        path.reverse()
+
+        result = ARAResult(solution, path, goal_g, bound, expansions, iterations, self.clock() - start_time)
+        self.last = result
+        self.calls += 1
+        self.total_expansions += expansions
+        return result
@@ -1,13 +1,25 @@
 import sys
 import os
-from env.pacman_gamestate import GameState, RIGHT, LEFT, UP, DOWN
-from problems.pacman_problem import PacmanGridProblem
+from env.engine import PacmanEngine, RIGHT, LEFT, UP, DOWN
+from problems.pacman_problem import (PacmanGridProblem, PacmanFoodProblem, PacmanSpaceTimeProblem,
+                                     walkable_mask, danger_cells)
+from problems.maze_distances import get_maze_distances, MAX_TABLE_CELLS
+from agents.dstar_lite import DStarLitePlanner
+from agents.scheduler import DecisionScheduler, RecordingProblem
+from agents.plan_cache import PlanCache
+from agents.food_index import FoodIndex, BFSFoodIndex
+from agents.ghost_predictor import GhostPredictor
+from agents.ara_star import ARAStarPlanner, DEFAULT_DEADLINE
+from problems.junction_graph import JunctionGraph, plan as plan_junctions
+from problems.flat_astar import FlatGridAStar
+from problems.next_hop import get_next_hops
+from problems.landmarks import grid_landmarks
 
 # Importa as direções e o motor do jogo
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from search import astar_search
+    from search import astar_search, breadth_first_graph_search
 except ImportError:
     print("Erro: O repositório aima-python (search.py) não foi encontrado.")
     sys.exit(1)
@@ -16,6 +28,17 @@ WIDTH, HEIGHT = 900, 950
 NUM1 = (HEIGHT - 50) // 32   # Altura da célula na tela
 NUM2 = WIDTH // 30           # Largura da célula na tela
 
+# Sugestão para stall_frames (opcional, desligado por padrão): frames sem comer nem perder
+# vida (10 s) até o agente planejar ignorando os fantasmas. Em labirintos gerados um fantasma
+# pode ficar rodando na saída de um bolsão, ou indo e voltando entre duas células que cortam,
+# cada uma, um dos caminhos até a comida (o plano troca de lado a cada passo dele)
+STALL_FRAMES = 600
+
+# Planejadores do agente (um por vez): A* do zero a cada replanejamento ou uma das variantes
+PLANNERS = ("astar", "incremental", "multi_goal", "hierarchical", "space_time", "anytime", "routing")
+# O agendador só sabe quando refazer o A* do grid (com ou sem a tabela de rotas)
+SCHEDULED_PLANNERS = ("astar", "routing")
+
 def pixel_to_grid(px: float, py: float):
     """Converte a posição física (pixels) para (Linha, Coluna) na matriz."""
     return int((py + 24) // NUM1), int((px + 23) // NUM2)
@@ -24,23 +47,67 @@ def pixel_to_grid(px: float, py: float):
 #  AGENTE A* ONLINE
 # ======================================================================
 class GridAStarAgent:
-    def __init__(self, game: GameState):
+    def __init__(self, game: PacmanEngine, planner: str = "astar", scheduled: bool = None,
+                 plan_cache: bool = False, deadline: float = DEFAULT_DEADLINE, flat: bool = None,
+                 stall_frames: int = None):
+        if planner not in PLANNERS:
+            raise ValueError(f"planejador desconhecido: {planner!r} (opções: {', '.join(PLANNERS)})")
+        # Otimizações que só valem para alguns planejadores: pedidas fora deles, erro em vez de sumirem
+        if scheduled and planner not in SCHEDULED_PLANNERS:
+            raise ValueError(f"o agendador não se aplica ao planejador {planner!r}")
+        if plan_cache and planner in ("incremental", "space_time"):
+            raise ValueError(f"o cache de planos não se aplica ao planejador {planner!r}")
+        if flat and planner == "anytime":
+            raise ValueError("o A* plano não tem prazo: não combina com o planejador 'anytime'")
         self.game = game
+        # Preso há stall_frames frames: arrisca o caminho ignorando os fantasmas (None: nunca)
+        self.stall_frames = stall_frames
+        # Vários objetivos: uma BFS até a primeira comida alcançável em vez de alvo + A*
+        self.multi_goal = planner == "multi_goal"
+        # Hierárquico: A* no grafo de junções (corredores comprimidos), refinando só o 1º trecho
+        self.junctions = JunctionGraph(game.level) if planner == "hierarchical" else None
+        # Espaço-tempo: A* em (célula, passo) contra a trajetória prevista dos fantasmas
+        self.predictor = GhostPredictor() if planner == "space_time" else None
+        # As paredes não mudam durante o jogo: a tabela é carregada uma vez (cache em disco).
+        # Boards grandes (acima de MAX_TABLE_CELLS): marcos ALT, O(k·células), no lugar dela
+        self.walkable = walkable_mask(game.level)
+        if sum(self.walkable) <= MAX_TABLE_CELLS:
+            self.distances, self.landmarks = get_maze_distances(game.level), None
+            # Comida mais próxima pelo labirinto, sem varrer o board a cada frame
+            self.food_index = FoodIndex(self.distances)
+        else:
+            self.distances, self.landmarks = None, grid_landmarks(game.level)
+            self.food_index = BFSFoodIndex(game.level)
+        # Modo incremental: D* Lite reaproveita a busca entre frames em vez de refazer o A*
+        self.planner = (DStarLitePlanner(game.level, self.distances, self.landmarks)
+                        if planner == "incremental" else None)
+        # A* do grid sobre índices planos e buffers reaproveitados (mesmas ações do astar_search)
+        self.flat = FlatGridAStar(game.level) if (planner != "anytime" if flat is None else flat) else None
+        # Roteamento: tabela de próximo passo; o A* só roda quando o perigo corta a rota
+        # (ela sai da tabela de distâncias, que boards grandes não têm)
+        if planner == "routing" and self.distances is None:
+            raise ValueError(f"o roteamento precisa da tabela de distâncias (board acima de {MAX_TABLE_CELLS} células)")
+        self.routes = get_next_hops(game.level) if planner == "routing" else None
+        # Anytime: ARA* com prazo por chamada no lugar do A* completo (latência limitada)
+        self.anytime = ARAStarPlanner(deadline) if planner == "anytime" else None
+        # Agendador: só roda o A* quando algo que a busca enxerga mudou
+        self.scheduler = (DecisionScheduler(game.level)
+                          if (planner in SCHEDULED_PLANNERS if scheduled is None else scheduled) else None)
+        # Cache de planos: segue o caminho inteiro do A* enquanto ele continuar seguro
+        self.rows, self.cols = len(game.level), len(game.level[0])
+        self.plan_cache = PlanCache(self.rows, self.cols) if plan_cache else None
+        # Frames desde a última comida ou vida perdida (ver stall_frames)
+        self._progress, self._hungry_frames = None, 0
+        # Comida escolhida pela BFS quando o alvo mais próximo estava cercado: o agente
+        # segue para ela até comê-la, em vez de alternar entre os dois alvos enquanto o
+        # fantasma oscila na borda da zona de perigo
+        self.detour = None
 
     def get_action(self):
         # 1. Percebe sua própria posição no grid
         p_row, p_col = pixel_to_grid(self.game.player_x, self.game.player_y)
-        
-        # 2. Percebe todas as comidas restantes no grid
-        foods = []
-        for i in range(33):
-            for j in range(30):
-                if self.game.level[i][j] in (1, 2):
-                    foods.append((i, j))
-                    
-        if not foods: 
-            return None # Venceu
-        
+        p_col %= self.cols # Na boca do túnel o pixel cai uma coluna fora do board: é a do outro lado
+
         # 3. Percebe os fantasmas ativos para desviar
         ghosts = []
         if not self.game.powerup:
@@ -52,22 +119,161 @@ class GridAStarAgent:
             ]:
                 if not dead:
                     ghosts.append(pixel_to_grid(gx, gy))
-                
-        # 4. Define o objetivo: A comida mais próxima
-        target = min(foods, key=lambda f: abs(p_row - f[0]) + abs(p_col - f[1]))
-        
+
+        food_count = len(self.game.active_food) + len(self.game.active_capsules)
+        if (food_count, self.game.lives) != self._progress:
+            self._progress, self._hungry_frames = (food_count, self.game.lives), 0
+        else:
+            self._hungry_frames += 1
+        stuck = self.stall_frames is not None and self._hungry_frames > self.stall_frames
+        if stuck:
+            # Preso há muito tempo: arrisca o caminho mais curto (ou passa, ou perde uma vida
+            # e os fantasmas voltam para a casa)
+            ghosts = []
+
+        # Plano guardado ainda válido (alvo existe e caminho sem fantasmas): próximo passo dele
+        if self.plan_cache is not None:
+            action = self.plan_cache.next_action((p_row, p_col), ghosts, self._has_food)
+            if action is not None:
+                return action
+
+        # Agendador: fora de junções e sem mudança de alvo/perigo relevante, mantém o plano
+        scheduler = self.scheduler
+        if scheduler is not None and food_count and not scheduler.needs_replan(
+                (p_row, p_col), food_count, ghosts, self._has_food, self._target_food):
+            return scheduler.action if scheduler.action is not None else self._failsafe()
+
+        # 5''. Vários objetivos: a BFS já escolhe a comida mais próxima alcançável
+        if self.multi_goal:
+            return self._plan_to_any_food((p_row, p_col), ghosts)
+
+        # 2. e 4. Percebe as comidas restantes e define o objetivo: a mais próxima
+        target = self._target_food((p_row, p_col))
+        if target is None:
+            return None # Venceu
+
+        # 5'. Modo incremental: só repara a busca do frame anterior
+        if self.planner is not None and (p_row, p_col) in self.planner.walkable:
+            if target == (p_row, p_col):
+                return self._failsafe()
+            action = self.planner.plan((p_row, p_col), target, ghosts)
+            if action is not None:
+                return action
+            return self._plan_to_any_food((p_row, p_col), ghosts)
+
+        # 5'''. Hierárquico: só o primeiro corredor do plano abstrato vira ação do grid
+        if self.junctions is not None and (p_row, p_col) in self.junctions.walkable:
+            segments = plan_junctions(self.junctions, (p_row, p_col), target, ghosts, self.distances,
+                                      self.landmarks)
+            if segments:
+                corridor, i, _ = segments[0]
+                return corridor.actions[i]
+            return self._plan_to_any_food((p_row, p_col), ghosts)
+
+        # 5''''. Espaço-tempo: o perigo de cada célula é o do passo em que o Pac-Man chegaria nela
+        if self.predictor is not None and target != (p_row, p_col) and not stuck:
+            problem = PacmanSpaceTimeProblem((p_row, p_col), target, self.game.level,
+                                             self.predictor.danger_by_step(self.game),
+                                             self.distances, self.walkable, self.landmarks)
+            solution, _ = self._search(problem)
+            return solution[0] if solution else self._plan_to_any_food((p_row, p_col), ghosts)
+
+        # Já está sobre a comida alvo: o A* só faria o teste de objetivo (solução vazia)
+        if scheduler is not None and target == (p_row, p_col):
+            scheduler.commit((p_row, p_col), food_count, ghosts, target, set())
+            return self._failsafe()
+
+        # 5'''''. Roteamento: se nenhuma célula da rota da tabela está em perigo, ela é um plano ótimo
+        if self.routes is not None:
+            route = self.routes.route((p_row, p_col), target)
+            if route is not None and (not ghosts or danger_cells(ghosts, self.rows, self.cols).isdisjoint(route[0][1:])):
+                path, solution = route
+                if self.plan_cache is not None:
+                    self.plan_cache.store(path, solution, ghosts, target)
+                if scheduler is not None:
+                    scheduler.commit((p_row, p_col), food_count, ghosts, target, set(path[:-1]), path, solution)
+                return solution[0]
+
         # 5. Formula o problema para as classes do AIMA
-        problem = PacmanGridProblem((p_row, p_col), target, self.game.level, ghosts)
-        
-        # 6. Executa a Busca A*
-        node = astar_search(problem, problem.h)
-        
-        # 7. Retorna a ação
-        if node and len(node.solution()) > 0:
-            return node.solution()[0]
+        problem = PacmanGridProblem((p_row, p_col), target, self.game.level, ghosts, self.distances,
+                                    self.walkable, self.landmarks)
+        expanded = set() if scheduler is not None else None
+        if self.flat is not None and self.anytime is None:
+            # 6. Executa a Busca A* (sem Nodes) e 7. guarda o plano inteiro (caminho e ações)
+            solution = self.flat.solve(problem, expanded) or []
+            path = self.flat.path if solution else None
         else:
-            # Failsafe: Se estiver encurralado pelos fantasmas, pega a primeira saída válida do motor
-            for d in [RIGHT, LEFT, UP, DOWN]:
-                if self.game.turns_allowed[d]:
-                    return d
-            return self.game.direction
\ No newline at end of file
+            if scheduler is not None:
+                problem = RecordingProblem(problem)
+                expanded = problem.expanded
+            # 6. Executa a Busca A* e 7. guarda o plano inteiro (caminho e ações), calculado uma única vez
+            solution, path = self._search(problem)
+        if not solution:
+            # Alvo cercado pelos fantasmas: vai para outra comida alcançável com segurança
+            # em vez de esperar parado (se os fantasmas ficarem rodando ali, nunca libera).
+            # Sem alvo, o agendador replaneja no próximo frame.
+            if scheduler is not None:
+                scheduler.commit((p_row, p_col), food_count, ghosts, None, expanded)
+            return self._plan_to_any_food((p_row, p_col), ghosts)
+        if self.plan_cache is not None:
+            self.plan_cache.store(path, solution, ghosts, target)
+        if scheduler is not None:
+            scheduler.commit((p_row, p_col), food_count, ghosts, target, expanded, path, solution)
+
+        # 8. Retorna a ação
+        return solution[0]
+
+    def _search(self, problem):
+        """Ações e caminho do plano: A* completo ou, no modo anytime, ARA* dentro do prazo."""
+        if self.anytime is not None:
+            result = self.anytime.search(problem)
+            # Sem caminho até o alvo no prazo: só o primeiro passo rumo à fronteira serve
+            if not result.complete:
+                return result.solution[:1], None
+            return result.solution, result.path if result.solution else None
+        node = astar_search(problem, problem.h)
+        solution = node.solution() if node else []
+        return solution, [n.state for n in node.path()] if solution else None
+
+    def _plan_to_any_food(self, cell, ghosts):
+        foods = self.game.active_food | self.game.active_capsules
+        if not foods:
+            return None # Venceu
+        problem = PacmanFoodProblem(cell, foods, self.game.level, ghosts, self.walkable)
+        node = breadth_first_graph_search(problem)
+        solution = node.solution() if node else []
+        self.detour = node.state if solution and not self.multi_goal else None
+        if self.plan_cache is not None:
+            self.plan_cache.store([n.state for n in node.path()] if solution else None,
+                                  solution, ghosts, node.state if node else None)
+        return solution[0] if solution else self._failsafe()
+
+    def _has_food(self, cell):
+        return cell in self.game.active_food or cell in self.game.active_capsules
+
+    def _target_food(self, cell):
+        """Alvo do frame: o desvio em andamento, se a comida dele ainda existe, ou a mais próxima."""
+        if self.detour is not None:
+            if self._has_food(self.detour):
+                return self.detour
+            self.detour = None
+        return self._nearest_food(cell)
+
+    def _nearest_food(self, cell):
+        # 2. e 4. Comidas restantes (caches do motor) e objetivo: a mais próxima pelo labirinto
+        food_count = len(self.game.active_food) + len(self.game.active_capsules)
+        target = self.food_index.nearest(cell, self._has_food, food_count)
+        if target is not None or not food_count:
+            return target
+
+        # Fora da tabela (túnel) ou sem comida alcançável: a mais próxima em Manhattan
+        p_row, p_col = cell
+        foods = sorted(self.game.active_food | self.game.active_capsules)
+        return min(foods, key=lambda f: abs(p_row - f[0]) + abs(p_col - f[1]))
+
+    def _failsafe(self):
+        # Failsafe: Se estiver encurralado pelos fantasmas, pega a primeira saída válida do motor
+        for d in [RIGHT, LEFT, UP, DOWN]:
+            if self.game.turns_allowed[d]:
+                return d
+        return self.game.direction
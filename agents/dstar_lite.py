@@ -0,0 +1,197 @@
+"""
+Planejador incremental D* Lite (Koenig & Likhachev) para o grid do Pac-Man.
+
+Em vez de rodar um A* do zero a cada frame, o planejador busca de trás para
+frente (do objetivo até o Pac-Man) e guarda g/rhs e a fila entre as
+chamadas. A cada frame só é preciso:
+  - somar ao km o quanto o Pac-Man andou (a fila não é reordenada);
+  - atualizar os vizinhos das células cuja zona de perigo dos fantasmas mudou;
+  - reparar a busca (ComputeShortestPath), que só expande o que mudou.
+Se o objetivo (comida alvo) muda para uma célula por onde passava o caminho
+mínimo do Pac-Man, a subárvore dela é guardada (g menos o g do objetivo novo,
+como no Moving Target D* Lite) e só a borda é reparada. Fora disso a busca
+recomeça do zero: no agente a troca mais comum é logo depois de comer o alvo
+antigo, com o Pac-Man na raiz da busca, e aí nada da árvore antiga serve.
+
+As regras de movimento são as do PacmanGridProblem: paredes >= 3, portão 9
+andável, túnel entre a primeira e a última coluna e células a até 2 passos
+(Manhattan, atravessando o túnel) de um fantasma proibidas.
+"""
+
+import heapq
+
+from env.engine import RIGHT, LEFT, UP, DOWN
+from problems.pacman_problem import danger_cells
+
+INF = float("inf")
+
+
+class DStarLitePlanner:
+    def __init__(self, board, distances=None, landmarks=None):
+        self.rows, self.cols = len(board), len(board[0])
+        self.distances = distances
+        self.landmarks = landmarks # Sem a tabela (boards grandes): limite ALT junto de Manhattan
+        walkable = {(r, c) for r in range(self.rows) for c in range(self.cols)
+                    if board[r][c] < 3 or board[r][c] == 9}
+        self.walkable = walkable
+
+        # Vizinhos (ação, célula) na mesma ordem de PacmanGridProblem.actions
+        self.succ = {}
+        last = self.cols - 1
+        for r, c in walkable:
+            moves = [(UP, (r - 1, c)), (DOWN, (r + 1, c)), (LEFT, (r, c - 1)), (RIGHT, (r, c + 1))]
+            if c == 0: moves.append((LEFT, (r, last)))
+            if c == last: moves.append((RIGHT, (r, 0)))
+            self.succ[(r, c)] = [(a, s) for a, s in moves if s in walkable]
+        # O grafo é simétrico (o túnel vale nos dois sentidos)
+        self.pred = {cell: [s for _, s in moves] for cell, moves in self.succ.items()}
+
+        self.goal = None
+        self.last_expansions = 0
+        self.total_expansions = 0
+        self.replans = 0
+
+    # ── Interface ────────────────────────────────────────────────────────────
+    def plan(self, start, goal, ghosts):
+        """Primeira ação do caminho seguro de `start` até `goal` (None se não houver,
+        ou se o Pac-Man já está no objetivo)."""
+        if start == goal or start not in self.walkable or goal not in self.walkable:
+            return None
+        blocked = self._danger_cells(ghosts)
+
+        if goal != self.goal and not self._retarget(start, goal):
+            self._initialize(start, goal, blocked)
+        else:
+            if start != self.start:
+                self.km += self._h(self.start, start)
+                self.start = start
+            changed = blocked ^ self.blocked
+            self.blocked = blocked
+            for v in changed:
+                for u in self.pred[v]:
+                    self._update_vertex(u)
+
+        self.last_expansions = 0
+        self._compute_shortest_path()
+        self.total_expansions += self.last_expansions
+        self.replans += 1
+
+        if self.g.get(start, INF) == INF:
+            return None
+        # Vizinho com menor custo + g; se todos são INF, não há passo seguro
+        # (o min pegaria o primeiro vizinho, talvez dentro da zona de perigo)
+        action, cost = min(((a, self._cost(v) + self.g.get(v, INF)) for a, v in self.succ[start]),
+                           key=lambda m: m[1], default=(None, INF))
+        return action if cost != INF else None
+
+    def path(self):
+        """Caminho atual (células) do Pac-Man até o objetivo, seguindo g."""
+        cells, s = [self.start], self.start
+        while s != self.goal and len(cells) <= len(self.walkable):
+            s = min((v for _, v in self.succ[s]), key=lambda v: self._cost(v) + self.g.get(v, INF))
+            if self._cost(s) + self.g.get(s, INF) == INF:
+                return None
+            cells.append(s)
+        return cells
+
+    # ── D* Lite ──────────────────────────────────────────────────────────────
+    def _danger_cells(self, ghosts):
+        return danger_cells(ghosts, self.rows, self.cols) & self.walkable
+
+    def _initialize(self, start, goal, blocked):
+        self.start, self.goal, self.blocked = start, goal, blocked
+        self.km = 0
+        self.g, self.rhs = {}, {goal: 0}
+        self.queue, self.in_queue = [], {}
+        self._push(goal, (self._h(start, goal), 0))
+
+    def _retarget(self, start, goal):
+        """Objetivo novo já alcançado pela busca: guarda a subárvore dele e repara o resto."""
+        if self.goal is None:
+            return False
+        d0 = self.g.get(goal, INF)
+        if d0 == INF or self.rhs.get(goal) != d0:
+            return False
+        # Células cujo caminho mínimo até o objetivo antigo passa pelo novo: o resto do
+        # caminho vale g - d0 (limite superior; se houver atalho, a reparação o acha)
+        g, rhs = self.g, self.rhs
+        keep, stack = {goal: 0}, [goal]
+        while stack:
+            u = stack.pop()
+            gu = g[u] + self._cost(u)
+            if gu == INF:
+                continue # Célula em perigo: ninguém chega ao objetivo por ela
+            for p in self.pred[u]:
+                if p not in keep and g.get(p, INF) == gu == rhs.get(p):
+                    keep[p] = gu - d0
+                    stack.append(p)
+        if start not in keep:
+            return False # A subárvore não chega ao Pac-Man: a busca do zero expande o mesmo
+        self.goal, self.start, self.km = goal, start, 0
+        self.g, self.rhs = keep, {goal: 0}
+        self.queue, self.in_queue = [], {}
+        # Só ficam na fila as células inconsistentes: a subárvore e a borda dela
+        border = {p for u in keep for p in self.pred[u]} | keep.keys()
+        for u in border:
+            self._update_vertex(u)
+        return True
+
+    def _h(self, a, b):
+        if self.distances is not None:
+            d = self.distances.distance(a, b)
+            if d != INF:
+                return d
+        dc = abs(a[1] - b[1])
+        h = abs(a[0] - b[0]) + min(dc, self.cols - dc)
+        if self.landmarks is not None:
+            return max(h, self.landmarks.lower_bound(a, b))
+        return h
+
+    def _cost(self, v):
+        return INF if v in self.blocked else 1
+
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self._h(self.start, s) + self.km, m)
+
+    def _push(self, s, key):
+        self.in_queue[s] = key
+        heapq.heappush(self.queue, (key, s))
+
+    def _top_key(self):
+        # Descarta entradas obsoletas (remoção preguiçosa)
+        while self.queue:
+            key, s = self.queue[0]
+            if self.in_queue.get(s) == key:
+                return key
+            heapq.heappop(self.queue)
+        return (INF, INF)
+
+    def _update_vertex(self, u):
+        if u != self.goal:
+            self.rhs[u] = min((self._cost(v) + self.g.get(v, INF) for _, v in self.succ[u]), default=INF)
+        self.in_queue.pop(u, None)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self._push(u, self._key(u))
+
+    def _compute_shortest_path(self):
+        start = self.start
+        while (self._top_key() < self._key(start)
+               or self.rhs.get(start, INF) != self.g.get(start, INF)):
+            if not self.queue:
+                break
+            k_old, u = heapq.heappop(self.queue)
+            del self.in_queue[u]
+            self.last_expansions += 1
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+            elif self.g.get(u, INF) > self.rhs.get(u, INF):
+                self.g[u] = self.rhs[u]
+                for s in self.pred[u]:
+                    self._update_vertex(s)
+            else:
+                self.g[u] = INF
+                self._update_vertex(u)
+                for s in self.pred[u]:
+                    self._update_vertex(s)
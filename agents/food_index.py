@@ -0,0 +1,93 @@
+"""
+Índice da comida mais próxima pela distância real no labirinto.
+
+Para cada célula andável guardamos as demais células ordenadas pela
+distância no labirinto (uma linha da tabela de MazeDistances ordenada, com
+empate em ordem de linha/coluna, como a varredura antiga). Como a comida só
+desaparece durante o jogo, cada célula de origem mantém um cursor que só
+avança: as células já vazias no início da lista nunca mais são olhadas.
+A consulta "comida mais próxima" custa O(1) amortizado por comida comida em
+vez de varrer as 33x30 células do board a cada frame.
+
+Quando a quantidade de comida aumenta (reset do jogo ou snapshot carregado),
+os cursores voltam ao início.
+
+Boards acima de MAX_TABLE_CELLS não têm a tabela: o BFSFoodIndex responde a
+mesma consulta com uma BFS por camadas a partir da célula, O(células) por
+consulta e nada guardado além dos vizinhos.
+"""
+
+import numpy as np
+
+from problems.maze_distances import UNREACHABLE
+
+
+class FoodIndex:
+    def __init__(self, distances):
+        self.distances = distances
+        self.cells = distances.cells
+        self.index = distances.index
+        self._order = {}     # Origem -> células ordenadas pela distância (calculado sob demanda)
+        self._cursor = {}    # Origem -> posição da primeira célula que ainda pode ter comida
+        self.food_count = None
+
+    def nearest(self, cell, has_food, food_count):
+        """Comida restante mais próxima de `cell` pelo labirinto (None se não houver).
+
+        `has_food(celula)` diz se ainda há comida na célula e `food_count` é o
+        total de comidas restantes (usado para detectar reset).
+        """
+        if not food_count:
+            return None
+        if self.food_count is None or food_count > self.food_count:
+            self._cursor.clear()
+        self.food_count = food_count
+
+        i = self.index.get(cell)
+        if i is None:
+            return None
+        order = self._order.get(i)
+        if order is None:
+            row = self.distances.table[i]
+            ranked = np.argsort(row, kind="stable")
+            # Células inalcançáveis ficam de fora: nunca serão o alvo
+            order = self._order[i] = [self.cells[j] for j in ranked.tolist() if row[j] != UNREACHABLE]
+
+        k = self._cursor.get(i, 0)
+        while k < len(order) and not has_food(order[k]):
+            k += 1
+        self._cursor[i] = k
+        return order[k] if k < len(order) else None
+
+
+class BFSFoodIndex:
+    def __init__(self, board):
+        rows, cols = len(board), len(board[0])
+        walkable = {(r, c) for r in range(rows) for c in range(cols) if board[r][c] < 3 or board[r][c] == 9}
+        last = cols - 1
+        # Vizinhos com as regras do PacmanGridProblem (túnel entre a primeira e a última coluna)
+        self.neighbors = {
+            (r, c): [nxt for nxt in ((r - 1, c), (r + 1, c), (r, last) if c == 0 else (r, c - 1),
+                                     (r, 0) if c == last else (r, c + 1)) if nxt in walkable]
+            for r, c in walkable
+        }
+
+    def nearest(self, cell, has_food, food_count):
+        """Mesma resposta do FoodIndex.nearest: na camada mais próxima com comida, a menor célula."""
+        if not food_count or cell not in self.neighbors:
+            return None
+        neighbors = self.neighbors
+        seen = {cell}
+        layer = [cell]
+        while layer:
+            found = [c for c in layer if has_food(c)]
+            if found:
+                return min(found) # Empate em ordem de linha/coluna, como no FoodIndex
+            following = []
+            for c in layer:
+                for nxt in neighbors[c]:
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        following.append(nxt)
+            layer = following
+        return None
@@ -0,0 +1,94 @@
+"""
+Previsão das trajetórias dos fantasmas para a busca espaço-tempo.
+
+O movimento dos fantasmas é determinístico dado o alvo e as curvas livres,
+então dá para simular os próximos frames com a própria lógica do motor
+(_update_counters, _update_ghost_speeds, _make_ghost, _get_targets e
+_move_ghosts) num PacmanEngine de rascunho. O Pac-Man fica parado na
+previsão: os fantasmas perseguem a posição atual dele.
+
+O resultado é uma máscara de perigo (danger_mask, raio 2) por passo do
+Pac-Man: o passo k corresponde ao frame k * frames_per_step. As máscaras
+ficam em cache por frame: várias buscas no mesmo frame (ou frames em que
+nada que a simulação lê mudou) reaproveitam a mesma tabela.
+"""
+
+from env.engine import PacmanEngine, HEIGHT, WIDTH
+from problems.pacman_problem import danger_mask
+
+# Estado do motor lido pela simulação dos fantasmas
+_GHOST_STATE = (
+    "player_x", "player_y", "powerup", "power_counter", "eaten_ghost", "targets",
+    "blinky_x", "blinky_y", "blinky_dir", "blinky_dead", "blinky_box",
+    "inky_x",   "inky_y",   "inky_dir",   "inky_dead",   "inky_box",
+    "pinky_x",  "pinky_y",  "pinky_dir",  "pinky_dead",  "pinky_box",
+    "clyde_x",  "clyde_y",  "clyde_dir",  "clyde_dead",  "clyde_box",
+    "startup_counter", "game_over", "game_won",
+)
+_GHOSTS = ("blinky", "inky", "pinky", "clyde")
+
+NUM1 = (HEIGHT - 50) // 32   # Altura da célula na tela
+NUM2 = WIDTH // 30           # Largura da célula na tela
+
+
+class GhostPredictor:
+    def __init__(self, steps: int = 8, frames_per_step: int = 15):
+        self.steps = steps
+        self.frames_per_step = frames_per_step
+        self._key = None
+        self._masks = None
+        self.hits = 0
+        self.misses = 0
+
+    def danger_by_step(self, engine) -> list:
+        """Máscaras de perigo para os passos 0..steps (a última vale dali em diante)."""
+        key = tuple(tuple(v) if isinstance(v, list) else v
+                    for v in (getattr(engine, name) for name in _GHOST_STATE))
+        if key == self._key:
+            self.hits += 1
+            return self._masks
+        self.misses += 1
+        rows, cols = len(engine.level), len(engine.level[0])
+        frames = self.predict(engine, self.steps * self.frames_per_step)
+        self._masks = [danger_mask(frames[k * self.frames_per_step], rows, cols)
+                       for k in range(self.steps + 1)]
+        self._key = key
+        return self._masks
+
+    def predict(self, engine, horizon: int) -> list:
+        """Células (linha, coluna) dos fantasmas perigosos em cada frame 0..horizon."""
+        sim = PacmanEngine.__new__(PacmanEngine)
+        for name in _GHOST_STATE:
+            value = getattr(engine, name)
+            setattr(sim, name, list(value) if isinstance(value, list) else value)
+        sim.level = engine.level # Só leitura: paredes e portão
+        sim.layout = engine.layout
+        sim.counter, sim.flicker, sim.moving = engine.counter, engine.flicker, engine.moving
+
+        frames = [self._dangerous_cells(sim)]
+        for _ in range(horizon):
+            # Mesma ordem de PacmanEngine.step, sem o Pac-Man e sem colisões
+            sim._update_counters()
+            sim._update_ghost_speeds()
+            ghosts = [sim._make_ghost(gid) for gid in range(4)]
+            sim.targets = sim._get_targets(*ghosts)
+            if sim.moving:
+                sim._move_ghosts(*ghosts)
+            for ghost, name in zip(ghosts, _GHOSTS):
+                if ghost.in_box and getattr(sim, f"{name}_dead"):
+                    setattr(sim, f"{name}_dead", False)
+            frames.append(self._dangerous_cells(sim))
+        return frames
+
+    @staticmethod
+    def _dangerous_cells(sim):
+        # Como o GridAStarAgent: com o poder ativo nenhum fantasma é perigo; mortos nunca são
+        if sim.powerup:
+            return []
+        return [(int((getattr(sim, f"{name}_y") + 24) // NUM1), int((getattr(sim, f"{name}_x") + 23) // NUM2))
+                for name in _GHOSTS if not getattr(sim, f"{name}_dead")]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,80 @@
+"""
+Cache de planos do GridAStarAgent.
+
+O A* devolve o caminho inteiro até a comida alvo, mas o agente só usava a
+primeira ação. O PlanCache guarda a sequência completa de ações junto com o
+caminho em células e os fantasmas para os quais ela foi calculada, e vai
+servindo o próximo passo enquanto o plano continua válido:
+  - a comida alvo ainda existe;
+  - o Pac-Man está no caminho (na célula atual do plano ou na seguinte);
+  - nenhuma célula restante do caminho entrou na zona de perigo dos fantasmas.
+Os contadores hits/misses (e o motivo de cada invalidação) ficam expostos
+para monitoramento.
+"""
+
+from collections import Counter
+
+from problems.pacman_problem import danger_cells
+
+
+class PlanCache:
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols # Tamanho do board (zona de perigo atravessa o túnel)
+        self.path = None      # Células [início, ..., alvo]
+        self.actions = None   # Ação para sair de path[i] rumo a path[i + 1]
+        self.ghosts = None
+        self.target = None
+        self.index = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = Counter()
+
+    def store(self, path, actions, ghosts, target):
+        """Guarda o plano recém calculado pelo A*."""
+        if not actions:
+            self.path = None
+            return
+        self.path, self.actions = path, actions
+        self.ghosts, self.target = tuple(ghosts), target
+        self.index = 0
+
+    def next_action(self, cell, ghosts, has_food):
+        """Próxima ação do plano guardado, ou None (miss) se ele não vale mais."""
+        reason = self._check(cell, tuple(ghosts), has_food)
+        if reason is None:
+            self.hits += 1
+            return self.actions[self.index]
+        if self.path is not None:
+            self.invalidations[reason] += 1
+            self.path = None
+        self.misses += 1
+        return None
+
+    def _check(self, cell, ghosts, has_food):
+        if self.path is None:
+            return "empty"
+        if not has_food(self.target):
+            return "target_eaten"
+        i = self.index
+        if cell != self.path[i]:
+            if cell != self.path[i + 1]:
+                return "off_path"
+            i += 1
+        if i >= len(self.actions):
+            return "arrived"
+        if ghosts != self.ghosts:
+            danger = danger_cells(ghosts, self.rows, self.cols)
+            if any(c in danger for c in self.path[i + 1:]):
+                return "blocked"
+            self.ghosts = ghosts
+        self.index = i
+        return None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "invalidations": dict(self.invalidations)}
@@ -0,0 +1,109 @@
+"""
+Agendador de decisões do GridAStarAgent.
+
+O Pac-Man anda 2 px por frame e uma célula tem 30x28 px, então na maior
+parte dos frames nada que o A* enxerga mudou. O resultado da busca só
+depende de:
+  - a célula do Pac-Man (muda ao entrar numa nova célula);
+  - a comida alvo (muda quando ela é comida ou outra fica mais perto);
+  - as células de perigo dos fantasmas que a busca anterior chegou a
+    testar (vizinhas das células expandidas).
+Se nada disso mudou, o plano comprometido no último replanejamento é
+reaproveitado. Ao entrar na próxima célula do plano, o plano também segue
+valendo quando a célula é um corredor (grau 2): sem junção não há escolha.
+Nos dois casos a ação é exatamente a mesma que um novo A* devolveria.
+"""
+
+from search import InstrumentedProblem
+from problems.pacman_problem import danger_cells
+
+
+class RecordingProblem(InstrumentedProblem):
+    """InstrumentedProblem que também guarda os estados expandidos pela busca."""
+
+    def __init__(self, problem):
+        super().__init__(problem)
+        self.expanded = set()
+
+    def actions(self, state):
+        self.expanded.add(state)
+        return super().actions(state)
+
+
+class DecisionScheduler:
+    def __init__(self, board):
+        self.rows, self.cols = len(board), len(board[0])
+        walkable = {(r, c) for r in range(self.rows) for c in range(self.cols)
+                    if board[r][c] < 3 or board[r][c] == 9}
+        # Número de saídas de cada célula (com túnel): grau 2 = corredor ou curva, sem escolha
+        self.degree = {cell: sum(n in walkable for n in self._neighbors(cell)) for cell in walkable}
+        self.cell = None
+        self.food_count = None
+        self.ghosts = None
+        self.target = None
+        self.action = None
+        self.path, self.actions, self.index = None, None, 0
+        self._danger = set()
+        self._expanded = set()
+        self._touched = None
+        self.replans = 0
+        self.reuses = 0
+
+    def needs_replan(self, cell, food_count, ghosts, has_food, nearest_food) -> bool:
+        """True quando um novo A* poderia devolver outra ação.
+
+        `has_food(celula)` diz se ainda há comida na célula e `nearest_food(celula)`
+        devolve o alvo que o agente escolheria a partir dela.
+        """
+        ghosts = tuple(ghosts)
+        if self.target is None or food_count > self.food_count or not has_food(self.target):
+            return True
+        # Comer outra comida não muda o alvo (o min continua o mesmo)
+        if ghosts != self.ghosts:
+            changed = danger_cells(ghosts, self.rows, self.cols) ^ self._danger
+            if not changed.isdisjoint(self._touched_cells()):
+                return True
+            self.ghosts = ghosts
+            self._danger ^= changed
+        if cell != self.cell:
+            # Entrou na próxima célula do plano: num corredor o primeiro passo do
+            # caminho ótimo é forçado (voltar seria 2 passos mais longo)
+            nxt = self.index + 1
+            if (self.path is None or nxt >= len(self.path) - 1 or self.path[nxt] != cell
+                    or self.degree.get(cell) != 2 or nearest_food(cell) != self.target):
+                return True
+            self.index, self.cell, self.action = nxt, cell, self.actions[nxt]
+        self.food_count = food_count
+        self.reuses += 1
+        return False
+
+    def commit(self, cell, food_count, ghosts, target, expanded, path=None, actions=None):
+        """Guarda o plano recém calculado (caminho e ações do A*) e as células que a busca expandiu."""
+        self.cell, self.food_count, self.ghosts, self.target = cell, food_count, tuple(ghosts), target
+        self._danger = danger_cells(ghosts, self.rows, self.cols)
+        self._expanded = expanded
+        self._touched = None
+        if actions:
+            self.path, self.actions, self.action = path, actions, actions[0]
+        else:
+            self.path, self.actions, self.action = None, None, None
+        self.index = 0
+        self.replans += 1
+
+    def _neighbors(self, cell):
+        r, c = cell
+        last = self.cols - 1
+        yield from ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+        if c == 0: yield (r, last)
+        if c == last: yield (r, 0)
+
+    def _touched_cells(self) -> set:
+        # Vizinhas (com túnel) das células expandidas: as que actions() testou
+        if self._touched is None:
+            self._touched = {n for cell in self._expanded for n in self._neighbors(cell)}
+        return self._touched
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.replans + self.reuses
+        return self.reuses / total if total else 0.0
@@ -0,0 +1,90 @@
+"""
+Benchmark: PacmanGridProblem.actions com máscaras vs. a versão original.
+
+A versão original define uma closure a cada chamada e percorre todos os
+fantasmas para cada vizinho testado. A atual monta uma vez por problema a
+máscara de perigo (e recebe a de paredes pronta), e cada vizinho vira duas
+consultas a bytearray. Mede chamadas de actions() por segundo em todas as
+células andáveis do board real, para conjuntos de fantasmas sorteados, e o
+custo de montar o problema (a máscara de perigo) a cada planejamento.
+
+    python benchmarks/bench_actions.py [n_conjuntos_de_fantasmas]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from env.board import boards
+from env.engine import RIGHT, LEFT, UP, DOWN
+from problems.maze_distances import get_maze_distances
+from problems.pacman_problem import PacmanGridProblem, walkable_mask
+from utils import print_table
+
+
+class LegacyPacmanGridProblem(PacmanGridProblem):
+    """actions() original: closure por chamada e laço sobre os fantasmas por vizinho."""
+
+    def actions(self, state):
+        r, c = state
+        possible = []
+
+        def is_safe_and_walkable(nr, nc):
+            if nr < 0 or nr >= 33 or nc < 0 or nc >= 30:
+                return False
+            if self.board[nr][nc] >= 3 and self.board[nr][nc] != 9:
+                return False
+            for gr, gc in self.ghosts:
+                if abs(nr - gr) + abs(nc - gc) <= 2:
+                    return False
+            return True
+
+        if is_safe_and_walkable(r-1, c): possible.append(UP)
+        if is_safe_and_walkable(r+1, c): possible.append(DOWN)
+        if is_safe_and_walkable(r, c-1): possible.append(LEFT)
+        if is_safe_and_walkable(r, c+1): possible.append(RIGHT)
+        if c == 0 and is_safe_and_walkable(r, 29): possible.append(LEFT)
+        if c == 29 and is_safe_and_walkable(r, 0): possible.append(RIGHT)
+        return possible
+
+
+def sample_ghosts(n, cells, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(cells, 4) for _ in range(n)]
+
+
+def run(problem_cls, ghost_sets, cells, walkable):
+    t_build = t_actions = 0.0
+    results = []
+    for ghosts in ghost_sets:
+        t0 = time.perf_counter()
+        problem = problem_cls(cells[0], cells[-1], boards, ghosts, walkable=walkable)
+        t1 = time.perf_counter()
+        results.append([problem.actions(cell) for cell in cells])
+        t_actions += time.perf_counter() - t1
+        t_build += t1 - t0
+    return t_build, t_actions, results
+
+
+def main(n=200):
+    cells = get_maze_distances(boards).cells
+    ghost_sets = sample_ghosts(n, cells)
+    walkable = walkable_mask(boards)
+    calls = n * len(cells)
+
+    _, t_legacy, r_legacy = run(LegacyPacmanGridProblem, ghost_sets, cells, walkable)
+    b_mask, t_mask, r_mask = run(PacmanGridProblem, ghost_sets, cells, walkable)
+    # A máscara atravessa o túnel; fora dele as ações são as mesmas
+    differ = sum(a != b for rl, rm in zip(r_legacy, r_mask) for a, b in zip(rl, rm))
+
+    rows = [["original", calls, "-", f"{calls / t_legacy / 1e6:.2f}"],
+            ["máscaras", calls, f"{b_mask / n * 1e6:.1f}", f"{calls / t_mask / 1e6:.2f}"]]
+    print_table(rows, header=["actions()", "calls", "build (us)", "M calls/s"])
+    print(f"speedup: {t_legacy / t_mask:.2f}x | estados com ações diferentes (túnel): {differ}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,58 @@
+"""
+Benchmark: fronteira PriorityQueue (heap) vs. BucketQueue (baldes de Dial).
+
+Roda astar_search, uniform_cost_search e greedy_best_first_graph_search
+sobre problemas PacmanGridProblem sorteados no board real, com as duas
+filas. No PacmanGridProblem os custos são 1 e o h é inteiro, então f cabe
+nos baldes; dentro de um balde a BucketQueue prefere o nó mais profundo.
+Confere que o custo das soluções de A* e UCS não muda e mostra expansões
+e tempo. No greedy a fronteira é pequena e o heap empata com os baldes:
+para ele a PriorityQueue continua sendo a escolha.
+
+    python benchmarks/bench_bucket_queue.py [n_problemas]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search import (InstrumentedProblem, astar_search, greedy_best_first_graph_search,
+                    uniform_cost_search)
+from env.board import boards
+from problems.pacman_problem import PacmanGridProblem, walkable_mask
+from utils import BucketQueue, PriorityQueue, print_table
+
+from bench_priority_queue import sample_problems
+
+SEARCHERS = [
+    ("astar_search", lambda p, queue: astar_search(p, p.h, queue=queue)),
+    ("uniform_cost_search", lambda p, queue: uniform_cost_search(p, queue=queue)),
+    ("greedy_best_first", lambda p, queue: greedy_best_first_graph_search(p, p.h, queue=queue)),
+]
+
+
+def main(n=500):
+    walkable = walkable_mask(boards)
+    problems = sample_problems(n)
+    rows = []
+    for name, searcher in SEARCHERS:
+        costs = {}
+        for queue in (PriorityQueue, BucketQueue):
+            expansions, costs[queue] = 0, []
+            t0 = time.perf_counter()
+            for start, goal, ghosts in problems:
+                problem = InstrumentedProblem(PacmanGridProblem(start, goal, boards, ghosts, walkable=walkable))
+                node = searcher(problem, queue)
+                expansions += problem.succs
+                costs[queue].append(node.path_cost if node else None)
+            elapsed = time.perf_counter() - t0
+            rows.append([name, queue.__name__, n, expansions, f"{elapsed * 1000:.1f}"])
+        if name != "greedy_best_first":
+            assert costs[PriorityQueue] == costs[BucketQueue], "a BucketQueue mudou o custo ótimo"
+    print_table(rows, header=["searcher", "frontier", "problems", "expansions", "time (ms)"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
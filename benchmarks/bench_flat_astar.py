@@ -0,0 +1,54 @@
+"""
+Benchmark: astar_search do AIMA vs. FlatGridAStar no PacmanGridProblem.
+
+Sorteia problemas no board real (início, objetivo e fantasmas aleatórios) e
+resolve cada um com as duas implementações, com a heurística de Manhattan e
+com a tabela de distâncias. Confere que as listas de ações são idênticas e
+mostra o tempo total e por problema.
+
+    python benchmarks/bench_flat_astar.py [n_problemas]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search import astar_search
+from env.board import boards
+from problems.flat_astar import FlatGridAStar
+from problems.maze_distances import get_maze_distances
+from problems.pacman_problem import PacmanGridProblem, walkable_mask
+from utils import print_table
+
+from bench_priority_queue import sample_problems
+
+
+def aima(problem):
+    node = astar_search(problem, problem.h)
+    return node.solution() if node else None
+
+
+def main(n=1000):
+    walkable = walkable_mask(boards)
+    flat = FlatGridAStar(boards)
+    problems = sample_problems(n)
+
+    rows = []
+    for h_name, distances in [("manhattan", None), ("maze", get_maze_distances(boards))]:
+        solutions = {}
+        for name, solve in [("aima", aima), ("flat", flat.solve)]:
+            elapsed, solutions[name] = 0.0, []
+            for start, goal, ghosts in problems:
+                problem = PacmanGridProblem(start, goal, boards, ghosts, distances, walkable)
+                t0 = time.perf_counter()
+                solutions[name].append(solve(problem))
+                elapsed += time.perf_counter() - t0
+            rows.append([h_name, name, n, f"{elapsed * 1000:.1f}", f"{elapsed / n * 1e6:.1f}"])
+        assert solutions["aima"] == solutions["flat"], "o A* plano mudou as ações"
+    print_table(rows, header=["h", "A*", "problems", "time (ms)", "per problem (µs)"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
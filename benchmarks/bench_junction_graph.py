@@ -0,0 +1,59 @@
+"""
+Benchmark: A* no grid vs. A* no grafo de junções (corredores comprimidos).
+
+Sorteia problemas no board real (início, objetivo e fantasmas aleatórios) e
+resolve cada um com PacmanGridProblem (uma célula por nó) e com
+JunctionGraphProblem (um corredor por aresta), conferindo que o comprimento
+dos caminhos é o mesmo. Mostra expansões e tempo das duas buscas.
+
+    python benchmarks/bench_junction_graph.py [n_problemas]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search import InstrumentedProblem, astar_search
+from env.board import boards
+from problems.junction_graph import JunctionGraph, JunctionGraphProblem
+from problems.maze_distances import get_maze_distances
+from problems.pacman_problem import PacmanGridProblem, walkable_mask
+from utils import print_table
+
+from bench_priority_queue import sample_problems
+
+
+def main(n=500):
+    distances = get_maze_distances(boards)
+    walkable = walkable_mask(boards)
+    t0 = time.perf_counter()
+    graph = JunctionGraph(boards)
+    t_build = time.perf_counter() - t0
+    problems = sample_problems(n)
+
+    rows = []
+    costs = {}
+    for name, make in [
+        ("grid", lambda s, g, gh: PacmanGridProblem(s, g, boards, gh, distances, walkable)),
+        ("junctions", lambda s, g, gh: JunctionGraphProblem(s, g, graph, gh, distances)),
+    ]:
+        expansions, elapsed, costs[name] = 0, 0.0, []
+        for start, goal, ghosts in problems:
+            t0 = time.perf_counter()
+            problem = InstrumentedProblem(make(start, goal, ghosts))
+            node = astar_search(problem, problem.h)
+            elapsed += time.perf_counter() - t0
+            expansions += problem.succs
+            costs[name].append(node.path_cost if node else None)
+        rows.append([name, n, expansions, f"{expansions / n:.1f}", f"{elapsed * 1000:.1f}"])
+    assert costs["grid"] == costs["junctions"], "o grafo de junções mudou o comprimento dos caminhos"
+
+    print(f"board: {len(graph.walkable)} células, {len(graph.junctions)} junções, "
+          f"{graph.num_edges} corredores (compilado em {t_build * 1000:.1f} ms)")
+    print_table(rows, header=["A*", "problems", "expansions", "per problem", "time (ms)"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
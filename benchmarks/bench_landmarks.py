@@ -0,0 +1,59 @@
+"""
+Benchmark: heurística de Manhattan vs. ALT (marcos) no A* do PacmanGridProblem.
+
+Roda astar_search sem fantasmas entre pares de células sorteados, no board
+original e em labirintos gerados (env/maze_generator.py) com ~10x e ~100x
+as células dele (104x95 e 330x300). Nos boards grandes a
+tabela de todos os pares não cabe na memória (quadrática), e a ALT guarda
+só k distâncias por célula. Confere que os custos são os mesmos e mostra
+expansões, tempo e a memória/tempo de preparo dos marcos.
+
+    python benchmarks/bench_landmarks.py [n_pares] [k]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search import InstrumentedProblem, astar_search
+from env.board import boards
+from env.maze_generator import generate_board
+from problems.landmarks import grid_landmarks
+from problems.pacman_problem import PacmanGridProblem, walkable_mask
+from utils import print_table
+
+
+def main(n=50, k=8):
+    rows = []
+    for name, board, pairs in [("1x", boards, n), ("10x", generate_board(104, 95), n),
+                               ("100x", generate_board(330, 300), n // 5)]:
+        walkable = walkable_mask(board)
+        t0 = time.perf_counter()
+        landmarks = grid_landmarks(board, k)
+        t_build = time.perf_counter() - t0
+        rng = random.Random(0)
+        queries = [(rng.choice(landmarks.nodes), rng.choice(landmarks.nodes)) for _ in range(pairs)]
+
+        costs = {}
+        for h_name, marks in [("manhattan", None), (f"alt k={landmarks.k}", landmarks)]:
+            expansions, costs[h_name] = 0, []
+            t0 = time.perf_counter()
+            for start, goal in queries:
+                problem = InstrumentedProblem(PacmanGridProblem(start, goal, board, [], walkable=walkable,
+                                                                landmarks=marks))
+                node = astar_search(problem, problem.h)
+                expansions += problem.succs
+                costs[h_name].append(node.path_cost if node else None)
+            elapsed = time.perf_counter() - t0
+            prep = f"{t_build * 1000:.0f} ms / {landmarks.resident_bytes() // 1024} KB" if marks else "-"
+            rows.append([name, len(landmarks.nodes), h_name, pairs, expansions,
+                         f"{elapsed * 1000:.1f}", prep])
+        assert len(set(map(tuple, costs.values()))) == 1, "a ALT mudou o custo ótimo"
+    print_table(rows, header=["board", "cells", "h", "pairs", "expansions", "time (ms)", "landmarks"])
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
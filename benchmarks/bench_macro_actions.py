@@ -0,0 +1,45 @@
+"""
+Benchmark: busca sobre StateSnapshots com arestas de 1 frame vs. macro-ações.
+
+Roda uniform_cost_search a partir do estado inicial do jogo até comer k
+comidas, primeiro com o grafo de frames (get_successors: 2 px por aresta) e
+depois com macro_successors (cada aresta anda até o próximo ponto de
+decisão e custa os frames gastos). O custo ótimo em frames é o mesmo; a
+profundidade da solução e o número de expansões caem.
+
+    python benchmarks/bench_macro_actions.py [k1 k2 ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search import InstrumentedProblem, uniform_cost_search
+from env.engine import PacmanEngine
+from problems.pacman_problem import PacmanSnapshotProblem
+from utils import print_table
+
+
+def run(start, k, macro):
+    goal = lambda state: state.score >= start.score + 10 * k
+    problem = InstrumentedProblem(PacmanSnapshotProblem(start, goal, macro))
+    t0 = time.perf_counter()
+    node = uniform_cost_search(problem)
+    return node, problem.succs, time.perf_counter() - t0
+
+
+def main(ks=(3, 6, 9)):
+    start = PacmanEngine().get_start_state()
+    rows = []
+    for k in ks:
+        for macro in (False, True):
+            node, expansions, elapsed = run(start, k, macro)
+            rows.append([k, "macro" if macro else "frame", len(node.solution()), node.path_cost,
+                         expansions, f"{elapsed * 1000:.1f}"])
+    print_table(rows, header=["food", "edges", "depth", "frames", "expansions", "time (ms)"])
+
+
+if __name__ == "__main__":
+    main([int(k) for k in sys.argv[1:]] or (3, 6, 9))
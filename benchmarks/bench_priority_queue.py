@@ -0,0 +1,97 @@
+"""
+Benchmark: PriorityQueue indexada (utils) vs. a versão linear original do AIMA.
+
+Roda astar_search e uniform_cost_search sobre problemas PacmanGridProblem
+sorteados no board real (início, objetivo e fantasmas aleatórios), primeiro
+com a fila linear antiga e depois com a indexada, e confere que as soluções
+são idênticas.
+
+    python benchmarks/bench_priority_queue.py [n_problemas]
+"""
+
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import search
+from env.board import boards
+from problems.maze_distances import get_maze_distances
+from problems.pacman_problem import PacmanGridProblem
+from utils import PriorityQueue, print_table
+
+
+class LinearPriorityQueue:
+    """A PriorityQueue original: pertinência, consulta e remoção lineares."""
+
+    def __init__(self, order='min', f=lambda x: x):
+        self.heap = []
+        self.f = f if order == 'min' else (lambda x: -f(x))
+
+    def append(self, item):
+        heapq.heappush(self.heap, (self.f(item), item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[1]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, key):
+        return any([item == key for _, item in self.heap])
+
+    def __getitem__(self, key):
+        for value, item in self.heap:
+            if item == key:
+                return value
+        raise KeyError(key)
+
+    def __delitem__(self, key):
+        del self.heap[[item == key for _, item in self.heap].index(True)]
+        heapq.heapify(self.heap)
+
+
+def sample_problems(n, seed=0):
+    rng = random.Random(seed)
+    cells = [c for c in get_maze_distances(boards).cells]
+    problems = []
+    while len(problems) < n:
+        start, goal = rng.choice(cells), rng.choice(cells)
+        ghosts = [g for g in rng.sample(cells, rng.randint(0, 4))
+                  if abs(g[0] - start[0]) + abs(g[1] - start[1]) > 2]
+        problems.append((start, goal, ghosts))
+    return problems
+
+
+def run(queue_cls, searcher, problems):
+    search.PriorityQueue = queue_cls
+    try:
+        solutions = []
+        t0 = time.perf_counter()
+        for start, goal, ghosts in problems:
+            problem = PacmanGridProblem(start, goal, boards, ghosts)
+            node = searcher(problem)
+            solutions.append(node.solution() if node else None)
+        return time.perf_counter() - t0, solutions
+    finally:
+        search.PriorityQueue = PriorityQueue
+
+
+def main(n=300):
+    problems = sample_problems(n)
+    rows = []
+    for name, searcher in [("astar_search", search.astar_search),
+                           ("uniform_cost_search", search.uniform_cost_search)]:
+        t_linear, sol_linear = run(LinearPriorityQueue, searcher, problems)
+        t_indexed, sol_indexed = run(PriorityQueue, searcher, problems)
+        assert sol_linear == sol_indexed, "a fila indexada mudou o resultado da busca"
+        rows.append([name, n, f"{t_linear * 1000:.1f}", f"{t_indexed * 1000:.1f}",
+                     f"{t_linear / t_indexed:.2f}x"])
+    print_table(rows, header=["searcher", "problems", "linear (ms)", "indexed (ms)", "speedup"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,398 @@
+"""
+Suíte de benchmark das buscas do AIMA e dos planejadores novos sobre
+problemas reais do Pac-Man, com saída em JSON para comparar commits.
+
+As cargas (início, objetivo, fantasmas) não são sorteadas no vazio: vêm de
+jogos gravados. Cada jogo roda headless com o GridAStarAgent (motor
+determinístico) e a cada decisão o (célula do Pac-Man, comida alvo,
+fantasmas perigosos) é anotado; das decisões distintas são sorteadas
+`n` com `seed` fixo. As decisões gravadas ficam em
+.cache/search_workloads_<board>.json e são reaproveitadas pelas execuções
+seguintes (--record grava de novo): mudanças no agente não mudam as cargas,
+e commits diferentes são medidos sobre os mesmos problemas (o digest delas
+vai no JSON).
+
+Buscadores (todos sobre o PacmanGridProblem com a tabela de distâncias):
+  astar, uniform_cost, bfs_graph, rbfs      search.py do AIMA
+  astar_bucket                              astar_search com a fila BucketQueue
+  astar_alt                                 astar_search com a heurística ALT (sem tabela)
+  flat_astar                                FlatGridAStar
+  ara_star                                  ARAStarPlanner sem prazo (até provar o ótimo)
+O rbfs é busca em árvore: sem caminho (fantasmas cercando) ele não termina,
+então cada busca tem um teto de expansões (--budget) e as que estouram
+contam como budget_exceeded.
+
+Por buscador: buscas resolvidas, custo total, expansões, tempo total,
+latência por busca (p50/p95/p99/max, µs; o menor de `repeat` tempos de cada
+busca, para tirar o ruído do sistema) e pico de memória alocada por busca
+(tracemalloc, numa passada separada para não distorcer os tempos).
+
+    python benchmarks/bench_search_suite.py [--n=200] [--seed=0] [--out=arquivo.json]
+        [--maze=41x37 --maze-seed=3] [--only=astar,flat_astar] [--budget=20000]
+        [--repeat=3] [--compare=base.json] [--threshold=1.25] [--record]
+
+Sem --out o JSON vai para .cache/bench_search_<commit>.json. Com --compare o
+resultado é comparado com um JSON anterior (razões novo/base) e o script sai
+com código 1 se alguma métrica de tempo ou expansões piorar além do limite.
+Os tempos de máquinas (ou momentos) diferentes são comparados divididos pela
+razão de meta.calibration_ms, o tempo de um laço fixo de Python medido
+intercalado com as buscas; expansões e custos são determinísticos.
+"""
+
+import gc
+import hashlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from search import (InstrumentedProblem, astar_search, breadth_first_graph_search,
+                    recursive_best_first_search, uniform_cost_search)
+from env.board import boards
+from env.engine import PacmanEngine
+from env.maze_generator import generate_board
+from env.profiler import percentile
+from agents.astar_agent import GridAStarAgent, pixel_to_grid
+from agents.ara_star import ARAStarPlanner
+from problems.flat_astar import FlatGridAStar
+from problems.landmarks import grid_landmarks
+from problems.maze_distances import get_maze_distances
+from problems.pacman_problem import PacmanGridProblem, walkable_mask
+from utils import BucketQueue, print_table
+
+SCHEMA_VERSION = 1
+DEFAULT_BUDGET = 20000
+DEFAULT_REPEAT = 3
+# Jogos gravados: (nome, opções do GridAStarAgent)
+GAMES = [("default", {}), ("space_time", {"planner": "space_time"})]
+CALIBRATION = "_calibration"
+OPTIMAL = ("astar", "uniform_cost", "astar_bucket", "astar_alt", "flat_astar", "ara_star")
+TIMED_METRICS = ("wall_ms", "expansions", "p50_us", "p95_us", "p99_us")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Cargas gravadas de jogos
+# ══════════════════════════════════════════════════════════════════════════════
+def record_workloads(board=None, games=GAMES, max_frames=None):
+    """Decisões (início, objetivo, fantasmas) de jogos completos, na ordem em que aconteceram."""
+    workloads = []
+    for _, options in games:
+        game = PacmanEngine(board=board)
+        agent = GridAStarAgent(game, **options)
+
+        def policy():
+            cell = pixel_to_grid(game.player_x, game.player_y)
+            ghosts = [] if game.powerup else [
+                pixel_to_grid(x, y) for x, y, dead in (
+                    (game.blinky_x, game.blinky_y, game.blinky_dead), (game.inky_x, game.inky_y, game.inky_dead),
+                    (game.pinky_x, game.pinky_y, game.pinky_dead), (game.clyde_x, game.clyde_y, game.clyde_dead))
+                if not dead]
+            target = agent._nearest_food(cell)
+            if target is not None and target != cell:
+                workloads.append((cell, target, tuple(ghosts)))
+            return agent.get_action()
+
+        frames = 0
+        while not (game.game_over or game.game_won) and (max_frames is None or frames < max_frames):
+            game.step(policy)
+            frames += 1
+    return workloads
+
+
+def load_or_record_workloads(board=None, cache_dir=os.path.join(ROOT, ".cache"), record=False):
+    """Decisões gravadas do board, lidas do cache em disco quando existirem."""
+    key = get_maze_distances(board or boards).key
+    path = os.path.join(cache_dir, f"search_workloads_{key}.json")
+    if not record and os.path.exists(path):
+        with open(path) as f:
+            return [(tuple(start), tuple(goal), tuple(map(tuple, ghosts))) for start, goal, ghosts in json.load(f)]
+    workloads = record_workloads(board)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(workloads, f)
+    os.replace(tmp, path)
+    return workloads
+
+
+def sample_workloads(recorded, n, seed=0, cells=None):
+    """`n` decisões distintas sorteadas com `seed` (só as que começam numa célula da tabela)."""
+    unique = sorted(set(w for w in recorded if cells is None or w[0] in cells))
+    if n < len(unique):
+        unique = sorted(random.Random(seed).sample(unique, n))
+    return unique
+
+
+def workload_digest(workloads) -> str:
+    return hashlib.sha1(json.dumps(workloads).encode()).hexdigest()[:16]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Buscadores: cada um resolve um PacmanGridProblem e devolve (custo, expansões)
+# ══════════════════════════════════════════════════════════════════════════════
+class BudgetExceeded(Exception):
+    pass
+
+
+class BudgetedProblem(InstrumentedProblem):
+    """InstrumentedProblem que aborta a busca depois de `budget` expansões."""
+
+    def __init__(self, problem, budget=None):
+        super().__init__(problem)
+        self.budget = budget
+
+    def actions(self, state):
+        if self.budget is not None and self.succs >= self.budget:
+            raise BudgetExceeded
+        return super().actions(state)
+
+
+def _aima(search_fn):
+    def run(problem, budget):
+        instrumented = BudgetedProblem(problem, budget)
+        node = search_fn(instrumented)
+        return (node.path_cost if node else None), instrumented.succs
+    return run
+
+
+def make_searchers(board, distances, walkable):
+    flat = FlatGridAStar(board)
+    ara = ARAStarPlanner(deadline=float("inf"))
+    landmarks = grid_landmarks(board)
+
+    def flat_astar(problem, budget):
+        solution = flat.solve(problem)
+        return (len(solution) if solution is not None else None), flat.expansions
+
+    def ara_star(problem, budget):
+        result = ara.search(problem)
+        return (result.cost if result.complete else None), result.expansions
+
+    def astar_alt(problem, budget):
+        alt = PacmanGridProblem(problem.initial, problem.goal, board, problem.ghosts,
+                                walkable=walkable, landmarks=landmarks)
+        return _aima(lambda p: astar_search(p, p.h))(alt, budget)
+
+    return {
+        "astar":        _aima(lambda p: astar_search(p, p.h)),
+        "uniform_cost": _aima(uniform_cost_search),
+        "bfs_graph":    _aima(breadth_first_graph_search),
+        "rbfs":         _aima(lambda p: recursive_best_first_search(p, p.h)),
+        "astar_bucket": _aima(lambda p: astar_search(p, p.h, queue=BucketQueue)),
+        "astar_alt":    astar_alt,
+        "flat_astar":   flat_astar,
+        "ara_star":     ara_star,
+    }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Medição
+# ══════════════════════════════════════════════════════════════════════════════
+def _solve(solve, problem, budget):
+    try:
+        return solve(problem, budget), False
+    except (BudgetExceeded, RecursionError):
+        return (None, budget or 0), True
+
+
+def warm_up(solve, problems, budget):
+    """Passada sem tempo: custos, expansões e estouros do teto (e caches/páginas já em memória)."""
+    costs, expansions, exceeded = [], 0, 0
+    for problem in problems:
+        (cost, n), over = _solve(solve, problem, budget)
+        costs.append(cost)
+        expansions += n
+        exceeded += over
+    return costs, expansions, exceeded
+
+
+def measure_latencies(searchers, problems, budget, repeat=DEFAULT_REPEAT):
+    """Menor tempo (µs) de cada busca em `repeat` passadas, com os buscadores intercalados
+    por problema: uma rajada de ruído da máquina atinge todos igualmente."""
+    latencies = {name: [float("inf")] * len(problems) for name in searchers}
+    gc_was_enabled = gc.isenabled()
+    gc.disable() # Como o timeit: coletas do GC no meio de uma busca viram ruído
+    try:
+        for _ in range(repeat):
+            for i, problem in enumerate(problems):
+                for name, solve in searchers.items():
+                    t0 = time.perf_counter_ns()
+                    _solve(solve, problem, budget)
+                    elapsed = (time.perf_counter_ns() - t0) / 1000
+                    if elapsed < latencies[name][i]:
+                        latencies[name][i] = elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return latencies
+
+
+def peak_memory(solve, problems, budget):
+    """Pico de memória alocada (bytes) em cada busca, com o tracemalloc ligado só aqui."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for problem in problems:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            _solve(solve, problem, budget)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def summarize(costs, expansions, exceeded, latencies, peaks) -> dict:
+    total = len(costs)
+    return {
+        "problems": total,
+        "solved": sum(c is not None for c in costs),
+        "budget_exceeded": exceeded,
+        "total_cost": sum(c for c in costs if c is not None),
+        "expansions": expansions,
+        "expansions_mean": round(expansions / total, 2) if total else 0,
+        "wall_ms": round(sum(latencies) / 1000, 3),
+        "mean_us": round(sum(latencies) / total, 2) if total else 0,
+        "p50_us": round(percentile(latencies, 50), 2),
+        "p95_us": round(percentile(latencies, 95), 2),
+        "p99_us": round(percentile(latencies, 99), 2),
+        "max_us": round(max(latencies, default=0), 2),
+        "peak_kib_max": round(max(peaks, default=0) / 1024, 2),
+        "peak_kib_mean": round(sum(peaks) / len(peaks) / 1024, 2) if peaks else 0,
+    }
+
+
+def calibration_task(problem, budget):
+    """Laço fixo de dicionário e aritmética, medido intercalado com os buscadores:
+    o total dele é a "velocidade" da máquina durante a medição."""
+    table = {}
+    for i in range(2000):
+        table[i & 127] = i * 3
+    return None, 0
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(n=200, seed=0, board=None, board_name="stock", only=None, budget=DEFAULT_BUDGET,
+              recorded=None, repeat=DEFAULT_REPEAT):
+    """Sorteia as cargas (gravadas, ou `recorded`) e mede cada buscador; devolve o dicionário do JSON."""
+    if recorded is None:
+        recorded = load_or_record_workloads(board)
+    board = board or boards
+    distances = get_maze_distances(board)
+    walkable = walkable_mask(board)
+    workloads = sample_workloads(recorded, n, seed, distances.index)
+    problems = [PacmanGridProblem(start, goal, board, list(ghosts), distances, walkable)
+                for start, goal, ghosts in workloads]
+
+    searchers = {name: solve for name, solve in make_searchers(board, distances, walkable).items()
+                 if not only or name in only}
+    warm = {name: warm_up(solve, problems, budget) for name, solve in searchers.items()}
+    latencies = measure_latencies({**searchers, CALIBRATION: calibration_task}, problems, budget, repeat)
+    calibration = sum(latencies.pop(CALIBRATION)) / 1000
+
+    results, reference = {}, None
+    for name, solve in searchers.items():
+        costs, expansions, exceeded = warm[name]
+        stats = summarize(costs, expansions, exceeded, latencies[name], peak_memory(solve, problems, budget))
+        # Os buscadores ótimos têm que concordar com o primeiro deles em cada carga
+        if name in OPTIMAL:
+            if reference is None:
+                reference = costs
+            stats["matches_optimal"] = costs == reference
+        results[name] = stats
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "board": board_name,
+            "games": [name for name, _ in GAMES],
+            "seed": seed,
+            "budget": budget,
+            "repeat": repeat,
+            "calibration_ms": round(calibration, 3),
+            "workloads": len(workloads),
+            "workload_digest": workload_digest(workloads),
+        },
+        "searchers": results,
+    }
+
+
+def compare(result, base, threshold=1.25):
+    """Linhas (buscador, métrica, base, novo, razão, status) e se houve regressão."""
+    rows, regressed = [], False
+    if result["meta"]["workload_digest"] != base["meta"]["workload_digest"]:
+        print("aviso: as cargas são diferentes (board, n, seed ou jogos mudaram)", file=sys.stderr)
+    # Máquina mais lenta/rápida agora: os tempos são descontados por essa razão
+    speed = result["meta"].get("calibration_ms", 1) / base["meta"].get("calibration_ms", 1)
+    for name, stats in result["searchers"].items():
+        old = base["searchers"].get(name)
+        if old is None:
+            continue
+        for metric in TIMED_METRICS + ("total_cost",):
+            a, b = old.get(metric, 0), stats.get(metric, 0)
+            ratio = b / a if a else (1.0 if b == a else float("inf"))
+            if metric not in ("expansions", "total_cost"):
+                ratio /= speed
+            status = ""
+            if metric == "total_cost" and a != b:
+                status = "CHANGED"
+            elif metric != "total_cost" and ratio > threshold:
+                status, regressed = "REGRESSION", True
+            rows.append([name, metric, a, b, f"{ratio:.2f}", status])
+    return rows, regressed
+
+
+def main(argv):
+    options = dict(arg[2:].split("=", 1) for arg in argv if arg.startswith("--") and "=" in arg)
+    board, board_name = None, "stock"
+    if "maze" in options:
+        rows, cols = map(int, options["maze"].lower().split("x"))
+        board = generate_board(rows, cols, seed=int(options.get("maze-seed", 0)))
+        board_name = f"maze {rows}x{cols} seed {options.get('maze-seed', 0)}"
+    only = set(options["only"].split(",")) if "only" in options else None
+
+    recorded = load_or_record_workloads(board, record="--record" in argv)
+    result = run_suite(int(options.get("n", 200)), int(options.get("seed", 0)), board, board_name, only,
+                       int(options.get("budget", DEFAULT_BUDGET)), recorded,
+                       int(options.get("repeat", DEFAULT_REPEAT)))
+
+    out = options.get("out") or os.path.join(ROOT, ".cache", f"bench_search_{result['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    print_table([[name, s["solved"], s["budget_exceeded"], s["expansions"], s["wall_ms"], s["p50_us"],
+                  s["p95_us"], s["p99_us"], s["peak_kib_max"]] for name, s in result["searchers"].items()],
+                header=["searcher", "solved", "over budget", "expansions", "wall (ms)", "p50 (µs)",
+                        "p95 (µs)", "p99 (µs)", "peak (KiB)"])
+    print(f"\n{result['meta']['workloads']} cargas ({result['meta']['workload_digest']}) -> {out}")
+
+    if "compare" in options:
+        with open(options["compare"]) as f:
+            base = json.load(f)
+        rows, regressed = compare(result, base, float(options.get("threshold", 1.25)))
+        print()
+        print_table(rows, header=["searcher", "metric", "base", "new", "ratio (calibrated)", ""])
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
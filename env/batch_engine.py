@@ -0,0 +1,418 @@
+"""
+Vectorized batch simulator: N independent Pac-Man games stepped at once.
+
+Struct-of-arrays version of env.engine.PacmanEngine. Positions, directions,
+dead/in-box flags, counters and the food bitmap of every game live in NumPy
+arrays, and a single BatchEngine.step(actions) call advances all of them by one
+frame with exactly the same rules as PacmanEngine.step():
+
+  - actions[i] is the command for game i (RIGHT/LEFT/UP/DOWN) or -1 to keep
+    the current direction_cmd (what a policy returning None does)
+  - games that already finished (game_over / game_won) are frozen
+  - BatchEngine.view(i) exposes game i with PacmanEngine's attribute names,
+    so agents such as GridAStarAgent can drive a single game of the batch
+"""
+
+import numpy as np
+
+from env.engine import BOARDS, WIDTH, HEIGHT, RIGHT, LEFT, UP, DOWN
+
+NUM1 = (HEIGHT - 50) // 32   # Altura da célula
+NUM2 = WIDTH // 30           # Largura da célula
+NUM3 = 15
+
+# Posições iniciais (mesmos literais de PacmanEngine._reset/_reset_positions)
+PLAYER_START = (450, 663)
+GHOST_START_X = (56, 440, 440, 440)
+GHOST_START_Y = (58, 388, 438, 438)
+GHOST_START_DIR = (RIGHT, UP, UP, UP)
+BLINKY, INKY, PINKY, CLYDE = 0, 1, 2, 3
+
+
+class BatchEngine:
+    def __init__(self, n: int):
+        self.n = n
+        self.board = np.array(BOARDS, dtype=np.int8)
+        self.walkable = self.board < 3           # Comida (1, 2) ou vazio (0)
+        self.food_start = np.where((self.board == 1) | (self.board == 2), self.board, 0).astype(np.int8)
+        self.reset()
+
+    # ── Estado ───────────────────────────────────────────────────────────────
+    def reset(self, mask=None):
+        """Reinicia todos os jogos (ou apenas os marcados em `mask`)."""
+        n = self.n
+        if mask is None:
+            mask = np.ones(n, dtype=bool)
+            self.player_x      = np.zeros(n, dtype=np.int32)
+            self.player_y      = np.zeros(n, dtype=np.int32)
+            self.direction     = np.zeros(n, dtype=np.int8)
+            self.direction_cmd = np.zeros(n, dtype=np.int8)
+            self.turns_allowed = np.zeros((n, 4), dtype=bool)
+            self.score         = np.zeros(n, dtype=np.int32)
+            self.lives         = np.zeros(n, dtype=np.int8)
+            self.powerup       = np.zeros(n, dtype=bool)
+            self.power_counter = np.zeros(n, dtype=np.int16)
+            self.eaten_ghost   = np.zeros((n, 4), dtype=bool)
+            self.ghost_x       = np.zeros((n, 4), dtype=np.int32)
+            self.ghost_y       = np.zeros((n, 4), dtype=np.int32)
+            self.ghost_dir     = np.zeros((n, 4), dtype=np.int8)
+            self.ghost_dead    = np.zeros((n, 4), dtype=bool)
+            self.ghost_box     = np.zeros((n, 4), dtype=bool)
+            self.target_x      = np.zeros((n, 4), dtype=np.int32)
+            self.target_y      = np.zeros((n, 4), dtype=np.int32)
+            self.moving        = np.zeros(n, dtype=bool)
+            self.startup_counter = np.zeros(n, dtype=np.int16)
+            self.game_over     = np.zeros(n, dtype=bool)
+            self.game_won      = np.zeros(n, dtype=bool)
+            self.frames        = np.zeros(n, dtype=np.int32)
+            self.food          = np.empty((n,) + self.board.shape, dtype=np.int8)
+            self.food_left     = np.zeros(n, dtype=np.int32)
+
+        self.food[mask]      = self.food_start
+        self.food_left[mask] = int(np.count_nonzero(self.food_start))
+        self.direction_cmd[mask] = RIGHT
+        self.turns_allowed[mask] = False
+        self.score[mask]     = 0
+        self.lives[mask]     = 3
+        self.ghost_box[mask] = False
+        self.moving[mask]    = False
+        self.game_over[mask] = False
+        self.game_won[mask]  = False
+        self.frames[mask]    = 0
+        self._reset_positions(mask)
+        self.target_x[mask], self.target_y[mask] = PLAYER_START
+
+    def _reset_positions(self, mask):
+        self.powerup[mask] = False
+        self.power_counter[mask] = 0
+        self.startup_counter[mask] = 0
+        self.player_x[mask], self.player_y[mask] = PLAYER_START
+        self.direction[mask] = RIGHT
+        self.direction_cmd[mask] = RIGHT
+        self.ghost_x[mask]   = GHOST_START_X
+        self.ghost_y[mask]   = GHOST_START_Y
+        self.ghost_dir[mask] = GHOST_START_DIR
+        self.eaten_ghost[mask] = False
+        self.ghost_dead[mask]  = False
+
+    @property
+    def done(self):
+        return self.game_over | self.game_won
+
+    def view(self, i: int) -> "BatchGameView":
+        return BatchGameView(self, i)
+
+    # ── Frame completo ───────────────────────────────────────────────────────
+    def step(self, actions=None):
+        """Avança um frame em todos os jogos ainda em andamento.
+
+        Mesma ordem de fases de PacmanEngine.step(): contadores, vitória,
+        fantasmas/alvos, turns_allowed, comando, movimento, comida, colisões
+        com fantasmas, túnel e ressurreição na caixa.
+        """
+        act = ~self.done
+        if not act.any():
+            return self.done
+        self.frames[act] += 1
+
+        self._update_counters(act)
+
+        px, py = self.player_x.copy(), self.player_y.copy()
+        cx, cy = px + 23, py + 24
+        speeds = self._ghost_speeds()
+        self.game_won |= act & (self.food_left == 0)
+
+        # Fantasmas construídos com o estado de antes do movimento
+        gx, gy = self.ghost_x.copy(), self.ghost_y.copy()
+        gdead = self.ghost_dead.copy()
+        gturns, gbox = self._ghost_turns(gx, gy, self.ghost_dir, gdead, self.ghost_box)
+        # Cada fantasma se move rumo ao alvo do frame anterior (como o Ghost do motor)
+        tx, ty = self.target_x.copy(), self.target_y.copy()
+        new_tx, new_ty = self._get_targets(px, py, gx, gy, gdead)
+        self.target_x[act], self.target_y[act] = new_tx[act], new_ty[act]
+
+        turns = self._check_position(cx, cy)
+        self.turns_allowed[act] = turns[act]
+
+        # Comando do agente (só quando o Pac-Man pode se mover)
+        if actions is not None:
+            actions = np.asarray(actions)
+            decide = act & self.moving & ~self.game_over & ~self.game_won & (actions >= 0)
+            self.direction_cmd[decide] = actions[decide]
+
+        # Aplica o comando de direção se a parede permitir
+        cmd_ok = np.take_along_axis(self.turns_allowed, self.direction_cmd[:, None].astype(np.intp), axis=1)[:, 0]
+        turn = act & cmd_ok
+        self.direction[turn] = self.direction_cmd[turn]
+
+        # Move os personagens
+        mv = act & self.moving
+        self._move_player(mv)
+        self._move_ghosts(mv, gx, gy, gturns, gbox, gdead, tx, ty, speeds)
+
+        # Checa colisões
+        self._check_food_collisions(act, cx, cy)
+        self._handle_ghost_collisions(act, cx, cy, gx, gy, gdead)
+
+        # Túnel
+        self.player_x[act & (self.player_x > 900)] = -47
+        self.player_x[act & (self.player_x < -50)] = 897
+
+        self.ghost_dead[act[:, None] & gbox & self.ghost_dead] = False
+        return self.done
+
+    # ── Fases do frame (vetorizadas) ─────────────────────────────────────────
+    def _update_counters(self, act):
+        pw = act & self.powerup
+        inc = pw & (self.power_counter < 600)
+        self.power_counter[inc] += 1
+        end = pw & ~inc
+        self.power_counter[end] = 0
+        self.powerup[end] = False
+        self.eaten_ghost[end] = False
+
+        wait = act & (self.startup_counter < 180) & ~self.game_over & ~self.game_won
+        self.moving[wait] = False
+        self.startup_counter[wait] += 1
+        self.moving[act & ~wait] = True
+
+    def _ghost_speeds(self):
+        speeds = np.where(self.powerup, 1, 2)[:, None].repeat(4, axis=1)
+        speeds[self.eaten_ghost] = 2
+        speeds[self.ghost_dead] = 4
+        return speeds
+
+    def _ghost_turns(self, gx, gy, gdir, gdead, gbox_in):
+        board = self.board
+        ccx, ccy = gx + 22, gy + 22
+        inner = (0 < ccx // 30) & (ccx // 30 < 29)
+        gate_ok = gbox_in | gdead
+        col = np.where(inner, ccx // NUM2, 0)
+
+        def passable(rows, cols):
+            cell = board[rows, np.where(inner, cols, 0)]
+            return (cell < 3) | ((cell == 9) & gate_ok)
+
+        turns = np.zeros(gx.shape + (4,), dtype=bool)
+        turns[..., UP]    = board[(ccy - NUM3) // NUM1, col] == 9
+        turns[..., LEFT]  = passable(ccy // NUM1, (ccx - NUM3) // NUM2)
+        turns[..., RIGHT] = passable(ccy // NUM1, (ccx + NUM3) // NUM2)
+        turns[..., DOWN]  = passable((ccy + NUM3) // NUM1, col)
+        turns[..., UP]   |= passable((ccy - NUM3) // NUM1, col)
+        # (O teste vertical no centro da coluna repete as células acima)
+        mid_y = (12 <= ccy % NUM1) & (ccy % NUM1 <= 18)
+        turns[..., LEFT]  |= mid_y & passable(ccy // NUM1, (ccx - NUM2) // NUM2)
+        turns[..., RIGHT] |= mid_y & passable(ccy // NUM1, (ccx + NUM2) // NUM2)
+
+        turns[~inner] = (True, True, False, False)    # RIGHT, LEFT
+        in_box = (350 < gx) & (gx < 550) & (370 < gy) & (gy < 480)
+        return turns, in_box
+
+    def _get_targets(self, px, py, gx, gy, gdead):
+        pxx, pyy = px[:, None], py[:, None]
+        run_x = np.where(pxx < 450, 900, 0)
+        run_y = np.where(pyy < 450, 900, 0)
+        home_box = (340 < gx) & (gx < 560) & (340 < gy) & (gy < 500)
+        power = self.powerup[:, None]
+        eaten = self.eaten_ghost
+
+        tx = np.repeat(pxx, 4, axis=1)
+        ty = np.repeat(pyy, 4, axis=1)
+        tx[:, CLYDE] += 50
+        back = power & eaten & ~home_box
+        tx = np.where(back, pxx, tx)
+        tx = np.where(home_box, 400, tx)
+        ty = np.where(home_box, 100, ty)
+        run = power & ~eaten
+        tx = np.where(run, run_x, tx)
+        ty = np.where(run, run_y, ty)
+        tx = np.where(gdead, 380, tx)
+        ty = np.where(gdead, 400, ty)
+        return tx, ty
+
+    def _check_position(self, cx, cy):
+        walk = self.walkable
+        inner = cx // 30 < 29
+        c = lambda v: np.where(inner, v, 0)   # Índice seguro para as linhas fora do grid
+        d = self.direction
+        vert = (d == UP) | (d == DOWN)
+        horiz = (d == RIGHT) | (d == LEFT)
+        mid_x = (12 <= cx % NUM2) & (cx % NUM2 <= 18)
+        mid_y = (12 <= cy % NUM1) & (cy % NUM1 <= 18)
+        row, col = cy // NUM1, c(cx // NUM2)
+
+        turns = np.zeros((self.n, 4), dtype=bool)
+        turns[:, RIGHT] = walk[row, c((cx + NUM3) // NUM2)]
+        turns[:, LEFT]  = walk[row, c((cx - NUM3) // NUM2)]
+        turns[:, UP]    = walk[(cy - NUM3) // NUM1, col]
+        turns[:, DOWN]  = walk[(cy + NUM3) // NUM1, col]
+
+        turns[:, DOWN]  |= vert & mid_x & walk[(cy + NUM3) // NUM1, col]
+        turns[:, UP]    |= vert & mid_x & walk[(cy - NUM3) // NUM1, col]
+        turns[:, LEFT]  |= vert & mid_y & walk[row, c((cx - NUM2) // NUM2)]
+        turns[:, RIGHT] |= vert & mid_y & walk[row, c((cx + NUM2) // NUM2)]
+
+        turns[:, DOWN]  |= horiz & mid_x & walk[(cy + NUM1) // NUM1, col]
+        turns[:, UP]    |= horiz & mid_x & walk[(cy - NUM1) // NUM1, col]
+
+        turns[~inner] = (True, True, False, False)    # RIGHT, LEFT
+        return turns
+
+    def _move_player(self, mv):
+        d, t, sp = self.direction, self.turns_allowed, 2
+        self.player_x[mv & (d == RIGHT) & t[:, RIGHT]] += sp
+        self.player_x[mv & (d == LEFT)  & t[:, LEFT]]  -= sp
+        self.player_y[mv & (d == UP)    & t[:, UP]]    -= sp
+        self.player_y[mv & (d == DOWN)  & t[:, DOWN]]  += sp
+
+    def _move_ghosts(self, mv, gx, gy, gturns, gbox, gdead, tx, ty, speeds):
+        # Blinky, Inky e Pinky usam o movimento do Clyde quando mortos ou na caixa
+        clyde_like = gdead | gbox
+        clyde_like[:, CLYDE] = True
+        pv = clyde_like.copy(); pv[:, INKY] = True
+        ph = clyde_like.copy(); ph[:, PINKY] = True
+
+        nx, ny, nd = self._greedy_move(gx, gy, self.ghost_dir, gturns, tx, ty, speeds, pv, ph)
+        mv4 = mv[:, None].repeat(4, axis=1)
+        self.ghost_x[mv4]   = nx[mv4]
+        self.ghost_y[mv4]   = ny[mv4]
+        self.ghost_dir[mv4] = nd[mv4]
+
+    @staticmethod
+    def _greedy_move(x, y, d, t, tx, ty, sp, pv, ph):
+        tR, tL, tU, tD = t[..., RIGHT], t[..., LEFT], t[..., UP], t[..., DOWN]
+
+        # try_turn_vertical / try_turn_horizontal
+        v_down, v_up = (ty > y) & tD, (ty < y) & tU
+        v_ok = v_down | v_up
+        v_dir = np.where(v_down, DOWN, UP)
+        v_y = np.where(v_down, y + sp, y - sp)
+        h_right, h_left = (tx > x) & tR, (tx < x) & tL
+        h_ok = h_right | h_left
+        h_dir = np.where(h_right, RIGHT, LEFT)
+        h_x = np.where(h_right, x + sp, x - sp)
+
+        # fallback: primeira saída livre na ordem DOWN, UP, LEFT, RIGHT
+        fb_dir = np.select([tD, tU, tL, tR], [DOWN, UP, LEFT, RIGHT], default=-1)
+        fb_x = x + np.select([tL, tR], [-sp, sp], default=0) * (~tD & ~tU)
+        fb_y = y + np.select([tD, tU], [sp, -sp], default=0)
+
+        horiz = (d == RIGHT) | (d == LEFT)
+        ahead = np.select([d == RIGHT, d == LEFT, d == UP], [tR, tL, tU], default=tD)
+        step_x = np.select([d == RIGHT, d == LEFT], [sp, -sp], default=0)
+        step_y = np.select([d == UP, d == DOWN], [-sp, sp], default=0)
+
+        # Caminho livre à frente: segue reto, salvo se preferir virar
+        turn_first = np.where(horiz, pv & v_ok, ph & h_ok)
+        # Parede à frente: tenta o eixo perpendicular, depois o paralelo, depois o fallback
+        first_ok  = np.where(horiz, v_ok, h_ok)
+        second_ok = np.where(horiz, h_ok, v_ok)
+
+        use_v = np.where(ahead, turn_first & horiz, (horiz & v_ok) | (~horiz & ~h_ok & v_ok))
+        use_h = np.where(ahead, turn_first & ~horiz, (~horiz & h_ok) | (horiz & ~v_ok & h_ok))
+        use_fb = ~ahead & ~first_ok & ~second_ok
+        straight = ahead & ~turn_first
+
+        nx = np.select([use_h, use_fb, straight], [h_x, fb_x, x + step_x], default=x)
+        ny = np.select([use_v, use_fb, straight], [v_y, fb_y, y + step_y], default=y)
+        nd = np.select([use_v, use_h, use_fb & (fb_dir >= 0)], [v_dir, h_dir, fb_dir], default=d)
+
+        nx = np.where(nx < -30, 900, np.where(nx > 900, nx - 30, nx))
+        return nx, ny, nd
+
+    def _check_food_collisions(self, act, cx, cy):
+        inside = act & (0 < self.player_x) & (self.player_x < 870)
+        idx = np.nonzero(inside)[0]
+        if idx.size == 0:
+            return
+        rows, cols = cy[idx] // NUM1, cx[idx] // NUM2
+        cell = self.food[idx, rows, cols]
+        ate = cell > 0
+        self.food[idx[ate], rows[ate], cols[ate]] = 0
+        self.food_left[idx[ate]] -= 1
+        self.score[idx[cell == 1]] += 10
+        caps = idx[cell == 2]
+        self.score[caps] += 50
+        self.powerup[caps] = True
+        self.power_counter[caps] = 0
+        self.eaten_ghost[caps] = False
+
+    def _handle_ghost_collisions(self, act, cx, cy, gx, gy, gdead):
+        # Mesmo retângulo que o pygame.draw.circle devolvia (recortado à tela)
+        left, top = np.maximum(cx - 20, 0), np.maximum(cy - 20, 0)
+        right, bottom = np.minimum(cx + 20, WIDTH), np.minimum(cy + 20, HEIGHT)
+        empty = (right <= left) | (bottom <= top)
+        gl, gt = gx + 22 - 18, gy + 22 - 18
+        hit = (~empty[:, None]
+               & (left[:, None] < gl + 36) & (gl < right[:, None])
+               & (top[:, None] < gt + 36) & (gt < bottom[:, None]))
+
+        power = act & self.powerup
+        lose = act & ~power & (hit & ~gdead).any(axis=1)
+        self._lose_life(lose)
+
+        # Com power-up os fantasmas são tratados um a um, na ordem original
+        for gid in range(4):
+            h = power & hit[:, gid] & ~gdead[:, gid]
+            self._lose_life(h & self.eaten_ghost[:, gid])
+            eat = h & ~self.eaten_ghost[:, gid]
+            self.ghost_dead[eat, gid] = True
+            self.eaten_ghost[eat, gid] = True
+            self.score[eat] += (2 ** self.eaten_ghost[eat].sum(axis=1)) * 100
+
+    def _lose_life(self, mask):
+        if not mask.any():
+            return
+        alive = mask & (self.lives > 0)
+        self.lives[alive] -= 1
+        self._reset_positions(alive)
+        over = mask & ~alive
+        self.game_over[over] = True
+        self.moving[over] = False
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Visão de um jogo do lote com a interface do PacmanEngine (para os agentes)
+# ══════════════════════════════════════════════════════════════════════════════
+class BatchGameView:
+    _GHOSTS = {"blinky": BLINKY, "inky": INKY, "pinky": PINKY, "clyde": CLYDE}
+
+    def __init__(self, batch: BatchEngine, i: int):
+        self._batch = batch
+        self._i = i
+
+    @property
+    def level(self):
+        b = self._batch
+        food = b.food[self._i]
+        return np.where(food > 0, food, np.where((b.board == 1) | (b.board == 2), 0, b.board))
+
+    @property
+    def active_food(self):
+        rows, cols = np.nonzero(self._batch.food[self._i] == 1)
+        return set(zip(rows.tolist(), cols.tolist()))
+
+    @property
+    def active_capsules(self):
+        rows, cols = np.nonzero(self._batch.food[self._i] == 2)
+        return set(zip(rows.tolist(), cols.tolist()))
+
+    @property
+    def turns_allowed(self):
+        return self._batch.turns_allowed[self._i].tolist()
+
+    @property
+    def eaten_ghost(self):
+        return self._batch.eaten_ghost[self._i].tolist()
+
+    def __getattr__(self, name):
+        b, i = self._batch, self._i
+        ghost, _, field = name.partition("_")
+        if ghost in self._GHOSTS and field in ("x", "y", "dir", "dead", "box"):
+            arr = {"x": b.ghost_x, "y": b.ghost_y, "dir": b.ghost_dir,
+                   "dead": b.ghost_dead, "box": b.ghost_box}[field]
+            return arr[i, self._GHOSTS[ghost]].item()
+        if name in ("player_x", "player_y", "direction", "direction_cmd", "score", "lives",
+                    "powerup", "power_counter", "moving", "game_over", "game_won"):
+            return getattr(b, name)[i].item()
+        raise AttributeError(name)
@@ -0,0 +1,868 @@
+"""
+Headless Pac-Man simulation engine (no pygame dependency).
+
+All the per-frame game logic that used to live inside the pygame GameState
+lives here, so the simulation can run on machines without a display and step
+thousands of frames per second:
+
+  - PacmanEngine.step(policy)     → advances exactly one frame of the game
+  - PacmanEngine.add_observer()   → registers an observer (e.g. the pygame
+                                    renderer) notified once per frame
+  - PacmanEngine.get_successors() → directed graph of StateSnapshots, as before
+  - successor(snapshot, action)   → pure one-frame transition over the
+                                    immutable STATIC_LEVEL (no engine state)
+  - macro_successors(snapshot)    → edges that run to the next decision point,
+                                    costed in frames
+
+Boards other than env/board.py (e.g. env.maze_generator) are compiled by
+env.layout.compile_board; PacmanEngine(board=...) and the pure transitions
+(layout=...) take all sizes, spawns and ghost-house rects from the Layout.
+
+Rendering is optional: env.pacman_gamestate.GameState layers the original
+pygame drawing code on top of this engine as an observer.
+"""
+
+import sys
+import random
+
+# Carregamento robusto e dinâmico do board sem forçar caminhos específicos
+try:
+    from env.board import boards
+    BOARDS = boards
+except ImportError:
+    print("Erro: O arquivo board.py não foi encontrado na mesma pasta.")
+    sys.exit(1)
+
+from env.layout import compile_board
+from env.transposition import TranspositionStore, DEFAULT_CAPACITY
+
+WIDTH, HEIGHT = 900, 950
+FPS = 60
+RIGHT, LEFT, UP, DOWN = 0, 1, 2, 3
+
+# Numeração das células que podem ter comida: a célula FOOD_CELLS[n] é o bit n
+# de food_bits/capsule_bits (inteiros Python usados como bitboard)
+FOOD_CELLS = [(i, j) for i, row in enumerate(BOARDS) for j, v in enumerate(row) if v in (1, 2)]
+FOOD_INDEX = {cell: n for n, cell in enumerate(FOOD_CELLS)}
+FOOD_BIT = {cell: 1 << n for cell, n in FOOD_INDEX.items()}
+
+def cells_to_bits(cells) -> int:
+    bits = 0
+    for cell in cells:
+        bits |= FOOD_BIT[cell]
+    return bits
+
+def bits_to_cells(bits: int) -> frozenset:
+    cells = []
+    while bits:
+        low = bits & -bits
+        cells.append(FOOD_CELLS[low.bit_length() - 1])
+        bits ^= low
+    return frozenset(cells)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Hash de Zobrist (chaves aleatórias fixas, combinadas por XOR)
+# ══════════════════════════════════════════════════════════════════════════════
+_zobrist_rng = random.Random(0x9AC3A9)
+def _zobrist_keys(n):
+    return [_zobrist_rng.getrandbits(64) for _ in range(n)]
+
+# Uma chave por célula com comida e por célula com pastilha de poder
+ZOBRIST_FOOD    = _zobrist_keys(len(FOOD_CELLS))
+ZOBRIST_CAPSULE = _zobrist_keys(len(FOOD_CELLS))
+# Posições em pixels: uma tabela por eixo para o Pac-Man e para cada fantasma
+_ZOBRIST_MIN, _ZOBRIST_SPAN = -128, 1280
+ZOBRIST_X   = [_zobrist_keys(_ZOBRIST_SPAN) for _ in range(5)]
+ZOBRIST_Y   = [_zobrist_keys(_ZOBRIST_SPAN) for _ in range(5)]
+ZOBRIST_DIR = _zobrist_keys(4)
+
+def food_hash(food_bits: int, capsule_bits: int) -> int:
+    """Parte do hash referente à comida (o engine a mantém por XOR a cada comida comida)."""
+    h = 0
+    for keys, bits in ((ZOBRIST_FOOD, food_bits), (ZOBRIST_CAPSULE, capsule_bits)):
+        while bits:
+            low = bits & -bits
+            h ^= keys[low.bit_length() - 1]
+            bits ^= low
+    return h
+
+def _position_key(entity, x, y):
+    i, j = x - _ZOBRIST_MIN, y - _ZOBRIST_MIN
+    if type(i) is int and type(j) is int and 0 <= i < _ZOBRIST_SPAN and 0 <= j < _ZOBRIST_SPAN:
+        return ZOBRIST_X[entity][i] ^ ZOBRIST_Y[entity][j]
+    return hash((entity, x, y)) # Fora da tabela: ainda determinístico
+
+def ghosts_key(ghost_positions) -> int:
+    h = 0
+    for g, (gx, gy) in enumerate(ghost_positions, 1):
+        h ^= _position_key(g, gx, gy)
+    return h
+
+def zobrist_hash(food_key, player_pos, player_dir, ghost_key, score, powerup, lives) -> int:
+    """Hash O(1) com exatamente os campos comparados em StateSnapshot.__eq__
+    (`ghost_key` = ghosts_key(ghost_positions), reaproveitado entre sucessores)."""
+    return (food_key ^ _position_key(0, *player_pos) ^ ZOBRIST_DIR[player_dir] ^ ghost_key
+            ^ hash((score, powerup, lives)))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  StateSnapshot OTIMIZADO - Super Rápido para o A*
+# ══════════════════════════════════════════════════════════════════════════════
+class StateSnapshot:
+    __slots__ = (
+        "player_pos", "player_dir",
+        "ghost_positions", "ghost_directions", "ghost_dead", "ghost_in_box",
+        "food_bits", "capsule_bits",  # OTIMIZAÇÃO: Bitboards (int) em vez de frozensets de células
+        "score", "powerup", "power_counter",
+        "eaten_ghost", "lives", "game_over", "game_won",
+        "food_key", "_hash",  # Hash de Zobrist: parte da comida e hash completo, calculados uma vez
+    )
+
+    def __init__(self, **kw):
+        for k, v in kw.items():
+            _SLOT_SETTERS[k](self, v)
+
+    @classmethod
+    def _from_values(cls, *values):
+        """Construtor rápido: valores na ordem de __slots__ (usado na expansão)."""
+        self = cls.__new__(cls)
+        for setter, v in zip(_SLOT_SETTER_LIST, values):
+            setter(self, v)
+        return self
+
+    def __setattr__(self, *_):
+        raise AttributeError("StateSnapshot is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __lt__(self, other):
+        # Desempate determinístico nas filas de prioridade do AIMA (Node.__lt__ compara estados)
+        return self._hash < other._hash
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, StateSnapshot)
+            and self._hash         == other._hash   # Descarta quase todos os diferentes em O(1)
+            and self.player_pos    == other.player_pos
+            and self.player_dir    == other.player_dir
+            and self.ghost_positions == other.ghost_positions
+            and self.food_bits     == other.food_bits
+            and self.capsule_bits  == other.capsule_bits
+            and self.score         == other.score
+            and self.powerup       == other.powerup
+            and self.lives         == other.lives
+        )
+
+    # Conjuntos de células, decodificados sob demanda (só para quem precisa iterar)
+    @property
+    def active_food(self) -> frozenset:
+        return bits_to_cells(self.food_bits)
+
+    @property
+    def active_capsules(self) -> frozenset:
+        return bits_to_cells(self.capsule_bits)
+
+# Os descritores dos slots escrevem direto, sem passar pelo __setattr__ que bloqueia alterações
+_SLOT_SETTER_LIST = [getattr(StateSnapshot, k).__set__ for k in StateSnapshot.__slots__]
+_SLOT_SETTERS = dict(zip(StateSnapshot.__slots__, _SLOT_SETTER_LIST))
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Retângulos de colisão (substituem pygame.Rect)
+# ══════════════════════════════════════════════════════════════════════════════
+def player_rect(cx, cy, width=WIDTH, height=HEIGHT):
+    """Retângulo que o pygame.draw.circle(raio 20) devolvia, recortado à tela."""
+    left, top = max(cx - 20, 0), max(cy - 20, 0)
+    right, bottom = min(cx + 20, width), min(cy + 20, height)
+    if right <= left or bottom <= top:
+        return (cx, cy, 0, 0)
+    return (left, top, right - left, bottom - top)
+
+def rects_collide(a, b):
+    """Mesma semântica de pygame.Rect.colliderect para tuplas (x, y, w, h)."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    if aw <= 0 or ah <= 0 or bw <= 0 or bh <= 0:
+        return False
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Ghost (somente lógica; o desenho fica no renderer)
+# ══════════════════════════════════════════════════════════════════════════════
+# Retângulo (x0, x1, y0, y1) da casa dos fantasmas no board original (Layout.box)
+STOCK_BOX = (350, 550, 370, 480)
+
+class Ghost:
+    def __init__(self, x, y, target, speed, direction, dead, in_box, gid, level, box=STOCK_BOX):
+        self.x_pos     = x
+        self.y_pos     = y
+        self.center_x  = x + 22
+        self.center_y  = y + 22
+        self.target    = target
+        self.speed     = speed
+        self.direction = direction
+        self.dead      = dead
+        self.in_box    = in_box
+        self.id        = gid
+        self._level    = level
+        self._box      = box
+        self.turns, self.in_box = self._check_collisions()
+        self.rect = (self.center_x - 18, self.center_y - 18, 36, 36)
+
+    def _check_collisions(self):
+        level = self._level
+        num1  = (HEIGHT - 50) // 32
+        num2  = WIDTH // 30
+        num3  = 15
+        self.turns = [False, False, False, False]
+        if 0 < self.center_x // 30 < len(level[0]) - 1:
+            if level[(self.center_y - num3) // num1][self.center_x // num2] == 9:
+                self.turns[UP] = True
+            for (turn_idx, cx, cy) in [
+                (LEFT,  self.center_x - num3, self.center_y),
+                (RIGHT, self.center_x + num3, self.center_y),
+                (DOWN,  self.center_x,        self.center_y + num3),
+                (UP,    self.center_x,        self.center_y - num3),
+            ]:
+                cell = level[cy // num1][cx // num2]
+                if cell < 3 or (cell == 9 and (self.in_box or self.dead)):
+                    self.turns[turn_idx] = True
+
+            for moving_axis in ([UP, DOWN], [LEFT, RIGHT]):
+                if self.direction in moving_axis:
+                    if 12 <= self.center_x % num2 <= 18:
+                        for cy, t in [(self.center_y + num3, DOWN), (self.center_y - num3, UP)]:
+                            c = level[cy // num1][self.center_x // num2]
+                            if c < 3 or (c == 9 and (self.in_box or self.dead)):
+                                self.turns[t] = True
+                    if 12 <= self.center_y % num1 <= 18:
+                        for cx, t in [(self.center_x - num2, LEFT), (self.center_x + num2, RIGHT)]:
+                            c = level[self.center_y // num1][cx // num2]
+                            if c < 3 or (c == 9 and (self.in_box or self.dead)):
+                                self.turns[t] = True
+        else:
+            self.turns[RIGHT] = self.turns[LEFT] = True
+
+        x0, x1, y0, y1 = self._box
+        self.in_box = x0 < self.x_pos < x1 and y0 < self.y_pos < y1
+        return self.turns, self.in_box
+
+    def _greedy_move(self, prefer_vertical: bool, prefer_horizontal: bool):
+        tx, ty = self.target
+        d      = self.direction
+        t      = self.turns
+        sp     = self.speed
+
+        def try_turn_vertical():
+            if ty > self.y_pos and t[DOWN]:
+                self.direction = DOWN;  self.y_pos += sp;  return True
+            if ty < self.y_pos and t[UP]:
+                self.direction = UP;    self.y_pos -= sp;  return True
+            return False
+
+        def try_turn_horizontal():
+            if tx > self.x_pos and t[RIGHT]:
+                self.direction = RIGHT; self.x_pos += sp;  return True
+            if tx < self.x_pos and t[LEFT]:
+                self.direction = LEFT;  self.x_pos -= sp;  return True
+            return False
+
+        def fallback():
+            for td, dx, dy in [(DOWN,0,sp),(UP,0,-sp),(LEFT,-sp,0),(RIGHT,sp,0)]:
+                if t[td]:
+                    self.direction = td
+                    self.x_pos   += dx
+                    self.y_pos   += dy
+                    return
+
+        if d == RIGHT:
+            if tx > self.x_pos and t[RIGHT]:
+                if prefer_vertical and try_turn_vertical(): pass
+                else: self.x_pos += sp
+            elif not t[RIGHT]:
+                if not try_turn_vertical() and not try_turn_horizontal():
+                    fallback()
+            else:
+                if prefer_vertical and try_turn_vertical(): pass
+                else: self.x_pos += sp
+        elif d == LEFT:
+            if tx < self.x_pos and t[LEFT]:
+                if prefer_vertical and try_turn_vertical(): pass
+                else: self.x_pos -= sp
+            elif not t[LEFT]:
+                if not try_turn_vertical() and not try_turn_horizontal():
+                    fallback()
+            else:
+                if prefer_vertical and try_turn_vertical(): pass
+                else: self.x_pos -= sp
+        elif d == UP:
+            if ty < self.y_pos and t[UP]:
+                if prefer_horizontal and try_turn_horizontal(): pass
+                else: self.y_pos -= sp
+            elif not t[UP]:
+                if not try_turn_horizontal() and not try_turn_vertical():
+                    fallback()
+            else:
+                if prefer_horizontal and try_turn_horizontal(): pass
+                else: self.y_pos -= sp
+        elif d == DOWN:
+            if ty > self.y_pos and t[DOWN]:
+                if prefer_horizontal and try_turn_horizontal(): pass
+                else: self.y_pos += sp
+            elif not t[DOWN]:
+                if not try_turn_horizontal() and not try_turn_vertical():
+                    fallback()
+            else:
+                if prefer_horizontal and try_turn_horizontal(): pass
+                else: self.y_pos += sp
+
+        width = len(self._level[0]) * 30
+        if self.x_pos < -30:    self.x_pos = width
+        elif self.x_pos > width: self.x_pos -= 30
+        return self.x_pos, self.y_pos, self.direction
+
+    def move_blinky(self): return self._greedy_move(prefer_vertical=False, prefer_horizontal=False)
+    def move_inky(self):   return self._greedy_move(prefer_vertical=True, prefer_horizontal=False)
+    def move_pinky(self):  return self._greedy_move(prefer_vertical=False, prefer_horizontal=True)
+    def move_clyde(self):  return self._greedy_move(prefer_vertical=True, prefer_horizontal=True)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Movimento e sucessores puros (sem tocar no estado do engine)
+# ══════════════════════════════════════════════════════════════════════════════
+# Board compilado imutável: as paredes nunca mudam e a comida vem dos bitboards.
+# As funções puras abaixo usam o board original quando não recebem `layout`.
+STOCK_LAYOUT = compile_board(BOARDS, zobrist=(ZOBRIST_FOOD, ZOBRIST_CAPSULE))
+STATIC_LEVEL = STOCK_LAYOUT.tiles
+PLAYER_SPEED = 2
+ACTION_NAMES = {RIGHT: "RIGHT", LEFT: "LEFT", UP: "UP", DOWN: "DOWN"}
+_NUM1 = (HEIGHT - 50) // 32
+_NUM2 = WIDTH // 30
+
+def check_position(level, cx, cy, direction) -> list:
+    """Direções livres para o Pac-Man com centro em (cx, cy) andando em `direction`."""
+    turns = [False, False, False, False]
+    num1  = (HEIGHT - 50) // 32
+    num2  = WIDTH // 30
+    num3  = 15
+    if cx // 30 < len(level[0]) - 1:
+        d = direction
+        checks = {
+            RIGHT: (cy // num1, (cx + num3) // num2),
+            LEFT:  (cy // num1, (cx - num3) // num2),
+            UP:    ((cy - num3) // num1, cx // num2),
+            DOWN:  ((cy + num3) // num1, cx // num2),
+        }
+        if d in (UP, DOWN):
+            for row, col, t in [((cy + num3) // num1, cx // num2, DOWN), ((cy - num3) // num1, cx // num2, UP)]:
+                if 12 <= cx % num2 <= 18 and level[row][col] < 3: turns[t] = True
+            for row, col, t in [(cy // num1, (cx - num2) // num2, LEFT), (cy // num1, (cx + num2) // num2, RIGHT)]:
+                if 12 <= cy % num1 <= 18 and level[row][col] < 3: turns[t] = True
+        if d in (RIGHT, LEFT):
+            for row, col, t in [((cy + num1) // num1, cx // num2, DOWN), ((cy - num1) // num1, cx // num2, UP)]:
+                if 12 <= cx % num2 <= 18 and level[row][col] < 3: turns[t] = True
+            for row, col, t in [(cy // num1, (cx - num3) // num2, LEFT), (cy // num1, (cx + num3) // num2, RIGHT)]:
+                if 12 <= cy % num1 <= 18 and level[row][col] < 3: turns[t] = True
+        for t, (r, c) in checks.items():
+            if level[r][c] < 3: turns[t] = True
+    else:
+        turns[RIGHT] = turns[LEFT] = True
+    return turns
+
+
+def static_turns(x, y, direction, layout=None) -> tuple:
+    """check_position no board do layout para o Pac-Man em (x, y), memorizado (as paredes não mudam)."""
+    layout = layout or STOCK_LAYOUT
+    key = (x, y, direction)
+    turns = layout.turns_cache.get(key)
+    if turns is None:
+        turns = layout.turns_cache[key] = tuple(check_position(layout.tiles, x + 23, y + 24, direction))
+    return turns
+
+
+def _eat_at(x, y, food, caps, key, layout=None):
+    """Comida sob o Pac-Man em (x, y): novos bitboards, parte de Zobrist e pontos (0, 10 ou 50)."""
+    layout = layout or STOCK_LAYOUT
+    if 0 < x < layout.width - 30:
+        n = layout.food_index.get(((y + 24) // _NUM1, (x + 23) // _NUM2))
+        if n is not None:
+            if food >> n & 1:
+                return food ^ (1 << n), caps, key ^ layout.zobrist_food[n], 10
+            if caps >> n & 1:
+                return food, caps ^ (1 << n), key ^ layout.zobrist_capsule[n], 50
+    return food, caps, key, 0
+
+
+def successor(state: StateSnapshot, action: int, ghost_key: int = None, layout=None) -> StateSnapshot:
+    """Estado após um frame do Pac-Man andando em `action` (mesmo efeito de _advance_frame).
+
+    Função pura: lê só o snapshot e o board do layout (STATIC_LEVEL por
+    padrão), e os fantasmas ficam parados como na expansão original.
+    """
+    x, y = state.player_pos
+    if static_turns(x, y, action, layout)[action]:
+        if   action == RIGHT: x += PLAYER_SPEED
+        elif action == LEFT:  x -= PLAYER_SPEED
+        elif action == UP:    y -= PLAYER_SPEED
+        elif action == DOWN:  y += PLAYER_SPEED
+
+    food, caps, key, gained = _eat_at(x, y, state.food_bits, state.capsule_bits, state.food_key, layout)
+    score, powerup, pcnt, eaten = state.score + gained, state.powerup, state.power_counter, state.eaten_ghost
+    if gained == 50:
+        powerup, pcnt, eaten = True, 0, (False, False, False, False)
+
+    if ghost_key is None:
+        ghost_key = ghosts_key(state.ghost_positions)
+    player_pos = (x, y)
+    lives = state.lives
+    # Mesma ordem de StateSnapshot.__slots__
+    return StateSnapshot._from_values(
+        player_pos, action,
+        state.ghost_positions, state.ghost_directions, state.ghost_dead, state.ghost_in_box,
+        food, caps,
+        score, powerup, pcnt,
+        eaten, lives, state.game_over, state.game_won,
+        key, zobrist_hash(key, player_pos, action, ghost_key, score, powerup, lives),
+    )
+
+
+def successors(state: StateSnapshot, layout=None) -> list:
+    """Pares (nome da ação, próximo estado) para as direções livres em `state`."""
+    if state.game_over or state.game_won:
+        return []
+    x, y = state.player_pos
+    allowed = static_turns(x, y, state.player_dir, layout)
+    ghost_key = ghosts_key(state.ghost_positions)
+    return [(ACTION_NAMES[a], successor(state, a, ghost_key, layout)) for a in (RIGHT, LEFT, UP, DOWN) if allowed[a]]
+
+
+# ── Macro-ações: uma aresta por trecho sem decisão ──────────────────────────
+MACRO_MAX_FRAMES = 600
+
+def macro_successors(state: StateSnapshot, max_frames: int = MACRO_MAX_FRAMES, layout=None) -> list:
+    """Triplas (nome da ação, próximo estado, frames) andando em cada direção livre
+    até o próximo ponto de decisão:
+      - o Pac-Man parou (parede) ou surgiu uma curva nova (junção);
+      - comeu alguma coisa (comida ou pastilha de poder);
+      - entrou na zona de risco (2 células) de um fantasma vivo;
+      - o poder acabou;
+      - passaram max_frames frames.
+    Como em successor(), os fantasmas ficam parados; ao contrário dele, o tempo
+    do poder corre (power_counter) e o túnel é atravessado como em step().
+    O custo da aresta é o número de frames.
+    """
+    if state.game_over or state.game_won:
+        return []
+    layout = layout or STOCK_LAYOUT
+    cols, width = layout.cols, layout.width
+    ghost_cells = [((gy + 24) // _NUM1, (gx + 23) // _NUM2)
+                   for (gx, gy), dead in zip(state.ghost_positions, state.ghost_dead) if not dead]
+
+    def at_risk(x, y):
+        r, c = (y + 24) // _NUM1, (x + 23) // _NUM2
+        for gr, gc in ghost_cells:
+            dc = abs(c - gc)
+            if abs(r - gr) + min(dc, cols - dc) <= 2:
+                return True
+        return False
+
+    x0, y0 = state.player_pos
+    allowed = static_turns(x0, y0, state.player_dir, layout)
+    ghost_key = ghosts_key(state.ghost_positions)
+    edges = []
+    for a in (RIGHT, LEFT, UP, DOWN):
+        if not allowed[a]:
+            continue
+        x, y = x0, y0
+        food, caps, key = state.food_bits, state.capsule_bits, state.food_key
+        score, powerup, pcnt, eaten = state.score, state.powerup, state.power_counter, state.eaten_ghost
+        turns = static_turns(x, y, a, layout)
+        frames = 0
+        while frames < max_frames:
+            frames += 1
+            # Relógio do poder, como em _update_counters
+            expired = False
+            if powerup:
+                if pcnt < 600:
+                    pcnt += 1
+                else:
+                    powerup, pcnt, eaten, expired = False, 0, (False, False, False, False), True
+            if not turns[a]:
+                break # Parede: não anda mais nessa direção
+            if   a == RIGHT: x += PLAYER_SPEED
+            elif a == LEFT:  x -= PLAYER_SPEED
+            elif a == UP:    y -= PLAYER_SPEED
+            else:            y += PLAYER_SPEED
+            food, caps, key, gained = _eat_at(x, y, food, caps, key, layout)
+            score += gained
+            if gained == 50:
+                powerup, pcnt, eaten = True, 0, (False, False, False, False)
+            if   x > width: x = -47
+            elif x < -50: x = width - 3
+
+            previous, turns = turns, static_turns(x, y, a, layout)
+            if (expired or gained or at_risk(x, y)
+                    or any(t and not p for t, p in zip(turns, previous))):
+                break
+
+        player_pos = (x, y)
+        lives = state.lives
+        edges.append((ACTION_NAMES[a], StateSnapshot._from_values(
+            player_pos, a,
+            state.ghost_positions, state.ghost_directions, state.ghost_dead, state.ghost_in_box,
+            food, caps,
+            score, powerup, pcnt,
+            eaten, lives, state.game_over, state.game_won,
+            key, zobrist_hash(key, player_pos, a, ghost_key, score, powerup, lives),
+        ), frames))
+    return edges
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PacmanEngine (lógica pura, sem pygame)
+# ══════════════════════════════════════════════════════════════════════════════
+class PacmanEngine:
+    profiler = None # FrameProfiler (env/profiler.py) que recebe as fases do step; None = desligado
+
+    def __init__(self, graph_capacity: int = DEFAULT_CAPACITY, board=None):
+        # Board compilado (tamanho, posições iniciais, casa dos fantasmas); o original por padrão
+        self.layout = STOCK_LAYOUT if board is None else compile_board(board)
+        self.observers: list = []
+        # Grafo de estados com capacidade limitada (LRU), em vez de um dict que só cresce
+        self._graph = TranspositionStore(graph_capacity)
+        self._reset()
+
+    def add_observer(self, observer):
+        """Registra um observador com o método on_frame(engine), chamado uma
+        vez por frame com as posições de antes do movimento (ponto em que o
+        loop original desenhava a tela)."""
+        self.observers.append(observer)
+
+    def _reset(self):
+        layout = self.layout
+        self.level           = [list(row) for row in layout.tiles]
+        # OTIMIZAÇÃO: Cache das comidas para não varrer a matriz inteira
+        self.active_food     = set((i, j) for i, row in enumerate(self.level) for j, v in enumerate(row) if v == 1)
+        self.active_capsules = set((i, j) for i, row in enumerate(self.level) for j, v in enumerate(row) if v == 2)
+        self.food_bits       = layout.food_bits
+        self.capsule_bits    = layout.capsule_bits
+        self.food_key        = layout.food_hash(self.food_bits, self.capsule_bits)
+
+        self.player_x, self.player_y = layout.player_start
+        self.direction       = RIGHT
+        self.direction_cmd   = RIGHT
+        self.turns_allowed   = [False, False, False, False]
+        self.player_speed    = 2
+        self.score           = 0
+        self.lives           = 3
+        self.powerup         = False
+        self.power_counter   = 0
+        self.eaten_ghost     = [False, False, False, False]
+        blinky, inky, pinky, clyde = layout.ghost_starts
+        self.blinky_x, self.blinky_y, self.blinky_dir = blinky
+        self.inky_x,   self.inky_y,   self.inky_dir   = inky
+        self.pinky_x,  self.pinky_y,  self.pinky_dir  = pinky
+        self.clyde_x,  self.clyde_y,  self.clyde_dir  = clyde
+        self.blinky_dead = self.inky_dead = self.pinky_dead = self.clyde_dead = False
+        self.blinky_box  = self.inky_box  = self.pinky_box  = self.clyde_box  = False
+        self.targets      = [(self.player_x, self.player_y)] * 4
+        self.ghost_speeds  = [2, 2, 2, 2]
+        self.counter       = 0
+        self.flicker       = False
+        self.moving        = False
+        self.startup_counter = 0
+        self.game_over     = False
+        self.game_won      = False
+
+    def get_start_state(self) -> StateSnapshot:
+        self._reset()
+        return self._snapshot()
+
+    @staticmethod
+    def is_goal_state(state: StateSnapshot) -> bool:
+        return state.food_bits == 0 and state.capsule_bits == 0
+
+    def get_successors(self, state: StateSnapshot) -> list:
+        # Expansão pura: não carrega o snapshot nem mexe no estado do engine
+        edges = successors(state, self.layout)
+        self._graph.put(state, edges) # Deduplica as arestas em O(1)
+        return edges
+
+    # ── Frame completo ───────────────────────────────────────────────────────
+    def step(self, policy=None):
+        """Avança exatamente um frame do jogo.
+
+        `policy` é um callable sem argumentos (ex.: agent.get_action) chamado
+        quando o Pac-Man pode se mover; se devolver uma direção ela vira o
+        novo direction_cmd. Sem policy, vale o direction_cmd atual (teclado).
+        """
+        self._update_counters()
+
+        cx = self.player_x + 23
+        cy = self.player_y + 24
+        self._update_ghost_speeds()
+        self._check_win_condition()
+        player_rect_now = player_rect(cx, cy, self.layout.width, self.layout.height)
+
+        blinky, inky, pinky, clyde = self._make_ghost(0), self._make_ghost(1), self._make_ghost(2), self._make_ghost(3)
+        ghosts = [blinky, inky, pinky, clyde]
+
+        self.targets = self._get_targets(blinky, inky, pinky, clyde)
+        self.turns_allowed = self._check_position(cx, cy)
+        profiler = self.profiler
+        if profiler is not None: profiler.mark("update")
+
+        for observer in self.observers:
+            observer.on_frame(self)
+
+        if policy is not None and self.moving and not self.game_over and not self.game_won:
+            action = policy()
+            if action is not None:
+                self.direction_cmd = action
+        if profiler is not None: profiler.mark("agent")
+
+        # Aplica o comando de direção se a parede permitir
+        for d in [RIGHT, LEFT, UP, DOWN]:
+            if self.direction_cmd == d and self.turns_allowed[d]:
+                self.direction = d
+
+        # Move os personagens
+        if self.moving:
+            self._move_player()
+            self._move_ghosts(blinky, inky, pinky, clyde)
+        if profiler is not None: profiler.mark("move")
+
+        # Checa colisões
+        self.score, self.powerup, self.power_counter, self.eaten_ghost = self._check_food_collisions(cx, cy)
+        self._handle_ghost_collisions(player_rect_now, ghosts)
+
+        # Túnel
+        width = self.layout.width
+        if   self.player_x > width: self.player_x = -47
+        elif self.player_x < -50: self.player_x = width - 3
+
+        for ghost, attr in [(blinky, "blinky_dead"), (inky, "inky_dead"), (pinky, "pinky_dead"), (clyde, "clyde_dead")]:
+            if ghost.in_box and getattr(self, attr): setattr(self, attr, False)
+        if profiler is not None: profiler.mark("collisions")
+
+    # ── Snapshot Otimizado ───────────────────────────────────────────────────
+    def _snapshot(self) -> StateSnapshot:
+        player_pos = (self.player_x, self.player_y)
+        ghost_positions = (
+            (self.blinky_x, self.blinky_y),
+            (self.inky_x,   self.inky_y),
+            (self.pinky_x,  self.pinky_y),
+            (self.clyde_x,  self.clyde_y),
+        )
+        return StateSnapshot(
+            player_pos        = player_pos,
+            player_dir        = self.direction,
+            ghost_positions   = ghost_positions,
+            ghost_directions  = (self.blinky_dir, self.inky_dir, self.pinky_dir,  self.clyde_dir),
+            ghost_dead        = (self.blinky_dead, self.inky_dead, self.pinky_dead,  self.clyde_dead),
+            ghost_in_box      = (self.blinky_box, self.inky_box, self.pinky_box,  self.clyde_box),
+            food_bits         = self.food_bits,    # Instantâneo (int imutável)
+            capsule_bits      = self.capsule_bits,
+            score             = self.score,
+            powerup           = self.powerup,
+            power_counter     = self.power_counter,
+            eaten_ghost       = tuple(self.eaten_ghost),
+            lives             = self.lives,
+            game_over         = self.game_over,
+            game_won          = self.game_won,
+            food_key          = self.food_key,     # Mantido por XOR em _check_food_collisions
+            _hash             = zobrist_hash(self.food_key, player_pos, self.direction,
+                                             ghosts_key(ghost_positions), self.score, self.powerup, self.lives),
+        )
+
+    def _load_snapshot(self, s: StateSnapshot):
+        self.level = [list(row) for row in self.layout.tiles]
+        remaining = s.food_bits | s.capsule_bits
+        for n, (i, j) in enumerate(self.layout.food_cells):
+            if not remaining >> n & 1:
+                self.level[i][j] = 0
+
+        self.food_bits, self.capsule_bits = s.food_bits, s.capsule_bits
+        self.food_key = s.food_key
+        self.active_food = set(self.layout.bits_to_cells(s.food_bits))
+        self.active_capsules = set(self.layout.bits_to_cells(s.capsule_bits))
+
+        self.player_x, self.player_y = s.player_pos
+        self.direction     = s.player_dir
+        (self.blinky_x, self.blinky_y), (self.inky_x,   self.inky_y), (self.pinky_x,  self.pinky_y), (self.clyde_x,  self.clyde_y) = s.ghost_positions
+        self.blinky_dir, self.inky_dir, self.pinky_dir,  self.clyde_dir = s.ghost_directions
+        self.blinky_dead, self.inky_dead, self.pinky_dead,  self.clyde_dead = s.ghost_dead
+        self.blinky_box, self.inky_box, self.pinky_box,  self.clyde_box  = s.ghost_in_box
+        self.score         = s.score
+        self.powerup       = s.powerup
+        self.power_counter = s.power_counter
+        self.eaten_ghost   = list(s.eaten_ghost)
+        self.lives         = s.lives
+        self.game_over     = s.game_over
+        self.game_won      = s.game_won
+        self.targets       = [s.player_pos] * 4
+        self.ghost_speeds  = [2, 2, 2, 2]
+        self.moving        = True
+        self.startup_counter = 180
+
+    def _advance_frame(self):
+        cx = self.player_x + 23
+        cy = self.player_y + 24
+        self.turns_allowed = self._check_position(cx, cy)
+        self._move_player()
+        cx = self.player_x + 23
+        cy = self.player_y + 24
+        self.score, self.powerup, self.power_counter, self.eaten_ghost = self._check_food_collisions(cx, cy)
+
+    def _make_ghost(self, gid: int) -> Ghost:
+        xs    = [self.blinky_x, self.inky_x,   self.pinky_x,  self.clyde_x]
+        ys    = [self.blinky_y, self.inky_y,    self.pinky_y,  self.clyde_y]
+        dirs  = [self.blinky_dir, self.inky_dir, self.pinky_dir, self.clyde_dir]
+        deads = [self.blinky_dead, self.inky_dead, self.pinky_dead, self.clyde_dead]
+        boxes = [self.blinky_box,  self.inky_box,  self.pinky_box,  self.clyde_box]
+        return Ghost(
+            xs[gid], ys[gid], self.targets[gid], self.ghost_speeds[gid],
+            dirs[gid], deads[gid], boxes[gid], gid, self.level, self.layout.box,
+        )
+
+    def _move_ghosts(self, blinky, inky, pinky, clyde):
+        def _apply(ghost, name, x_attr, y_attr, d_attr, dead_attr):
+            if not getattr(self, dead_attr) and not ghost.in_box:
+                nx, ny, nd = getattr(ghost, f"move_{name}")()
+            else:
+                nx, ny, nd = ghost.move_clyde()
+            setattr(self, x_attr, nx)
+            setattr(self, y_attr, ny)
+            setattr(self, d_attr, nd)
+
+        _apply(blinky, "blinky", "blinky_x", "blinky_y", "blinky_dir", "blinky_dead")
+        _apply(pinky,  "pinky",  "pinky_x",  "pinky_y",  "pinky_dir",  "pinky_dead")
+        _apply(inky,   "inky",   "inky_x",   "inky_y",   "inky_dir",   "inky_dead")
+        cx, cy, cd = clyde.move_clyde()
+        self.clyde_x, self.clyde_y, self.clyde_dir = cx, cy, cd
+
+    def _handle_ghost_collisions(self, player_rect, ghosts):
+        blinky, inky, pinky, clyde = ghosts
+        ghost_list = [(blinky, "blinky_dead", 0), (inky, "inky_dead", 1), (pinky, "pinky_dead", 2), (clyde, "clyde_dead", 3)]
+
+        if not self.powerup:
+            if any(rects_collide(player_rect, g.rect) and not g.dead for g, _, _ in ghost_list):
+                self._lose_life()
+            return
+
+        for ghost, dead_attr, gid in ghost_list:
+            if not rects_collide(player_rect, ghost.rect) or ghost.dead:
+                continue
+            if self.eaten_ghost[gid]:
+                self._lose_life()
+            else:
+                setattr(self, dead_attr, True)
+                self.eaten_ghost[gid] = True
+                self.score += (2 ** self.eaten_ghost.count(True)) * 100
+
+    def _lose_life(self):
+        if self.lives > 0:
+            self.lives -= 1
+            self._reset_positions()
+        else:
+            self.game_over = True
+            self.moving    = False
+
+    def _reset_positions(self):
+        self.powerup = False;  self.power_counter = 0
+        self.startup_counter = 0
+        self.player_x, self.player_y = self.layout.player_start
+        self.direction = self.direction_cmd = RIGHT
+        blinky, inky, pinky, clyde = self.layout.ghost_starts
+        self.blinky_x, self.blinky_y, self.blinky_dir = blinky
+        self.inky_x,   self.inky_y,   self.inky_dir   = inky
+        self.pinky_x,  self.pinky_y,  self.pinky_dir  = pinky
+        self.clyde_x,  self.clyde_y,  self.clyde_dir  = clyde
+        self.eaten_ghost = [False, False, False, False]
+        self.blinky_dead = self.inky_dead = self.pinky_dead = self.clyde_dead = False
+
+    def _check_food_collisions(self, cx, cy):
+        num1 = (HEIGHT - 50) // 32
+        num2 = WIDTH // 30
+        scor, power, pcnt, eaten = self.score, self.powerup, self.power_counter, self.eaten_ghost
+        layout = self.layout
+        if 0 < self.player_x < layout.width - 30:
+            row, col = cy // num1, cx // num2
+            cell = self.level[row][col]
+            if cell == 1:
+                self.level[row][col] = 0
+                self.active_food.discard((row, col)) # Remove do cache em O(1)
+                n = layout.food_index[(row, col)]
+                self.food_bits ^= 1 << n
+                self.food_key  ^= layout.zobrist_food[n]
+                scor += 10
+            elif cell == 2:
+                self.level[row][col] = 0
+                self.active_capsules.discard((row, col)) # Remove do cache
+                n = layout.food_index[(row, col)]
+                self.capsule_bits ^= 1 << n
+                self.food_key     ^= layout.zobrist_capsule[n]
+                scor += 50
+                power = True
+                pcnt  = 0
+                eaten = [False, False, False, False]
+        return scor, power, pcnt, eaten
+
+    def _move_player(self):
+        d, t, sp = self.direction, self.turns_allowed, self.player_speed
+        if   d == RIGHT and t[RIGHT]: self.player_x += sp
+        elif d == LEFT  and t[LEFT]:  self.player_x -= sp
+        elif d == UP    and t[UP]:    self.player_y -= sp
+        elif d == DOWN  and t[DOWN]:  self.player_y += sp
+
+    def _check_position(self, cx, cy) -> list:
+        return check_position(self.level, cx, cy, self.direction)
+
+    def _get_targets(self, blinky, inky, pinky, clyde) -> list:
+        px, py = self.player_x, self.player_y
+        layout = self.layout
+        field  = layout.height - 50 # 900 no board original
+        run_x  = layout.width if px < layout.width / 2 else 0
+        run_y  = field if py < field / 2 else 0
+        home   = layout.home
+        exit_target = layout.exit_target
+        x0, x1, y0, y1 = layout.box_zone
+
+        def target_for(ghost, gid, chase_target):
+            if ghost.dead: return home
+            if self.powerup and not self.eaten_ghost[gid]: return (run_x, run_y)
+            if self.powerup and self.eaten_ghost[gid]:
+                if x0 < ghost.x_pos < x1 and y0 < ghost.y_pos < y1: return exit_target
+                return (px, py)
+            if x0 < ghost.x_pos < x1 and y0 < ghost.y_pos < y1: return exit_target
+            return chase_target
+
+        return [target_for(blinky, 0, (px, py)), target_for(inky, 1, (px, py)), target_for(pinky, 2, (px, py)), target_for(clyde, 3, (px + 50, py))]
+
+    def _update_counters(self):
+        if self.counter < 19:
+            self.counter += 1
+            if self.counter > 3: self.flicker = False
+        else:
+            self.counter = 0;  self.flicker = True
+
+        if self.powerup and self.power_counter < 600: self.power_counter += 1
+        elif self.powerup and self.power_counter >= 600:
+            self.power_counter = 0;  self.powerup = False
+            self.eaten_ghost = [False, False, False, False]
+
+        if self.startup_counter < 180 and not self.game_over and not self.game_won:
+            self.moving = False;  self.startup_counter += 1
+        else:
+            self.moving = True
+
+    def _update_ghost_speeds(self):
+        self.ghost_speeds = [1 if self.powerup else 2] * 4
+        for i, eaten in enumerate(self.eaten_ghost):
+            if eaten: self.ghost_speeds[i] = 2
+        for i, attr in enumerate(["blinky_dead","inky_dead","pinky_dead","clyde_dead"]):
+            if getattr(self, attr): self.ghost_speeds[i] = 4
+
+    def _check_win_condition(self):
+        self.game_won = all(1 not in row and 2 not in row for row in self.level)
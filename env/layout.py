@@ -0,0 +1,143 @@
+"""
+Compilador de boards: qualquer matriz com os códigos de env/board.py vira um
+Layout imutável com tudo que o motor e as buscas precisam, sem os literais
+33/30 (linhas/colunas) e 900/950 (pixels) do board original.
+
+  - tiles: o board como tupla de tuplas (paredes nunca mudam);
+  - walkable: bytearray linha a linha (1 = comida, vazio ou portão 9), o
+    mesmo formato de problems.pacman_problem.walkable_mask;
+  - food: bytearray com o código (0, 1 ou 2) de cada célula, e a numeração
+    food_cells/food_index/food_bit dos bitboards de comida do StateSnapshot;
+  - geometria em pixels: células de 30x28 px, largura cols·30 e altura
+    rows·28 + 26 (900x950 no board original);
+  - posições iniciais e retângulos da casa dos fantasmas, derivados do
+    portão (9) com os mesmos deslocamentos do board original; o Pac-Man nasce
+    na célula livre (com saída à direita) mais perto de 11 linhas abaixo do
+    portão e o Blinky na primeira célula andável.
+
+compile_board(board) guarda os Layouts já compilados pela chave do board
+(problems.maze_distances.board_key não é usada aqui para não puxar numpy).
+"""
+
+import hashlib
+import random
+
+CELL_W, CELL_H = 30, 28   # WIDTH // 30 e (HEIGHT - 50) // 32 da tela original
+RIGHT, LEFT, UP, DOWN = 0, 1, 2, 3
+
+
+def is_walkable(tile) -> bool:
+    return tile < 3 or tile == 9
+
+
+class Layout:
+    def __init__(self, board, zobrist=None):
+        self.tiles = tuple(tuple(row) for row in board)
+        self.rows, self.cols = len(self.tiles), len(self.tiles[0])
+        if any(len(row) != self.cols for row in self.tiles):
+            raise ValueError("todas as linhas do board precisam ter o mesmo tamanho")
+        self.key = hashlib.sha1(repr(self.tiles).encode()).hexdigest()[:20]
+
+        # Arrays empacotados, índice r * cols + c
+        flat = [t for row in self.tiles for t in row]
+        self.walkable = bytearray(is_walkable(t) for t in flat)
+        self.food = bytearray(t if t in (1, 2) else 0 for t in flat)
+
+        # Numeração dos bitboards: a célula food_cells[n] é o bit n
+        self.food_cells = [(i // self.cols, i % self.cols) for i, t in enumerate(self.food) if t]
+        self.food_index = {cell: n for n, cell in enumerate(self.food_cells)}
+        self.food_bit = {cell: 1 << n for cell, n in self.food_index.items()}
+        self.food_bits = self.cells_to_bits(c for c in self.food_cells if self.tile(c) == 1)
+        self.capsule_bits = self.cells_to_bits(c for c in self.food_cells if self.tile(c) == 2)
+        if zobrist is None:
+            rng = random.Random(self.key)
+            zobrist = ([rng.getrandbits(64) for _ in self.food_cells],
+                       [rng.getrandbits(64) for _ in self.food_cells])
+        self.zobrist_food, self.zobrist_capsule = zobrist
+
+        # Geometria em pixels
+        self.width = self.cols * CELL_W
+        self.height = self.rows * CELL_H + 26
+        self._place_spawns()
+        self.turns_cache = {} # static_turns do motor, por layout
+
+    def tile(self, cell):
+        r, c = cell
+        return self.tiles[r][c]
+
+    def cells_to_bits(self, cells) -> int:
+        bits = 0
+        for cell in cells:
+            bits |= self.food_bit[cell]
+        return bits
+
+    def bits_to_cells(self, bits: int) -> frozenset:
+        cells = []
+        while bits:
+            low = bits & -bits
+            cells.append(self.food_cells[low.bit_length() - 1])
+            bits ^= low
+        return frozenset(cells)
+
+    def food_hash(self, food_bits: int, capsule_bits: int) -> int:
+        h = 0
+        for keys, bits in ((self.zobrist_food, food_bits), (self.zobrist_capsule, capsule_bits)):
+            while bits:
+                low = bits & -bits
+                h ^= keys[low.bit_length() - 1]
+                bits ^= low
+        return h
+
+    def _place_spawns(self):
+        gates = [(r, c) for r in range(self.rows) for c in range(self.cols) if self.tiles[r][c] == 9]
+        if not gates:
+            raise ValueError("o board precisa de um portão (9) na casa dos fantasmas")
+        gate_r = min(r for r, _ in gates)
+        gc0 = min(c for r, c in gates if r == gate_r)
+        gc1 = max(c for r, c in gates if r == gate_r)
+        gx, gx1, gy = gc0 * CELL_W, gc1 * CELL_W, gate_r * CELL_H
+
+        self.gate = (gate_r, gc0, gc1)
+        self.box = (gx - 70, gx1 + 100, gy + 6, gy + 116)          # Ghost.in_box (350..550, 370..480)
+        self.box_zone = (gx - 80, gx1 + 110, gy - 24, gy + 136)    # Alvo de saída (340..560, 340..500)
+        self.home = (gx - 40, gy + 36)                              # Alvo dos mortos (380, 400)
+        # Saída da casa: a primeira linha aberta acima do portão. Os fantasmas só comparam
+        # o sinal de alvo - posição, então qualquer y acima de box_zone dá as mesmas decisões
+        # (no board original: 336, antes o literal 100)
+        exit_r = next((r for r in range(gate_r - 1, -1, -1)
+                       if any(self.walkable[r * self.cols + c] for c in range(gc0, gc1 + 1))), 0)
+        self.exit_target = (gx - 20, exit_r * CELL_H)               # (400, 336)
+
+        x0, x1, y0, y1 = self.box
+        def inside_box(r, c):
+            return x0 < c * CELL_W < x1 and y0 < r * CELL_H < y1
+
+        walk = [(r, c) for r in range(self.rows) for c in range(self.cols) if self.walkable[r * self.cols + c]]
+        blinky = next((r, c) for r, c in walk if self.tiles[r][c] != 9 and not inside_box(r, c))
+        target = (gate_r + 11, gc1)
+        player = min(((r, c) for r, c in walk
+                      if self.tiles[r][c] < 3 and not inside_box(r, c)
+                      and c + 1 < self.cols and self.walkable[r * self.cols + c + 1]),
+                     key=lambda rc: (abs(rc[0] - target[0]) + abs(rc[1] - target[1]), rc))
+
+        self.player_start = (player[1] * CELL_W, player[0] * CELL_H - 9)             # (450, 663)
+        self.ghost_starts = [
+            (blinky[1] * CELL_W - 4, blinky[0] * CELL_H + 2, RIGHT),                 # (56, 58)
+            (gx1 - 10, (gate_r + 1) * CELL_H - 4, UP),                               # Inky (440, 388)
+            (gx1 - 10, (gate_r + 3) * CELL_H - 10, UP),                              # Pinky (440, 438)
+            (gx1 - 10, (gate_r + 3) * CELL_H - 10, UP),                              # Clyde (440, 438)
+        ]
+
+    def __repr__(self):
+        return f"<Layout {self.rows}x{self.cols} food={len(self.food_cells)}>"
+
+
+_compiled: dict = {}
+
+def compile_board(board, zobrist=None) -> Layout:
+    """Layout do board, reaproveitando o já compilado para o mesmo conteúdo."""
+    key = tuple(tuple(row) for row in board)
+    layout = _compiled.get(key)
+    if layout is None:
+        layout = _compiled[key] = Layout(key, zobrist)
+    return layout
@@ -0,0 +1,176 @@
+"""
+Gerador procedural de labirintos no formato de env/board.py.
+
+generate_board(rows, cols, seed) devolve uma matriz de códigos 0..9 que o
+compile_board (env/layout.py) e o PacmanEngine(board=...) aceitam direto,
+para medir as buscas em boards de qualquer tamanho:
+
+  1. labirinto perfeito por DFS sobre as células de linha e coluna ímpares
+     (corredores de 1 célula, paredes de 1 célula, borda fechada);
+  2. "braid": becos sem saída ganham uma segunda saída com probabilidade
+     `braid` (os fantasmas gulosos do motor travam menos, como no original);
+  3. casa dos fantasmas no centro, com a mesma geometria do board original
+     (8x5 células, portão 9 de 2 células no topo, anel livre em volta);
+  4. `tunnels` túneis abrindo a primeira e a última coluna da mesma linha;
+  5. reparo de conectividade: paredes entre componentes diferentes são
+     abertas até sobrar uma componente só (BFS com túnel);
+  6. comida (1) em todo corredor, pastilhas de poder (2) perto dos cantos e
+     células vazias (0) no anel da casa e nos túneis;
+  7. cada parede recebe o código de desenho (3..8) pelos vizinhos parede.
+
+O mesmo (rows, cols, seed, ...) gera sempre o mesmo board.
+"""
+
+import random
+from collections import deque
+
+MIN_ROWS, MIN_COLS = 15, 16
+WALL = 3
+HOUSE_ROWS, HOUSE_COLS = 5, 8 # Casa com paredes, como as linhas 13..17 e colunas 11..18 do original
+
+
+def generate_board(rows: int = 33, cols: int = 30, seed: int = 0, braid: float = 1.0,
+                   tunnels: int = 1, capsules: int = 4) -> list:
+    if rows < MIN_ROWS or cols < MIN_COLS:
+        raise ValueError(f"o board precisa ter pelo menos {MIN_ROWS}x{MIN_COLS} células")
+    rng = random.Random(seed)
+    grid = [[WALL] * cols for _ in range(rows)]
+    _carve_maze(grid, rng, braid)
+
+    # Casa dos fantasmas centralizada e anel livre em volta
+    hr, hc = rows // 2 - HOUSE_ROWS // 2, cols // 2 - HOUSE_COLS // 2
+    ring = set()
+    for r in range(hr - 1, hr + HOUSE_ROWS + 1):
+        for c in range(hc - 1, hc + HOUSE_COLS + 1):
+            inside = hr <= r < hr + HOUSE_ROWS and hc <= c < hc + HOUSE_COLS
+            border = r in (hr, hr + HOUSE_ROWS - 1) or c in (hc, hc + HOUSE_COLS - 1)
+            grid[r][c] = WALL if inside and border else 0
+            if not inside:
+                ring.add((r, c))
+    grid[hr][hc + 3] = grid[hr][hc + 4] = 9
+    house = {(r, c) for r in range(hr, hr + HOUSE_ROWS) for c in range(hc, hc + HOUSE_COLS)}
+
+    # Túneis: linhas ímpares (corredores) fora da faixa da casa, abertas nas duas bordas
+    candidates = sorted((r for r in range(1, rows - 1, 2) if not hr - 1 <= r <= hr + HOUSE_ROWS),
+                        key=lambda r: (abs(r - rows // 2), r))
+    for r in candidates[:tunnels]:
+        for step, c in ((1, 0), (-1, cols - 1)):
+            while 0 <= c < cols and grid[r][c] != 1 and (r, c) not in ring:
+                grid[r][c] = 0
+                c += step
+
+    _connect(grid, rng, fixed=house)
+
+    # Pastilhas de poder na comida mais perto dos cantos
+    corners = [(2, 1), (2, cols - 2), (rows - 3, 1), (rows - 3, cols - 2)]
+    food = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] == 1]
+    for target in corners[:capsules]:
+        if food:
+            r, c = min(food, key=lambda rc: (abs(rc[0] - target[0]) + abs(rc[1] - target[1]), rc))
+            grid[r][c] = 2
+            food.remove((r, c))
+
+    _decorate_walls(grid)
+    return grid
+
+
+def _carve_maze(grid, rng, braid):
+    rows, cols = len(grid), len(grid[0])
+    cells = [(r, c) for r in range(1, rows - 1, 2) for c in range(1, cols - 1, 2)]
+
+    def lattice_neighbors(r, c):
+        for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+            nr, nc = r + dr, c + dc
+            if 1 <= nr < rows - 1 and 1 <= nc < cols - 1:
+                yield nr, nc
+
+    # DFS iterativa (backtracker recursivo) a partir de uma célula sorteada
+    start = rng.choice(cells)
+    grid[start[0]][start[1]] = 1
+    stack = [start]
+    while stack:
+        r, c = stack[-1]
+        fresh = [n for n in lattice_neighbors(r, c) if grid[n[0]][n[1]] == WALL]
+        if not fresh:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(fresh)
+        grid[(r + nr) // 2][(c + nc) // 2] = grid[nr][nc] = 1
+        stack.append((nr, nc))
+
+    # Braid: becos sem saída (uma só passagem aberta) ganham mais uma
+    for r, c in cells:
+        closed = [(nr, nc) for nr, nc in lattice_neighbors(r, c) if grid[(r + nr) // 2][(c + nc) // 2] == WALL]
+        if len(closed) >= len(list(lattice_neighbors(r, c))) - 1 and closed and rng.random() < braid:
+            nr, nc = rng.choice(closed)
+            grid[(r + nr) // 2][(c + nc) // 2] = 1
+
+
+def _components(grid):
+    """Rótulo da componente conexa (BFS, com túnel) de cada célula andável."""
+    rows, cols = len(grid), len(grid[0])
+    label = {}
+    for root in ((r, c) for r in range(rows) for c in range(cols)):
+        if root in label or not _walkable(grid[root[0]][root[1]]):
+            continue
+        label[root] = root
+        queue = deque([root])
+        while queue:
+            r, c = queue.popleft()
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, (c - 1) % cols), (r, (c + 1) % cols)):
+                if 0 <= nr < rows and (nr, nc) not in label and _walkable(grid[nr][nc]):
+                    label[(nr, nc)] = root
+                    queue.append((nr, nc))
+    return label
+
+
+def _connect(grid, rng, fixed):
+    """Abre paredes (de 1 ou 2 células) entre componentes diferentes até sobrar uma."""
+    rows, cols = len(grid), len(grid[0])
+    while True:
+        label = _components(grid)
+        if len(set(label.values())) <= 1:
+            return
+        for gap in (1, 2):
+            bridges = []
+            for r in range(1, rows - 1):
+                for c in range(1, cols - 1):
+                    for dr, dc in ((1, 0), (0, 1)):
+                        a, b = (r - dr, c - dc), (r + gap * dr, c + gap * dc)
+                        walls = [(r + k * dr, c + k * dc) for k in range(gap)]
+                        if (b[0] < rows - 1 and b[1] < cols - 1 and a in label and b in label
+                                and label[a] != label[b]
+                                and all(grid[wr][wc] == WALL and (wr, wc) not in fixed for wr, wc in walls)):
+                            bridges.append(walls)
+            if bridges:
+                for wr, wc in rng.choice(bridges):
+                    grid[wr][wc] = 1
+                break
+        else:
+            raise ValueError("não foi possível conectar o labirinto")
+
+
+def _walkable(tile) -> bool:
+    return tile < 3 or tile == 9
+
+
+def _decorate_walls(grid):
+    """Códigos de desenho do board.py: 3 vertical, 4 horizontal e cantos 5..8."""
+    rows, cols = len(grid), len(grid[0])
+
+    def wall(r, c):
+        return 0 <= r < rows and 0 <= c < cols and 3 <= grid[r][c] <= 8
+
+    corners = {(False, True, True, False): 5,  # Esquerda e baixo (canto superior direito)
+               (False, True, False, True): 6,  # Direita e baixo (canto superior esquerdo)
+               (True, False, False, True): 7,  # Cima e direita (canto inferior esquerdo)
+               (True, False, True, False): 8}  # Cima e esquerda (canto inferior direito)
+    for r in range(rows):
+        for c in range(cols):
+            if not 3 <= grid[r][c] <= 8:
+                continue
+            key = (wall(r - 1, c), wall(r + 1, c), wall(r, c - 1), wall(r, c + 1))
+            if key in corners:
+                grid[r][c] = corners[key]
+            else:
+                grid[r][c] = 4 if (key[2] or key[3]) and not (key[0] and key[1]) else 3
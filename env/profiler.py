@@ -0,0 +1,122 @@
+"""
+Instrumentação de latência por frame do loop do jogo.
+
+O FrameProfiler mede, com relógio monotônico (perf_counter_ns), quanto cada
+fase de um frame levou. Funciona como um cronômetro de voltas: mark(fase)
+fecha o trecho desde a marca anterior e o soma à fase, então cada ponto de
+medição custa uma leitura do relógio e uma soma. end_frame() fecha o frame
+e grava as somas em buffers circulares de tamanho fixo (array('q'), um por
+fase), sem alocar nada por frame.
+
+Fases marcadas pelo loop (main.AStarGameLoop), pelo PacmanEngine.step e
+pelo PygameRenderer:
+  tick        espera no timer.tick(FPS) (ociosa, fora do tempo de trabalho)
+  update      contadores, fantasmas, alvos e curvas livres
+  draw        desenho do board, personagens e placar
+  scale       smoothscale da tela virtual, blit e flip da janela
+  agent       agent.get_action() (o planejador)
+  move        movimento do Pac-Man e dos fantasmas
+  collisions  comida, fantasmas e túnel
+  events      fila de eventos do pygame
+Um observador que não marca fases próprias entra na fase seguinte (agent).
+
+Frame perdido: trabalho (tudo menos tick) acima do orçamento de 1000/60 ms.
+summary() dá p50/p99/máximo por fase sobre a janela do buffer; report() é a
+versão em uma linha para log e overlay_rows() o texto do overlay na tela.
+
+Desligado (engine.profiler = None, o padrão) o custo é um teste de None por
+ponto de medição.
+"""
+
+import time
+from array import array
+
+from env.engine import FPS
+
+PHASES = ("tick", "update", "draw", "scale", "agent", "move", "collisions", "events")
+IDLE_PHASES = ("tick",)
+
+
+def percentile(values, q):
+    """Percentil pelo posto mais próximo (q em 0..100); 0 para a lista vazia."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100)) # ceil(n·q/100)
+    return ordered[int(rank) - 1]
+
+
+class FrameProfiler:
+    def __init__(self, capacity: int = 600, budget_ms: float = 1000 / FPS, clock=time.perf_counter_ns):
+        self.capacity = capacity
+        self.budget_ns = int(budget_ms * 1e6)
+        self.clock = clock
+        self.phases = PHASES
+        self._slot = {phase: i for i, phase in enumerate(PHASES)}
+        self._busy_slots = [i for phase, i in self._slot.items() if phase not in IDLE_PHASES]
+        # Buffers circulares: spans[fase][frame % capacity], em ns
+        self.spans = [array("q", [0]) * capacity for _ in PHASES]
+        self.busy = array("q", [0]) * capacity
+        self._current = [0] * len(PHASES)
+        self.frames = 0
+        self.dropped = 0
+        self._last = clock()
+
+    def mark(self, phase: str):
+        """Fecha o trecho desde a última marca e o soma à fase `phase`."""
+        now = self.clock()
+        self._current[self._slot[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Grava o frame nos buffers e começa o próximo."""
+        pos = self.frames % self.capacity
+        current = self._current
+        busy = 0
+        for i in self._busy_slots:
+            busy += current[i]
+        for i, span in enumerate(current):
+            self.spans[i][pos] = span
+            current[i] = 0
+        self.busy[pos] = busy
+        if busy > self.budget_ns:
+            self.dropped += 1
+        self.frames += 1
+
+    def reset(self):
+        self.frames = self.dropped = 0
+        self._current = [0] * len(self.phases)
+        self._last = self.clock()
+
+    # ── Leitura ──────────────────────────────────────────────────────────────
+    def _window(self, buffer):
+        return buffer[:min(self.frames, self.capacity)].tolist()
+
+    def summary(self) -> dict:
+        """p50/p99/máximo (ms) por fase e do trabalho do frame, na janela do buffer."""
+        result = {}
+        for phase, buffer in list(zip(self.phases, self.spans)) + [("frame", self.busy)]:
+            values = self._window(buffer)
+            result[phase] = {
+                "p50_ms": percentile(values, 50) / 1e6,
+                "p99_ms": percentile(values, 99) / 1e6,
+                "max_ms": max(values, default=0) / 1e6,
+            }
+        return {"frames": self.frames, "dropped": self.dropped,
+                "window": min(self.frames, self.capacity), "phases": result}
+
+    def overlay_rows(self) -> list:
+        """Linhas (fase, p50, p99) já formatadas, para desenhar em colunas na tela."""
+        summary = self.summary()
+        rows = [(phase, f"{s['p50_ms']:.2f}", f"{s['p99_ms']:.2f}")
+                for phase, s in summary["phases"].items() if s["max_ms"] > 0]
+        rows.append(("perdidos", f"{summary['dropped']}", f"/{summary['frames']}"))
+        return rows
+
+    def report(self) -> str:
+        """Resumo em uma linha para log: p50/p99 (ms) por fase e frames perdidos."""
+        summary = self.summary()
+        parts = [f"{phase} {s['p50_ms']:.2f}/{s['p99_ms']:.2f}"
+                 for phase, s in summary["phases"].items() if s["max_ms"] > 0]
+        return (f"Frames: {summary['frames']} | perdidos (> {self.budget_ns / 1e6:.1f} ms): {summary['dropped']} | "
+                f"p50/p99 ms: " + ", ".join(parts))
@@ -0,0 +1,113 @@
+"""
+Grafo de estados com memória limitada para PacmanEngine.get_successors.
+
+O _graph original era um dict sem limite: cada frame de run() acrescentava
+um StateSnapshot (com dois frozensets de comida) e nada era removido. Aqui
+o grafo vira uma tabela de transposição com despejo LRU:
+  - cada estado expandido guarda suas arestas (ação, próximo estado) num
+    dict usado como conjunto ordenado, então a deduplicação é O(1) em vez
+    de uma busca linear comparando snapshots inteiros;
+  - consultar ou inserir um estado o move para o fim da fila; acima da
+    capacidade, o menos usado recentemente é descartado;
+  - hits (estado já presente: transposição) e misses, despejos e o tamanho
+    residente ficam expostos em stats().
+As sucessoras continuam sendo simuladas a cada chamada: o __eq__ do
+StateSnapshot ignora campos como power_counter, então dois estados "iguais"
+podem ter sucessores diferentes e a tabela não é usada como cache.
+"""
+
+import sys
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 1024
+
+
+class TranspositionStore:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity deve ser >= 1")
+        self.capacity = capacity
+        self._edges = OrderedDict() # estado -> {(ação, próximo estado): None}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, state):
+        """Arestas já registradas de `state` (lista) ou None."""
+        edges = self._edges.get(state)
+        if edges is None:
+            return None
+        self._edges.move_to_end(state)
+        return list(edges)
+
+    def put(self, state, edges):
+        """Registra as arestas de um estado expandido; hit se ele já estava na tabela."""
+        if state in self._edges:
+            self.hits += 1
+        else:
+            self.misses += 1
+        known = self._touch(state)
+        for edge in edges:
+            known[edge] = None
+
+    def add_edge(self, state, action, next_state):
+        self._touch(state)[(action, next_state)] = None
+
+    def _touch(self, state) -> dict:
+        edges = self._edges.get(state)
+        if edges is None:
+            edges = self._edges[state] = {}
+            if len(self._edges) > self.capacity:
+                self._edges.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._edges.move_to_end(state)
+        return edges
+
+    def clear(self):
+        self._edges.clear()
+
+    def __contains__(self, state):
+        return state in self._edges
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __getitem__(self, state):
+        return list(self._edges[state])
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self._edges.values())
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def resident_bytes(self) -> int:
+        """Estimativa do tamanho em memória: tabela, arestas e snapshots (cada objeto contado uma vez)."""
+        seen = set()
+
+        def size(obj):
+            if id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            total = sys.getsizeof(obj)
+            if isinstance(obj, tuple):
+                total += sum(size(x) for x in obj)
+            elif hasattr(obj, "__slots__"):
+                total += sum(size(getattr(obj, k)) for k in obj.__slots__)
+            return total
+
+        total = sys.getsizeof(self._edges)
+        for state, edges in self._edges.items():
+            total += size(state) + sys.getsizeof(edges)
+            for edge in edges:
+                total += size(edge)
+        return total
+
+    def stats(self) -> dict:
+        return {"states": len(self), "edges": self.edge_count, "capacity": self.capacity,
+                "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "evictions": self.evictions, "resident_bytes": self.resident_bytes()}
@@ -19,76 +19,92 @@ How it works
 
 Run this file directly to watch A* play:
     python astar_pacman.py
+
+Or without a window (pure engine, e.g. on display-less servers):
+    python main.py --headless
+
+Add --incremental to replan with D* Lite instead of a fresh A* per frame,
+--multi-goal to search straight to the nearest reachable food with BFS, or
+--hierarchical to plan on the corridor-compressed junction graph, or
+--space-time to search (cell, step) states against predicted ghost paths.
+--anytime swaps the full A* for ARA* with a 2 ms deadline per call, and
+--routing answers frames whose next-hop route is ghost-free by table lookup.
+These planner options are mutually exclusive: pass at most one.
+--maze=ROWSxCOLS plays on a procedurally generated board (env/maze_generator.py)
+instead of env/board.py, with --seed=N choosing the maze (e.g. --maze=33x30 --seed=6).
+--max-frames=N caps a headless run; without a window the run also stops on its
+own after two minutes of game time with no score and no life lost.
+--profile times each phase of the frame (env/profiler.py): p50/p99 per phase
+and dropped frames (work over the 16.6 ms budget) are logged every 600 frames
+and drawn as an on-screen overlay when there is a window.
 """
 
 import sys
 import os
-import pygame
+
+try:
+    import pygame
+except ImportError:
+    pygame = None # O modo headless não precisa do pygame
 
 # Importa as direções e o motor do jogo
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from env.pacman_gamestate import GameState, RIGHT, LEFT, UP, DOWN
+from env.engine import PacmanEngine
+from env.maze_generator import generate_board
+from env.profiler import FrameProfiler
 from agents.astar_agent import GridAStarAgent
 
+# Sem janela ninguém fecha o jogo: sem pontos nem vidas perdidas por 2 minutos de jogo, ele para
+HEADLESS_IDLE_LIMIT = 2 * 60 * 60
+
 # ======================================================================
 #  LOOP DO JOGO
 # ======================================================================
 class AStarGameLoop:
-    def __init__(self):
-        self.game  = GameState()
-        self.agent = GridAStarAgent(self.game)
-
-    def run(self):
+    def __init__(self, headless: bool = False, planner: str = "astar", board=None, profile: bool = False):
+        self.headless = headless
+        if headless:
+            # Sem janela: apenas o motor lógico (servidores sem display)
+            self.game = PacmanEngine(board=board)
+        else:
+            from env.pacman_gamestate import GameState
+            self.game = GameState(board=board)
+        self.agent = GridAStarAgent(self.game, planner=planner)
+        if profile:
+            # Fases do frame em buffers circulares; resumo no log a cada volta do buffer
+            self.game.profiler = FrameProfiler()
+
+    def run(self, max_frames=None, idle_limit=HEADLESS_IDLE_LIMIT):
         game = self.game
         game._reset()
         running = True
-        
-        while running:
-            game.timer.tick(60)
-            game._update_counters()
-            game.screen.fill("black")
-            game._draw_board()
-
-            cx = game.player_x + 23
-            cy = game.player_y + 24
-            game._update_ghost_speeds()
-            game._check_win_condition()
-
-            player_circle = pygame.draw.circle(game.screen, "black", (cx, cy), 20, 2)
-            game._draw_player()
-
-            blinky, inky, pinky, clyde = game._make_ghost(0), game._make_ghost(1), game._make_ghost(2), game._make_ghost(3)
-            ghosts = [blinky, inky, pinky, clyde]
-
-            game._draw_misc()
-            game.targets = game._get_targets(blinky, inky, pinky, clyde)
-            game.turns_allowed = game._check_position(cx, cy)
+        frames = 0
+        self.stalled, self.idle_limit = False, idle_limit
+        progress, idle = None, 0
+        profiler = game.profiler
+        if profiler is not None: profiler.reset()
 
-            if game.moving and not game.game_over and not game.game_won:
-                action = self.agent.get_action()
-                if action is not None: 
-                    game.direction_cmd = action
-
-            # Aplica o comando de direção se a parede permitir
-            for d in [RIGHT, LEFT, UP, DOWN]:
-                if game.direction_cmd == d and game.turns_allowed[d]: 
-                    game.direction = d
-
-            # Move os personagens
-            if game.moving:
-                game._move_player()
-                game._move_ghosts(blinky, inky, pinky, clyde)
-
-            # Checa colisões
-            game.score, game.powerup, game.power_counter, game.eaten_ghost = game._check_food_collisions(cx, cy)
-            game._handle_ghost_collisions(player_circle, ghosts)
-
-            # Túnel
-            if game.player_x > 900: game.player_x = -47
-            elif game.player_x < -50: game.player_x = 897
-
-            for ghost, attr in [(blinky, "blinky_dead"), (inky, "inky_dead"), (pinky, "pinky_dead"), (clyde, "clyde_dead")]:
-                if ghost.in_box and getattr(game, attr): setattr(game, attr, False)
+        while running:
+            if not self.headless:
+                game.timer.tick(60)
+            if profiler is not None: profiler.mark("tick")
+
+            # Um frame completo: contadores, decisão do agente, movimento e colisões
+            game.step(self.agent.get_action)
+            frames += 1
+
+            if self.headless:
+                if idle_limit is not None:
+                    if (game.score, game.lives) != progress:
+                        progress, idle = (game.score, game.lives), 0
+                    else:
+                        idle += 1
+                    self.stalled = idle >= idle_limit
+                if (game.game_over or game.game_won or self.stalled
+                        or (max_frames is not None and frames >= max_frames)):
+                    running = False
+                if profiler is not None: self._end_frame(profiler)
+                continue
 
             # Eventos de Fechar e Reiniciar
             for event in pygame.event.get():
@@ -97,19 +113,57 @@ class AStarGameLoop:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE and (game.game_over or game.game_won):
                         game._reset()
-            
-            
-            # Encolhe a imagem do labirinto e joga na sua janela real
-            tela_redimensionada = pygame.transform.smoothscale(game.screen, (game.tela_w, game.tela_h))
-            game.real_screen.blit(tela_redimensionada, (0, 0))
-            
-            pygame.display.flip()
+            if profiler is not None:
+                profiler.mark("events")
+                self._end_frame(profiler)
+
+        if not self.headless:
+            pygame.quit()
+        return frames
 
-        pygame.quit()
+    @staticmethod
+    def _end_frame(profiler):
+        profiler.end_frame()
+        if profiler.frames % profiler.capacity == 0:
+            print(profiler.report())
 
 if __name__ == "__main__":
+    headless = "--headless" in sys.argv
+    # Planejador do agente: no máximo uma das opções (o padrão é o A* do zero a cada replanejamento)
+    planners = [
+        ("--incremental", "incremental"),   # Replanejamento D* Lite
+        ("--multi-goal", "multi_goal"),     # BFS até qualquer comida
+        ("--hierarchical", "hierarchical"), # A* no grafo de junções
+        ("--space-time", "space_time"),     # A* em (célula, passo) com fantasmas previstos
+        ("--anytime", "anytime"),           # ARA* com prazo por frame
+        ("--routing", "routing"),           # Tabela de próximo passo quando a rota está livre
+    ]
+    chosen = [name for flag, name in planners if flag in sys.argv]
+    if len(chosen) > 1:
+        sys.exit(f"Escolha um planejador só: {', '.join(flag for flag, name in planners if name in chosen)}")
+    planner = chosen[0] if chosen else "astar"
+    profile = "--profile" in sys.argv           # Latência por fase do frame (p50/p99, frames perdidos)
+    # Labirinto gerado (--maze=33x30 --seed=6) no lugar do board original
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+    max_frames = int(options["max-frames"]) if "max-frames" in options else None
+    board = None
+    if "maze" in options:
+        rows, cols = map(int, options["maze"].lower().split("x"))
+        board = generate_board(rows, cols, seed=int(options.get("seed", 0)))
     print("=" * 50)
     print(" Agente A* Pac-Man (Modo Grid AIMA)")
     print("=" * 50)
-    loop = AStarGameLoop()
-    loop.run()
\ No newline at end of file
+    try:
+        loop = AStarGameLoop(headless=headless, planner=planner, board=board, profile=profile)
+    except ValueError as error: # Ex.: --routing num board grande demais para a tabela
+        sys.exit(f"Erro: {error}")
+    frames = loop.run(max_frames)
+    if headless:
+        print(f"Fim de jogo em {frames} frames | Score: {loop.game.score} | Vitória: {loop.game.game_won}")
+        if loop.stalled:
+            print(f"Parado: {loop.idle_limit} frames sem pontos nem vidas perdidas")
+    if profile:
+        print(loop.game.profiler.report())
+    planner = loop.agent.anytime
+    if planner is not None and planner.calls:
+        print(f"ARA*: {planner.calls} buscas | {planner.total_expansions / planner.calls:.1f} expansões por busca")
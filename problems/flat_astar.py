@@ -0,0 +1,181 @@
+"""
+A* especializado para o PacmanGridProblem sobre índices planos de células.
+
+O best_first_graph_search do AIMA cria um Node por filho (sem __slots__),
+guarda f e h com setattr em cada nó e compara tuplas (f, Node) que caem no
+Node.__lt__ das tuplas de estado. Aqui as células andáveis do board são
+numeradas uma vez (ordem linha a linha, a mesma do MazeDistances) e a busca
+só mexe em buffers pré-alocados e reaproveitados entre as chamadas:
+  - g, pai e ação do pai em array('l') / array('b');
+  - marcas de "visto" e "fechado" por geração (array('L')), então nada é
+    zerado entre buscas;
+  - a fronteira é um heap de inteiros f * n + índice: como a numeração segue
+    a ordem das tuplas (linha, coluna), o desempate é o mesmo do AIMA e a
+    lista de ações devolvida é idêntica à de astar_search.
+Nenhum objeto é criado por nó; o h de cada célula vem da coluna do
+MazeDistances do objetivo ou, sem a tabela, de Manhattan com túnel junto do
+limite dos marcos ALT quando o problema os tem (como PacmanGridProblem.h).
+"""
+
+import heapq
+import sys
+from array import array
+
+from env.engine import RIGHT, LEFT, UP, DOWN
+
+try:
+    from search import astar_search
+except ImportError:
+    print("Erro: O repositório aima-python (search.py) não foi encontrado.")
+    sys.exit(1)
+
+UNREACHABLE = 65535 # Mesmo sentinela da tabela do MazeDistances
+INF = float("inf")
+NO_CELL = -1
+
+
+class FlatGridAStar:
+    def __init__(self, board):
+        self.rows, self.cols = rows, cols = len(board), len(board[0])
+        self.cells = [(r, c) for r in range(rows) for c in range(cols)
+                      if board[r][c] < 3 or board[r][c] == 9]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        n = self.n = len(self.cells)
+
+        # Até 4 vizinhos por célula, na ordem de PacmanGridProblem.actions (túnel no lugar de LEFT/RIGHT)
+        self.neighbor = array("l", [NO_CELL]) * (4 * n)
+        self.grid_index = array("l", [0]) * (4 * n) # Índice r * cols + c do vizinho (máscara de perigo)
+        self.move = array("b", [0]) * (4 * n)
+        last = cols - 1
+        for i, (r, c) in enumerate(self.cells):
+            moves = [(UP, (r - 1, c)), (DOWN, (r + 1, c)),
+                     (LEFT, (r, last) if c == 0 else (r, c - 1)),
+                     (RIGHT, (r, 0) if c == last else (r, c + 1))]
+            for k, (action, cell) in enumerate(moves):
+                j = self.index.get(cell)
+                if j is not None:
+                    self.neighbor[4 * i + k] = j
+                    self.grid_index[4 * i + k] = cell[0] * cols + cell[1]
+                    self.move[4 * i + k] = action
+
+        # Buffers da busca, reaproveitados entre as chamadas
+        self.g = array("l", [0]) * n
+        self.parent = array("l", [NO_CELL]) * n
+        self.parent_move = array("b", [0]) * n
+        self.seen = array("L", [0]) * n
+        self.closed = array("L", [0]) * n
+        self.generation = 0
+        self.expansions = 0
+        self.path = None # Células do último caminho encontrado, do início ao objetivo
+        self._h_goal, self._h_column = None, None
+        self._same_landmarks = None # (marcos, numeram as células como aqui?)
+
+    def solve(self, problem, expanded=None):
+        """
+        Ações de astar_search(problem, problem.h) para um PacmanGridProblem, ou
+        None se não há caminho. Se `expanded` (set) for passado, recebe as
+        células expandidas, como o RecordingProblem.
+        """
+        start, goal = self.index.get(problem.initial), problem.goal
+        if start is None:
+            # Fora das células numeradas (ex.: no meio do túnel): A* do AIMA
+            node = astar_search(problem, problem.h)
+            self.path = [n.state for n in node.path()] if node else None
+            return node.solution() if node else None
+        danger = problem.danger
+        column = self._goal_column(problem)
+        bound = self._landmark_bound(problem) if column is None else None
+        gr, gc = goal
+        cols, n, cells = self.cols, self.n, self.cells
+        neighbor, grid_index, move = self.neighbor, self.grid_index, self.move
+        g, parent, parent_move = self.g, self.parent, self.parent_move
+        seen, closed = self.seen, self.closed
+
+        self.generation += 1
+        gen = self.generation
+        seen[start], g[start], parent[start] = gen, 0, NO_CELL
+        h = column[start] if column is not None else UNREACHABLE
+        if h == UNREACHABLE:
+            h = self._manhattan(start, gr, gc)
+            if bound is not None:
+                h = max(h, bound(start))
+                if h == INF:
+                    self.expansions, self.path = 0, None
+                    return None # Objetivo em outra componente
+        frontier = [int(h) * n + start]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        expansions = 0
+
+        while frontier:
+            key = heappop(frontier)
+            i = key % n
+            if closed[i] == gen:
+                continue # Entrada antiga: a célula já saiu com um f menor
+            r, c = cells[i]
+            if r == gr and c == gc:
+                self.expansions = expansions
+                return self._actions(i)
+            closed[i] = gen
+            expansions += 1
+            if expanded is not None:
+                expanded.add((r, c))
+            g_child = g[i] + 1
+            for k in range(4 * i, 4 * i + 4):
+                j = neighbor[k]
+                if j == NO_CELL or danger[grid_index[k]] or closed[j] == gen:
+                    continue
+                if seen[j] != gen or g_child < g[j]:
+                    seen[j], g[j], parent[j], parent_move[j] = gen, g_child, i, move[k]
+                    h = column[j] if column is not None else UNREACHABLE
+                    if h == UNREACHABLE:
+                        h = self._manhattan(j, gr, gc)
+                        if bound is not None:
+                            h = max(h, bound(j))
+                            if h == INF:
+                                continue
+                            h = int(h)
+                    heappush(frontier, (g_child + h) * n + j)
+
+        self.expansions = expansions
+        self.path = None
+        return None
+
+    def _actions(self, i):
+        actions, path = [], [self.cells[i]]
+        parent, parent_move = self.parent, self.parent_move
+        while parent[i] != NO_CELL:
+            actions.append(parent_move[i])
+            i = parent[i]
+            path.append(self.cells[i])
+        actions.reverse()
+        path.reverse()
+        self.path = path
+        return actions
+
+    def _goal_column(self, problem):
+        # Coluna de distâncias até o objetivo (cacheada enquanto o objetivo não muda)
+        distances = problem.distances
+        if distances is None:
+            return None
+        key = (problem.goal, id(distances))
+        if self._h_goal != key:
+            j = distances.index.get(problem.goal)
+            # A coluna só serve se a tabela numera as células do mesmo jeito
+            same = j is not None and distances.cells == self.cells
+            self._h_goal, self._h_column = key, distances.table[:, j].tolist() if same else None
+        return self._h_column
+
+    def _landmark_bound(self, problem):
+        # Limite ALT por índice: os marcos de grid_landmarks numeram as células na mesma ordem
+        landmarks = getattr(problem, "landmarks", None)
+        if landmarks is None:
+            return None
+        if self._same_landmarks is None or self._same_landmarks[0] is not landmarks:
+            self._same_landmarks = (landmarks, landmarks.nodes == self.cells)
+        return landmarks.bound_to(problem.goal) if self._same_landmarks[1] else None
+
+    def _manhattan(self, i, gr, gc):
+        # Mesma heurística de PacmanGridProblem.h sem a tabela (atravessando o túnel)
+        r, c = self.cells[i]
+        dc = abs(c - gc)
+        return abs(r - gr) + min(dc, self.cols - dc)
@@ -0,0 +1,188 @@
+"""
+Grafo de junções do labirinto (corredores comprimidos) para busca hierárquica.
+
+O board é compilado uma vez num grafo abstrato:
+  - nós são as junções (células andáveis com grau diferente de 2: cruzamentos,
+    curvas em T e becos); num anel sem junções uma célula qualquer vira nó;
+  - cada corredor entre duas junções vira uma aresta direcionada com peso =
+    comprimento, guardando as células e as ações do caminho (o caminho dentro
+    do corredor fica pronto, não é buscado de novo) e as comidas ao longo dele.
+As regras de movimento são as do PacmanGridProblem (paredes >= 3, portão 9
+andável, túnel entre a primeira e a última coluna).
+
+O JunctionGraphProblem roda o A* do AIMA sobre esse grafo: as ações são
+trechos de corredor, então o custo da busca cresce com o número de junções e
+não de células. O início e o objetivo podem estar no meio de um corredor, e
+as células de perigo dos fantasmas bloqueiam os trechos que passam por elas.
+Só o primeiro trecho do plano precisa ser refinado em ações do grid
+(estilo HPA*).
+"""
+
+import sys
+from env.engine import RIGHT, LEFT, UP, DOWN
+from problems.pacman_problem import danger_cells
+
+try:
+    from search import Problem, astar_search
+except ImportError:
+    print("Erro: O repositório aima-python (search.py) não foi encontrado.")
+    sys.exit(1)
+
+INF = float("inf")
+
+
+class Corridor:
+    """Corredor direcionado: cells[0] e cells[-1] são nós, actions[i] leva de cells[i] a cells[i + 1]."""
+    __slots__ = ("cells", "actions", "food", "index")
+
+    def __init__(self, cells, actions, food):
+        self.cells = tuple(cells)
+        self.actions = tuple(actions)
+        self.food = frozenset(food)          # Comidas (1 ou 2 no board compilado) ao longo do corredor
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    @property
+    def start(self):
+        return self.cells[0]
+
+    @property
+    def end(self):
+        return self.cells[-1]
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __repr__(self):
+        return f"<Corridor {self.start} -> {self.end} ({len(self)})>"
+
+
+class JunctionGraph:
+    def __init__(self, board):
+        self.rows, self.cols = len(board), len(board[0])
+        walkable = {(r, c) for r in range(self.rows) for c in range(self.cols)
+                    if board[r][c] < 3 or board[r][c] == 9}
+        self.walkable = walkable
+
+        # Vizinhos (ação, célula) na mesma ordem de PacmanGridProblem.actions
+        self.moves = {}
+        last = self.cols - 1
+        for r, c in walkable:
+            moves = [(UP, (r - 1, c)), (DOWN, (r + 1, c)), (LEFT, (r, c - 1)), (RIGHT, (r, c + 1))]
+            if c == 0: moves.append((LEFT, (r, last)))
+            if c == last: moves.append((RIGHT, (r, 0)))
+            self.moves[(r, c)] = [(a, s) for a, s in moves if s in walkable]
+
+        food = {(r, c) for r, c in walkable if board[r][c] in (1, 2)}
+        self.junctions = {cell for cell, moves in self.moves.items() if len(moves) != 2}
+        self.out = {}      # Junção -> corredores que saem dela
+        self.through = {}  # Célula interna -> [(corredor, posição)] nos dois sentidos
+        self._build(food)
+
+    def _build(self, food):
+        while True:
+            self.out, self.through = {}, {}
+            for junction in self.junctions:
+                self.out[junction] = [self._walk(junction, a, n, food) for a, n in self.moves[junction]]
+                for corridor in self.out[junction]:
+                    for i, cell in enumerate(corridor.cells[1:-1], 1):
+                        self.through.setdefault(cell, []).append((corridor, i))
+            # Anéis sem junção ficam de fora: promove uma célula a nó e percorre de novo
+            loose = self.walkable - self.junctions - self.through.keys()
+            if not loose:
+                return
+            self.junctions.add(min(loose))
+
+    def _walk(self, start, action, cell, food):
+        cells, actions = [start, cell], [action]
+        prev = start
+        while cell not in self.junctions:
+            a, nxt = next((a, n) for a, n in self.moves[cell] if n != prev)
+            prev, cell = cell, nxt
+            cells.append(cell)
+            actions.append(a)
+        return Corridor(cells, actions, [c for c in cells[1:] if c in food])
+
+    def segments_from(self, cell):
+        """Trechos (corredor, posição) que começam em `cell`, seja junção ou célula interna."""
+        if cell in self.junctions:
+            return [(corridor, 0) for corridor in self.out[cell]]
+        return self.through.get(cell, [])
+
+    @property
+    def num_edges(self):
+        return sum(len(corridors) for corridors in self.out.values())
+
+
+# ======================================================================
+#  A* SOBRE O GRAFO DE JUNÇÕES
+# ======================================================================
+class JunctionGraphProblem(Problem):
+    """
+    Estados são células (junções, mais o início e o objetivo); cada ação é um
+    trecho (corredor, i, j) que vai de cells[i] até cells[j] e custa j - i.
+    """
+    def __init__(self, initial, goal, graph, ghosts, distances=None, landmarks=None):
+        super().__init__(initial, goal)
+        self.graph = graph
+        # Tabela consultada nó a nó no h: o A* aqui só visita junções, então montar a
+        # coluna inteira do objetivo custaria mais que a busca
+        self.distances = distances
+        # Sem a tabela (boards grandes): marcos ALT sobre as células do grid
+        self.landmarks = landmarks if distances is None else None
+        # Perigo por corredor: só as (no máximo 4 x 13) células de perigo são visitadas
+        self.blocked_nodes = set()
+        self.blocked = {}
+        for cell in danger_cells(ghosts, graph.rows, graph.cols):
+            if cell in graph.junctions:
+                self.blocked_nodes.add(cell)
+            for corridor, i in graph.through.get(cell, ()):
+                self.blocked.setdefault(corridor, []).append(i)
+
+    def actions(self, state):
+        goal, blocked_nodes = self.goal, self.blocked_nodes
+        segments = []
+        for corridor, i in self.graph.segments_from(state):
+            # O objetivo no meio do corredor encerra o trecho ali
+            j = corridor.index.get(goal, len(corridor))
+            if j <= i:
+                j = len(corridor)
+            if j == len(corridor) and corridor.end in blocked_nodes:
+                continue
+            if any(i < k <= j for k in self.blocked.get(corridor, ())):
+                continue
+            segments.append((corridor, i, j))
+        return segments
+
+    def result(self, state, segment):
+        corridor, _, j = segment
+        return corridor.cells[j]
+
+    def path_cost(self, c, state1, segment, state2):
+        _, i, j = segment
+        return c + j - i
+
+    def h(self, node):
+        if self.distances is not None:
+            d = self.distances.distance(node.state, self.goal)
+            if d != INF:
+                return d
+        (r1, c1), (r2, c2) = node.state, self.goal
+        dc = abs(c1 - c2)
+        h = abs(r1 - r2) + min(dc, self.graph.cols - dc)
+        if self.landmarks is not None:
+            return max(h, self.landmarks.lower_bound(node.state, self.goal))
+        return h
+
+
+def refine(segment):
+    """Células e ações do grid de um trecho, direto do caminho guardado no corredor."""
+    corridor, i, j = segment
+    return list(corridor.cells[i:j + 1]), list(corridor.actions[i:j])
+
+
+def plan(graph, start, goal, ghosts, distances=None, landmarks=None):
+    """A* no grafo de junções; devolve a lista de trechos (None se não houver caminho seguro)."""
+    if start not in graph.walkable or goal not in graph.walkable:
+        return None
+    node = astar_search(JunctionGraphProblem(start, goal, graph, ghosts, distances, landmarks))
+    return node.solution() if node is not None else None
@@ -0,0 +1,173 @@
+"""
+Heurística ALT (A*, Landmarks e desigualdade Triangular).
+
+A tabela de todos os pares (MazeDistances) é quadrática no número de células
+e não escala para labirintos maiores que o 33x30. Aqui só as distâncias
+exatas a partir de k marcos (landmarks) são guardadas, O(k·células) em
+memória. Para qualquer par (n, objetivo), cada marco L dá um limite inferior
+|d(L, n) - d(L, objetivo)| (desigualdade triangular) e a heurística é o
+maior deles, admissível e consistente.
+
+Os marcos são escolhidos por seleção do ponto mais distante: o primeiro é a
+célula mais longe de um ponto qualquer, e cada seguinte é a que maximiza a
+distância ao marco mais próximo já escolhido (ficam nas "pontas" do grafo).
+
+Serve para grafos não direcionados com custos >= 0:
+  - grid_landmarks(board, k): células andáveis com as regras do
+    PacmanGridProblem (paredes >= 3, portão 9 andável, túnel nas bordas);
+  - graph_landmarks(graph, k): Graph/UndirectedGraph do AIMA (search.py).
+landmarks.h_to(goal) devolve h(node) para o astar_search de qualquer Problem
+sobre esses estados; o PacmanGridProblem aceita landmarks= direto.
+"""
+
+import heapq
+from array import array
+from operator import sub
+
+INF = float("inf")
+
+
+class Landmarks:
+    def __init__(self, nodes, neighbors, k=8, start=None):
+        """`neighbors(node)` devolve pares (vizinho, custo); o grafo deve ser não direcionado."""
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.neighbors = neighbors
+        n = len(self.nodes)
+        self.k = k = min(k, n)
+
+        # Seleção do ponto mais distante (desempate pela ordem dos nós), dentro da
+        # componente de `start` ou da maior: células isoladas ficariam infinitamente "longe"
+        self.landmarks = []
+        tables = []
+        nearest = array("d", [INF]) * n # Distância de cada nó ao marco mais próximo
+        seed = self._dijkstra(self.index[start] if start is not None else self._largest_component()) if n else None
+        reachable = [i for i in range(n) if seed[i] < INF] if n else []
+        for _ in range(k):
+            reference = tables[-1] if tables else seed
+            for i in reachable:
+                if reference[i] < nearest[i]:
+                    nearest[i] = reference[i]
+            far = max(reachable, key=lambda i: (nearest[i], -i))
+            if tables and nearest[far] == 0:
+                break # Todos os nós já são marcos
+            self.landmarks.append(self.nodes[far])
+            tables.append(self._dijkstra(far))
+        self.k = len(self.landmarks)
+
+        # Tabela plana: valores do nó i em [i*k, (i+1)*k)
+        self.table = array("d", [0.0]) * (n * self.k)
+        for j, dist in enumerate(tables):
+            self.table[j::self.k] = dist
+
+    def _largest_component(self):
+        """Um nó da maior componente conexa (rotulação por BFS, O(nós + arestas))."""
+        index, neighbors = self.index, self.neighbors
+        seen = bytearray(len(self.nodes))
+        best, best_size = 0, 0
+        for root in range(len(self.nodes)):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            stack, size = [root], 0
+            while stack:
+                i = stack.pop()
+                size += 1
+                for node, _ in neighbors(self.nodes[i]):
+                    j = index[node]
+                    if not seen[j]:
+                        seen[j] = 1
+                        stack.append(j)
+            if size > best_size:
+                best, best_size = root, size
+        return best
+
+    def _dijkstra(self, source):
+        dist = array("d", [INF]) * len(self.nodes)
+        dist[source] = 0.0
+        index, neighbors = self.index, self.neighbors
+        frontier = [(0.0, source)]
+        while frontier:
+            d, i = heapq.heappop(frontier)
+            if d > dist[i]:
+                continue
+            for node, cost in neighbors(self.nodes[i]):
+                j = index[node]
+                nd = d + cost
+                if nd < dist[j]:
+                    dist[j] = nd
+                    heapq.heappush(frontier, (nd, j))
+        return dist
+
+    def distances(self, node):
+        """Distâncias exatas de `node` a cada marco (None se o nó não é do grafo)."""
+        i = self.index.get(node)
+        if i is None:
+            return None
+        return self.table[i * self.k:(i + 1) * self.k]
+
+    def lower_bound(self, a, b):
+        """max |d(L, a) - d(L, b)| sobre os marcos: nunca superestima a distância de a até b."""
+        da, db = self.distances(a), self.distances(b)
+        if da is None or db is None:
+            return 0
+        return _bound(da, db)
+
+    def h_to(self, goal):
+        """Heurística h(node) até `goal`, com o vetor do objetivo calculado uma vez."""
+        bound, index = self.bound_to(goal), self.index
+
+        def h(node):
+            i = index.get(node.state)
+            return 0 if i is None else bound(i)
+        return h
+
+    def bound_to(self, goal):
+        """Como h_to, mas em função do índice do nó (self.index): para buscas sobre índices planos."""
+        goal_vec = self.distances(goal)
+        table, k = self.table, self.k
+        if goal_vec is None or not k:
+            return lambda i: 0
+        goal_out = goal_vec[0] == INF # Objetivo fora da componente dos marcos
+
+        def bound(i):
+            base = i * k
+            if table[base] == INF or goal_out:
+                # Os marcos estão todos numa componente: só um dos dois fora dela = inalcançável
+                return 0 if table[base] == goal_vec[0] else INF
+            return max(map(abs, map(sub, table[base:base + k], goal_vec)))
+        return bound
+
+    def resident_bytes(self) -> int:
+        return self.table.itemsize * len(self.table)
+
+
+def _bound(da, db):
+    best = 0
+    for a, b in zip(da, db):
+        if a != b: # inf == inf: marco fora da componente dos dois, não limita nada
+            d = a - b if a > b else b - a
+            if d > best:
+                best = d
+    return best
+
+
+def grid_landmarks(board, k=8):
+    """Marcos sobre as células andáveis do board, com os movimentos do PacmanGridProblem."""
+    rows, cols = len(board), len(board[0])
+    walkable = {(r, c) for r in range(rows) for c in range(cols) if board[r][c] < 3 or board[r][c] == 9}
+    last = cols - 1
+
+    def neighbors(cell):
+        r, c = cell
+        for nxt in ((r - 1, c), (r + 1, c), (r, last) if c == 0 else (r, c - 1),
+                    (r, 0) if c == last else (r, c + 1)):
+            if nxt in walkable:
+                yield nxt, 1
+
+    return Landmarks(sorted(walkable), neighbors, k)
+
+
+def graph_landmarks(graph, k=8):
+    """Marcos sobre um Graph do AIMA (custos das arestas como distância)."""
+    return Landmarks(sorted(graph.nodes(), key=str), lambda node: graph.get(node).items(), k)
@@ -0,0 +1,128 @@
+"""
+Tabela de distâncias reais no labirinto (todos os pares de células).
+
+As distâncias são calculadas uma única vez por BFS a partir de cada célula
+andável, com as mesmas regras de PacmanGridProblem (paredes >= 3, portão 9
+andável e túnel entre a primeira e a última coluna), e guardadas numa matriz uint16
+indexada apenas pelas células andáveis. A matriz fica em disco, em
+.cache/, com o nome derivado de um hash do board, então a partir da segunda
+execução o carregamento é imediato (np.load com mmap).
+"""
+
+import os
+import hashlib
+from collections import deque
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache")
+UNREACHABLE = np.iinfo(np.uint16).max
+# Acima disso a tabela não compensa (2000 células: ~2 s para montar e 8 MB; 5000: 51 MB)
+# e o agente usa os marcos ALT (problems/landmarks.py) no lugar dela
+MAX_TABLE_CELLS = 2000
+
+
+def walkable_array(board) -> np.ndarray:
+    """Matriz booleana (NumPy) das células andáveis: comida, vazio ou portão. Mesmas células que pacman_problem.walkable_mask."""
+    b = np.asarray(board)
+    return (b < 3) | (b == 9)
+
+
+def board_key(board) -> str:
+    """Hash do board: só a forma e as paredes importam (comida comida não muda a chave)."""
+    mask = walkable_array(board)
+    h = hashlib.sha1(repr(mask.shape).encode())
+    h.update(np.packbits(mask).tobytes())
+    return h.hexdigest()[:20]
+
+
+class MazeDistances:
+    """Oráculo O(1) de distância no labirinto: distance((r1, c1), (r2, c2))."""
+
+    def __init__(self, board, cache_dir=CACHE_DIR):
+        mask = walkable_array(board)
+        self.rows, self.cols = mask.shape
+        self.cells = [(int(r), int(c)) for r, c in zip(*np.nonzero(mask))]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.key = board_key(board)
+        self.table = self._load_or_build(cache_dir)
+        self._goal_column = (None, {}) # Último distances_to: o alvo só muda quando a comida some
+
+    def _neighbors(self, r, c):
+        """Vizinhos andáveis de (r, c), com a regra do túnel de PacmanGridProblem.result."""
+        index = self.index
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if (nr, nc) in index:
+                yield index[(nr, nc)]
+        if c == 0 and (r, self.cols - 1) in index:
+            yield index[(r, self.cols - 1)]
+        if c == self.cols - 1 and (r, 0) in index:
+            yield index[(r, 0)]
+
+    def _build(self) -> np.ndarray:
+        n = len(self.cells)
+        adjacency = [list(self._neighbors(r, c)) for r, c in self.cells]
+        table = np.full((n, n), UNREACHABLE, dtype=np.uint16)
+        for src in range(n):
+            dist = [UNREACHABLE] * n
+            dist[src] = 0
+            frontier = deque([src])
+            while frontier:
+                u = frontier.popleft()
+                du = dist[u] + 1
+                for v in adjacency[u]:
+                    if dist[v] == UNREACHABLE:
+                        dist[v] = du
+                        frontier.append(v)
+            table[src] = dist
+        return table
+
+    def _load_or_build(self, cache_dir) -> np.ndarray:
+        if cache_dir is None:
+            return self._build()
+        path = os.path.join(cache_dir, f"maze_distances_{self.key}.npy")
+        if os.path.exists(path):
+            table = np.load(path, mmap_mode="r")
+            if table.shape == (len(self.cells), len(self.cells)):
+                return table
+        table = self._build()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp, path) # Escrita atômica: nunca deixa um cache pela metade
+        return table
+
+    def distance(self, a, b):
+        """Distância exata entre duas células (inf se inalcançável ou fora do grid)."""
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None:
+            return float("inf")
+        d = int(self.table[i, j])
+        return float("inf") if d == UNREACHABLE else d
+
+    def distances_to(self, goal) -> dict:
+        """Distâncias de todas as células até `goal` (uma coluna da tabela), para heurísticas.
+
+        O dicionário do último objetivo é guardado e devolvido de novo (só leitura): o
+        problema é criado a cada replanejamento, mas o alvo só muda quando a comida some.
+        """
+        if self._goal_column[0] == goal:
+            return self._goal_column[1]
+        j = self.index.get(goal)
+        if j is None:
+            return {}
+        column = self.table[:, j].tolist()
+        dist = {cell: d for cell, d in zip(self.cells, column) if d != UNREACHABLE}
+        self._goal_column = (goal, dist)
+        return dist
+
+
+_loaded: dict = {}
+
+def get_maze_distances(board, cache_dir=CACHE_DIR) -> MazeDistances:
+    """Devolve a tabela do board, reaproveitando a já carregada nesta execução."""
+    key = (board_key(board), cache_dir)
+    if key not in _loaded:
+        _loaded[key] = MazeDistances(board, cache_dir)
+    return _loaded[key]
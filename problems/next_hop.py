@@ -0,0 +1,119 @@
+"""
+Tabela de próximo passo (roteamento) entre todos os pares de células.
+
+Sem fantasma por perto, o primeiro passo ótimo rumo a qualquer comida é uma
+função fixa do par (célula do Pac-Man, célula alvo). A tabela guarda, para
+cada par de células andáveis, a ação que sai da origem por um vizinho uma
+unidade mais perto do destino na tabela do MazeDistances (mesmas regras do
+PacmanGridProblem, com túnel). Empates seguem a ordem de
+PacmanGridProblem.actions: UP, DOWN, LEFT, RIGHT.
+
+A matriz é uint8 (n x n, ~150 KB no board original), indexada pela mesma
+numeração de células do MazeDistances, e fica em .cache/ ao lado da tabela
+de distâncias: a partir da segunda execução é carregada com np.load em
+mmap, sem recalcular. save/load servem para gravar e abrir a tabela em
+outro caminho.
+"""
+
+import os
+
+import numpy as np
+
+from env.engine import RIGHT, LEFT, UP, DOWN
+from problems.maze_distances import CACHE_DIR, UNREACHABLE, get_maze_distances
+
+NO_ACTION = np.iinfo(np.uint8).max # Mesma célula ou destino inalcançável
+
+
+class NextHopTable:
+    def __init__(self, board, cache_dir=CACHE_DIR, distances=None):
+        self.distances = distances if distances is not None else get_maze_distances(board, cache_dir)
+        self.cells, self.index = self.distances.cells, self.distances.index
+        self.rows, self.cols = self.distances.rows, self.distances.cols
+        self.key = self.distances.key
+        self.table = self._load_or_build(cache_dir)
+
+    def _neighbors(self, r, c):
+        """(ação, índice) dos vizinhos andáveis, na ordem de PacmanGridProblem.actions."""
+        last = self.cols - 1
+        moves = [(UP, (r - 1, c)), (DOWN, (r + 1, c)),
+                 (LEFT, (r, last) if c == 0 else (r, c - 1)),
+                 (RIGHT, (r, 0) if c == last else (r, c + 1))]
+        return [(a, self.index[cell]) for a, cell in moves if cell in self.index]
+
+    def _build(self) -> np.ndarray:
+        dist = np.asarray(self.distances.table).astype(np.int32)
+        n = len(self.cells)
+        table = np.full((n, n), NO_ACTION, dtype=np.uint8)
+        for src, (r, c) in enumerate(self.cells):
+            row = table[src]
+            target = dist[src] - 1 # Distância que o vizinho certo tem até cada destino
+            for action, nxt in self._neighbors(r, c):
+                hop = (dist[nxt] == target) & (row == NO_ACTION) & (dist[src] != UNREACHABLE)
+                row[hop] = action
+        return table
+
+    def _load_or_build(self, cache_dir) -> np.ndarray:
+        if cache_dir is None:
+            return self._build()
+        path = os.path.join(cache_dir, f"next_hop_{self.key}.npy")
+        if os.path.exists(path):
+            table = self.load(path)
+            if table.shape == (len(self.cells), len(self.cells)):
+                return table
+        table = self._build()
+        self.save(path, table)
+        return table
+
+    @staticmethod
+    def save(path, table):
+        """Grava a tabela (.npy) com escrita atômica."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(table))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path) -> np.ndarray:
+        """Abre a tabela em mmap (só leitura): as páginas são lidas do disco sob demanda."""
+        return np.load(path, mmap_mode="r")
+
+    def next_action(self, cell, target):
+        """Primeiro passo de um caminho mínimo (sem fantasmas), ou None."""
+        i, j = self.index.get(cell), self.index.get(target)
+        if i is None or j is None:
+            return None
+        action = int(self.table[i, j])
+        return None if action == NO_ACTION else action
+
+    def route(self, cell, target):
+        """Células e ações do caminho mínimo seguindo a tabela, ou None se não houver."""
+        i, j = self.index.get(cell), self.index.get(target)
+        if i is None or j is None or (i != j and self.table[i, j] == NO_ACTION):
+            return None
+        column = self.table[:, j]
+        cells, actions = [cell], []
+        r, c = cell
+        last = self.cols - 1
+        while i != j:
+            action = int(column[i])
+            if action == UP: r -= 1
+            elif action == DOWN: r += 1
+            elif action == LEFT: c = last if c == 0 else c - 1
+            else: c = 0 if c == last else c + 1
+            cells.append((r, c))
+            actions.append(action)
+            i = self.index[(r, c)]
+        return cells, actions
+
+
+_loaded: dict = {}
+
+def get_next_hops(board, cache_dir=CACHE_DIR) -> NextHopTable:
+    """Devolve a tabela do board, reaproveitando a já carregada nesta execução."""
+    distances = get_maze_distances(board, cache_dir)
+    key = (distances.key, cache_dir)
+    if key not in _loaded:
+        _loaded[key] = NextHopTable(board, cache_dir, distances)
+    return _loaded[key]
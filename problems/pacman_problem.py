@@ -1,5 +1,5 @@
 import sys
-from env.pacman_gamestate import RIGHT, LEFT, UP, DOWN
+from env.engine import RIGHT, LEFT, UP, DOWN, PacmanEngine, successors, macro_successors
 
 try:
     from search import Problem
@@ -7,45 +7,89 @@ except ImportError:
     print("Erro: O repositório aima-python (search.py) não foi encontrado.")
     sys.exit(1)
 
+# ======================================================================
+#  MÁSCARAS DO GRID (Paredes e Perigo)
+# ======================================================================
+def walkable_mask(board) -> bytearray:
+    """Máscara estática (linha * colunas + coluna) das células andáveis: paredes >= 3, portão 9 andável."""
+    return bytearray(1 if v < 3 or v == 9 else 0 for row in board for v in row)
+
+def danger_cells(ghosts, rows, cols) -> set:
+    """Células a até 2 passos (Manhattan, atravessando o túnel) de algum fantasma."""
+    danger = set()
+    for gr, gc in ghosts:
+        for dr in range(-2, 3):
+            r = gr + dr
+            if 0 <= r < rows:
+                span = 2 - abs(dr)
+                for dc in range(-span, span + 1):
+                    danger.add((r, (gc + dc) % cols))
+    return danger
+
+def danger_mask(ghosts, rows, cols) -> bytearray:
+    """danger_cells no mesmo formato de walkable_mask (1 = perigo)."""
+    mask = bytearray(rows * cols)
+    for r, c in danger_cells(ghosts, rows, cols):
+        mask[r * cols + c] = 1
+    return mask
+
 # ======================================================================
 #  ESPECIFICAÇÃO FORMAL DO PROBLEMA (Mapeamento em Grid)
 # ======================================================================
 class PacmanGridProblem(Problem):
     """
     Subclasse de Problem do AIMA. 
-    Aqui o A* enxerga o mapa como uma matriz 33x30, ignorando os pixels.
+    Aqui o A* enxerga o mapa como a matriz do board (33x30 no original), ignorando os pixels.
     """
-    def __init__(self, initial, goal, board, ghosts):
+    def __init__(self, initial, goal, board, ghosts, distances=None, walkable=None, landmarks=None):
         super().__init__(initial, goal)
         self.board = board
         self.ghosts = ghosts # Lista de posições (linha, coluna) dos fantasmas
+        self.rows, self.cols = len(board), len(board[0])
+        # Paredes não mudam (a máscara pode vir pronta); o perigo é calculado uma vez por busca
+        self.walkable = walkable if walkable is not None else walkable_mask(board)
+        self.danger = danger_mask(ghosts, self.rows, self.cols)
+        # Tabela de distâncias reais (MazeDistances): heurística perfeita sem fantasmas
+        self.distances = distances
+        self._goal_dist = distances.distances_to(goal) if distances is not None else None
+        # Sem a tabela (boards grandes): limite dos marcos ALT, O(k·células) em memória
+        self.landmarks = landmarks if distances is None else None
+        self._landmark_bound = self.landmarks.bound_to(goal) if self.landmarks is not None else None
         
     def actions(self, state):
+        return self._grid_actions(state, self.danger)
+
+    def _grid_actions(self, state, danger):
+        """Ações andáveis a partir da célula `state` que não levam a uma célula da máscara `danger`."""
         r, c = state
+        rows, cols = self.rows, self.cols
+        walkable = self.walkable
         possible = []
-        
-        # Função auxiliar para checar se a próxima célula é andável e segura
-        def is_safe_and_walkable(nr, nc):
-            if nr < 0 or nr >= 33 or nc < 0 or nc >= 30: 
-                return False
-            # Verifica se é parede (valores >= 3 no board são paredes)
-            if self.board[nr][nc] >= 3 and self.board[nr][nc] != 9:
-                return False
-            # Verifica se tem fantasma muito perto daquela célula
-            for gr, gc in self.ghosts:
-                if abs(nr - gr) + abs(nc - gc) <= 2: # Raio de perigo
-                    return False
-            return True
-
-        # Testa as 4 direções (Cima, Baixo, Esquerda, Direita)
-        if is_safe_and_walkable(r-1, c): possible.append(UP)
-        if is_safe_and_walkable(r+1, c): possible.append(DOWN)
-        if is_safe_and_walkable(r, c-1): possible.append(LEFT)
-        if is_safe_and_walkable(r, c+1): possible.append(RIGHT)
-        
-        # Regra do Túnel nas bordas do mapa
-        if c == 0 and is_safe_and_walkable(r, 29): possible.append(LEFT)
-        if c == 29 and is_safe_and_walkable(r, 0): possible.append(RIGHT)
+
+        # Testa as 4 direções (Cima, Baixo, Esquerda, Direita): andável e longe dos fantasmas
+        if 0 <= c < cols:
+            if 0 < r <= rows:
+                i = (r - 1) * cols + c
+                if walkable[i] and not danger[i]: possible.append(UP)
+            if -1 <= r < rows - 1:
+                i = (r + 1) * cols + c
+                if walkable[i] and not danger[i]: possible.append(DOWN)
+        if 0 <= r < rows:
+            row = r * cols
+            if 0 < c <= cols:
+                i = row + c - 1
+                if walkable[i] and not danger[i]: possible.append(LEFT)
+            if -1 <= c < cols - 1:
+                i = row + c + 1
+                if walkable[i] and not danger[i]: possible.append(RIGHT)
+
+            # Regra do Túnel nas bordas do mapa
+            if c == 0:
+                i = row + cols - 1
+                if walkable[i] and not danger[i]: possible.append(LEFT)
+            if c == cols - 1:
+                i = row
+                if walkable[i] and not danger[i]: possible.append(RIGHT)
         
         return possible
 
@@ -53,17 +97,130 @@ class PacmanGridProblem(Problem):
         r, c = state
         if action == UP: return (r-1, c)
         if action == DOWN: return (r+1, c)
-        if action == LEFT: return (r, 29) if c == 0 else (r, c-1)
-        if action == RIGHT: return (r, 0) if c == 29 else (r, c+1)
+        last = self.cols - 1
+        if action == LEFT: return (r, last) if c == 0 else (r, c-1)
+        if action == RIGHT: return (r, 0) if c == last else (r, c+1)
         return state
 
     def path_cost(self, c, state1, action, state2):
         return c + 1
         
     def h(self, node):
+        # Com a tabela, usa a distância real no labirinto (nunca superestima:
+        # os fantasmas só removem caminhos)
+        if self._goal_dist is not None:
+            d = self._goal_dist.get(node.state)
+            if d is not None:
+                return d
         # Heurística: Distância de Manhattan no Grid
         r1, c1 = node.state
         r2, c2 = self.goal
         # Lida com a distância através do túnel
-        dc = min(abs(c1 - c2), 30 - abs(c1 - c2))
+        dc = min(abs(c1 - c2), self.cols - abs(c1 - c2))
+        if self._landmark_bound is not None:
+            return max(self._landmark_h(node.state), abs(r1 - r2) + dc)
         return abs(r1 - r2) + dc
+
+    def _landmark_h(self, cell):
+        i = self.landmarks.index.get(cell)
+        return 0 if i is None else self._landmark_bound(i)
+
+
+# ======================================================================
+#  VARIANTE COM VÁRIOS OBJETIVOS (Qualquer comida serve)
+# ======================================================================
+class PacmanFoodProblem(PacmanGridProblem):
+    """
+    Mesmo grid do PacmanGridProblem, mas o objetivo é o conjunto de comidas:
+    goal_test aceita qualquer célula com comida. Resolvido com BFS (custos
+    unitários), devolve em uma única passada a comida alcançável mais
+    próxima com segurança, sem escolher antes um alvo que pode estar
+    bloqueado pelos fantasmas.
+    """
+    def __init__(self, initial, foods, board, ghosts, walkable=None):
+        super().__init__(initial, frozenset(foods), board, ghosts, walkable=walkable)
+
+    def goal_test(self, state):
+        return state in self.goal
+
+    def h(self, node):
+        # Sem alvo único: a busca é cega (BFS/UCS)
+        return 0
+
+
+# ======================================================================
+#  VARIANTE ESPAÇO-TEMPO (Fantasmas previstos por passo)
+# ======================================================================
+class PacmanSpaceTimeProblem(PacmanGridProblem):
+    """
+    Estados são (célula, k): a célula do Pac-Man depois de k passos. Em vez de
+    uma máscara de perigo fixa, cada passo tem a sua (danger_by_step, vindas do
+    GhostPredictor) e uma célula só é proibida se estiver em perigo no passo
+    em que o Pac-Man chegaria nela. Depois do último passo previsto o tempo
+    para de contar (k fica no máximo), então o espaço de estados é finito.
+    """
+    def __init__(self, initial, goal, board, danger_by_step, distances=None, walkable=None, landmarks=None):
+        super().__init__(initial, goal, board, [], distances, walkable, landmarks)
+        self.initial = (initial, 0)
+        self.danger_by_step = danger_by_step
+        self.last_step = len(danger_by_step) - 1
+
+    def actions(self, state):
+        cell, k = state
+        # Perigo no instante de chegada (passo k + 1)
+        return self._grid_actions(cell, self.danger_by_step[min(k + 1, self.last_step)])
+
+    def result(self, state, action):
+        cell, k = state
+        return super().result(cell, action), min(k + 1, self.last_step)
+
+    def goal_test(self, state):
+        return state[0] == self.goal
+
+    def h(self, node):
+        cell = node.state[0]
+        if self._goal_dist is not None:
+            d = self._goal_dist.get(cell)
+            if d is not None:
+                return d
+        (r1, c1), (r2, c2) = cell, self.goal
+        dc = min(abs(c1 - c2), self.cols - abs(c1 - c2))
+        if self._landmark_bound is not None:
+            return max(self._landmark_h(cell), abs(r1 - r2) + dc)
+        return abs(r1 - r2) + dc
+
+
+# ======================================================================
+#  BUSCA SOBRE OS ESTADOS DO MOTOR (Frames ou Macro-ações)
+# ======================================================================
+class PacmanSnapshotProblem(Problem):
+    """
+    Busca direto sobre os StateSnapshot do motor, com as transições puras de
+    env.engine. Com macro=True cada ação anda até o próximo ponto de decisão
+    (macro_successors) e custa os frames gastos; com macro=False cada ação
+    é um único frame (custo 1), como o get_successors original.
+    """
+    def __init__(self, initial, goal_test=None, macro=True, layout=None):
+        super().__init__(initial)
+        self._goal_test = goal_test or PacmanEngine.is_goal_state
+        self.macro = macro
+        self.layout = layout # Board compilado (engine.layout); None = board original
+        self._edges = {} # (estado, ação) -> (próximo estado, frames)
+
+    def actions(self, state):
+        if self.macro:
+            edges = macro_successors(state, layout=self.layout)
+        else:
+            edges = [(name, nxt, 1) for name, nxt in successors(state, self.layout)]
+        for name, nxt, frames in edges:
+            self._edges[(state, name)] = (nxt, frames)
+        return [name for name, _, _ in edges]
+
+    def result(self, state, action):
+        return self._edges[(state, action)][0]
+
+    def path_cost(self, c, state1, action, state2):
+        return c + self._edges[(state1, action)][1]
+
+    def goal_test(self, state):
+        return self._goal_test(state)
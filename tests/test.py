@@ -1,7 +1,26 @@
 import pytest
-from search import Node  # Classe oficial do AIMA
-from ProjectGrupo9.main import PacmanGridProblem
-from ProjectGrupo9.pacman_gamestate import UP, DOWN, LEFT, RIGHT
+from search import Node, astar_search, breadth_first_graph_search, uniform_cost_search  # Classes oficiais do AIMA
+from utils import PriorityQueue, BucketQueue
+from problems.pacman_problem import (PacmanGridProblem, PacmanFoodProblem, PacmanSnapshotProblem,
+                                     PacmanSpaceTimeProblem, danger_mask)
+from env.engine import (PacmanEngine, UP, DOWN, LEFT, RIGHT, FOOD_BIT, food_hash,
+                        successor, successors, macro_successors)
+from env.batch_engine import BatchEngine
+from env.transposition import TranspositionStore
+from env.board import boards
+from problems.maze_distances import MazeDistances
+from agents.dstar_lite import DStarLitePlanner
+from agents.astar_agent import GridAStarAgent
+from agents.plan_cache import PlanCache
+from agents.food_index import FoodIndex, BFSFoodIndex
+from agents.ghost_predictor import GhostPredictor
+from agents.ara_star import ARAStarPlanner
+from problems.junction_graph import JunctionGraph, JunctionGraphProblem, plan, refine
+from problems.flat_astar import FlatGridAStar
+from problems.next_hop import NextHopTable
+from problems.landmarks import grid_landmarks, graph_landmarks
+from env.layout import compile_board
+from env.maze_generator import generate_board
 
 # ======================================================================
 # FIXTURES (Ambiente Simulado para os Testes)
@@ -86,4 +105,731 @@ def test_fuga_de_fantasmas(mini_board):
     
     # O A* deve proibir a ida para a direita para não morrer
     assert RIGHT not in acoes_seguras 
-    assert DOWN in acoes_seguras  # O caminho para baixo continua seguro
\ No newline at end of file
+    assert DOWN in acoes_seguras  # O caminho para baixo continua seguro
+
+def test_motor_headless_sem_pygame():
+    """
+    Testa o PacmanEngine (sem janela).
+    O motor deve avançar frames sozinho, notificar os observadores
+    uma vez por frame e mover o Pac-Man depois do startup (180 frames).
+    """
+    class ContadorDeFrames:
+        def __init__(self):
+            self.frames = 0
+        def on_frame(self, engine):
+            self.frames += 1
+
+    motor = PacmanEngine()
+    observador = ContadorDeFrames()
+    motor.add_observer(observador)
+
+    for _ in range(240):
+        motor.step(lambda: LEFT)
+
+    assert observador.frames == 240
+    assert motor.player_x != 450  # Saiu da posição inicial
+    assert motor.direction == LEFT
+
+def test_simulador_em_lote_igual_ao_motor():
+    """
+    Testa o BatchEngine (NumPy).
+    Cada jogo do lote, recebendo a mesma sequência de comandos,
+    deve reproduzir frame a frame o PacmanEngine individual.
+    """
+    roteiros = [
+        [LEFT] * 300 + [UP] * 200 + [RIGHT] * 300,
+        [RIGHT] * 250 + [DOWN] * 150 + [LEFT] * 400,
+        [UP] * 400 + [-1] * 400,
+    ]
+    lote = BatchEngine(len(roteiros))
+    motores = [PacmanEngine() for _ in roteiros]
+
+    for frame in range(800):
+        lote.step([r[frame] for r in roteiros])
+        for i, motor in enumerate(motores):
+            acao = roteiros[i][frame]
+            motor.step(lambda: None if acao < 0 else acao)
+            visao = lote.view(i)
+            assert (visao.player_x, visao.player_y, visao.score, visao.lives) == \
+                   (motor.player_x, motor.player_y, motor.score, motor.lives)
+            assert (visao.blinky_x, visao.blinky_y, visao.clyde_x, visao.clyde_y) == \
+                   (motor.blinky_x, motor.blinky_y, motor.clyde_x, motor.clyde_y)
+
+def test_tabela_de_distancias_do_labirinto(mini_board, tmp_path):
+    """
+    Testa a MazeDistances (distâncias reais, com cache em disco).
+    No mini labirinto (1,1) -> (3,3) custa 4 passos; no board real o túnel
+    liga as colunas 0 e 29 com 1 passo. A segunda instância lê o cache, e a
+    coluna do objetivo só é montada de novo quando o objetivo muda.
+    """
+    tabela = MazeDistances(mini_board, cache_dir=tmp_path)
+    assert tabela.distance((1, 1), (3, 3)) == 4
+    assert tabela.distance((1, 1), (0, 0)) == float("inf")  # Parede
+
+    real = MazeDistances(boards, cache_dir=tmp_path)
+    assert real.distance((15, 0), (15, 29)) == 1
+    assert len(list(tmp_path.glob("maze_distances_*.npy"))) == 2
+
+    recarregada = MazeDistances(boards, cache_dir=tmp_path)
+    assert (recarregada.table == real.table).all()
+
+    problema = PacmanGridProblem((1, 1), (3, 3), mini_board, [], tabela)
+    assert problema.h(Node(state=(1, 1))) == 4
+    # Mesmo alvo no replanejamento seguinte: a coluna não é montada de novo
+    assert PacmanGridProblem((2, 1), (3, 3), mini_board, [], tabela)._goal_dist is problema._goal_dist
+    assert tabela.distances_to((1, 1))[(3, 3)] == 4 and tabela.distances_to((3, 3)) is not problema._goal_dist
+
+def test_fila_de_prioridade_indexada():
+    """
+    Testa a PriorityQueue indexada usada pelo best_first_graph_search.
+    Pertinência e consulta são por chave; del + append funciona como
+    decrease-key e a entrada antiga nunca volta no pop.
+    """
+    fila = PriorityQueue('min', lambda no: no.path_cost)
+    fila.extend([Node((1, 1), path_cost=5), Node((2, 2), path_cost=3), Node((3, 3), path_cost=7)])
+
+    assert Node((1, 1)) in fila and Node((9, 9)) not in fila
+    assert fila[Node((1, 1))] == 5
+
+    del fila[Node((1, 1))]
+    fila.append(Node((1, 1), path_cost=1))  # decrease-key
+    assert len(fila) == 3
+
+    assert [fila.pop().state for _ in range(3)] == [(1, 1), (2, 2), (3, 3)]
+    assert len(fila) == 0
+    with pytest.raises(KeyError):
+        del fila[Node((1, 1))]
+
+def test_replanejamento_incremental_dstar(mini_board):
+    """
+    Testa o DStarLitePlanner.
+    Sem fantasmas o caminho (1,1) -> (3,3) tem 4 passos; quando um fantasma
+    surge perto de (1,3), a busca é reparada e o Pac-Man passa a descer.
+    Quando o objetivo passa para uma célula do caminho, a busca é reparada
+    (nenhuma expansão) em vez de refeita. No objetivo não há ação, e o modo
+    incremental vence o jogo original.
+    """
+    planejador = DStarLitePlanner(mini_board)
+    assert planejador.plan((1, 1), (3, 3), []) in (RIGHT, DOWN)
+    assert planejador.g[(1, 1)] == 4
+
+    acao = planejador.plan((1, 1), (3, 3), [(0, 4)])  # Perigo em (1,3)
+    assert acao == DOWN
+    assert planejador.path() == [(1, 1), (2, 1), (3, 1), (3, 2), (3, 3)]
+
+    assert planejador.plan((2, 1), (3, 3), [(0, 4)]) == DOWN
+    assert planejador.last_expansions <= 2  # Só andou: quase nada para reparar
+
+    # Objetivo muda para uma célula do caminho: reparação, sem refazer a busca
+    planejador = DStarLitePlanner(boards)
+    planejador.plan((24, 15), (4, 2), [])
+    meio = planejador.path()[17]
+    do_zero = DStarLitePlanner(boards)
+    assert planejador.plan((24, 15), meio, []) == do_zero.plan((24, 15), meio, [])
+    assert planejador.g[(24, 15)] == do_zero.g[(24, 15)] == 17 and planejador.path()[-1] == meio
+    assert planejador.last_expansions == 0 < do_zero.last_expansions
+
+    # Já no objetivo (vizinhos em perigo): nenhuma ação, o agente usa o failsafe
+    assert planejador.plan((1, 3), (1, 3), [(0, 4)]) is None
+
+    # No jogo inteiro o modo incremental vence como o A* do zero
+    motor = PacmanEngine()
+    agente = GridAStarAgent(motor, planner="incremental")
+    while not (motor.game_over or motor.game_won):
+        motor.step(agente.get_action)
+    assert motor.game_won
+
+def test_agendador_nao_muda_o_comportamento():
+    """
+    Testa o DecisionScheduler do GridAStarAgent.
+    Com e sem o agendador o Pac-Man deve fazer exatamente o mesmo trajeto,
+    mas com o agendador a maioria dos frames reaproveita o plano.
+    """
+    trajetos = []
+    for agendado in (False, True):
+        motor = PacmanEngine()
+        agente = GridAStarAgent(motor, scheduled=agendado)
+        trajeto = []
+        for _ in range(1500):
+            motor.step(agente.get_action)
+            trajeto.append((motor.player_x, motor.player_y, motor.direction_cmd, motor.score))
+        trajetos.append(trajeto)
+
+    assert trajetos[0] == trajetos[1]
+    assert agente.scheduler.reuse_ratio > 0.8
+
+
+def test_cache_de_planos():
+    """
+    Testa o PlanCache: o plano guardado é seguido passo a passo e é
+    invalidado quando um fantasma bloqueia o resto do caminho ou o alvo some.
+    """
+    caminho = [(1, 1), (1, 2), (1, 3), (1, 4)]
+    acoes = [RIGHT, RIGHT, RIGHT]
+    cache = PlanCache(len(boards), len(boards[0]))
+    cache.store(caminho, acoes, [], (1, 4))
+    tem_comida = lambda celula: True
+
+    assert cache.next_action((1, 1), [], tem_comida) == RIGHT
+    assert cache.next_action((1, 2), [], tem_comida) == RIGHT
+    # Fantasma a 2 passos da última célula: o plano não vale mais
+    assert cache.next_action((1, 3), [(3, 4)], tem_comida) is None
+    assert cache.invalidations["blocked"] == 1
+
+    cache.store(caminho, acoes, [], (1, 4))
+    assert cache.next_action((1, 1), [], lambda celula: False) is None
+    assert cache.invalidations["target_eaten"] == 1
+    assert cache.hits == 2 and cache.misses == 2
+
+
+def test_indice_da_comida_mais_proxima(tmp_path):
+    """
+    Testa o FoodIndex: a comida mais próxima é medida pelo labirinto, não em
+    linha reta, e o índice acompanha as comidas comidas.
+    """
+    board = [
+        [3, 3, 3, 3, 3, 3],
+        [3, 0, 3, 1, 0, 3],
+        [3, 0, 3, 3, 0, 3],
+        [3, 0, 1, 0, 0, 3],
+        [3, 3, 3, 3, 3, 3]
+    ]
+    indice = FoodIndex(MazeDistances(board, cache_dir=tmp_path))
+    comidas = {(1, 3), (3, 2)}
+    tem_comida = comidas.__contains__
+
+    # (1,3) está a 2 passos em Manhattan, mas a 8 pelo labirinto
+    assert indice.nearest((1, 1), tem_comida, len(comidas)) == (3, 2)
+    comidas.discard((3, 2))
+    assert indice.nearest((1, 1), tem_comida, len(comidas)) == (1, 3)
+    comidas.discard((1, 3))
+    assert indice.nearest((1, 1), tem_comida, len(comidas)) is None
+
+    # Reset do jogo: a comida volta e os cursores recomeçam
+    comidas.update({(1, 3), (3, 2)})
+    assert indice.nearest((1, 1), tem_comida, len(comidas)) == (3, 2)
+
+
+def test_busca_por_qualquer_comida(mini_board):
+    """
+    Testa o PacmanFoodProblem: a BFS para na primeira comida alcançável.
+    Com um fantasma guardando a comida mais próxima, o agente vai até a
+    outra em vez de falhar.
+    """
+    problema = PacmanFoodProblem((1, 1), {(1, 3), (3, 3)}, mini_board, ghosts=[])
+    assert breadth_first_graph_search(problema).state == (1, 3)
+
+    # Fantasma em (1,3): a única comida segura é (3,3), pelo lado esquerdo
+    problema = PacmanFoodProblem((1, 1), {(1, 3), (3, 3)}, mini_board, ghosts=[(0, 4)])
+    no = breadth_first_graph_search(problema)
+    assert no.state == (3, 3)
+    assert no.solution() == [DOWN, DOWN, RIGHT, RIGHT]
+
+
+def test_mascara_de_perigo_atravessa_o_tunel():
+    """
+    Testa as máscaras do PacmanGridProblem: um fantasma na saída direita do
+    túnel também torna perigosa a saída esquerda (1 passo pelo túnel).
+    """
+    perigo = danger_mask([(15, 29)], len(boards), len(boards[0]))
+    assert perigo[15 * 30 + 0] and perigo[15 * 30 + 1]
+    assert not perigo[15 * 30 + 2]
+
+    problema = PacmanGridProblem((15, 2), (15, 5), boards, ghosts=[(15, 29)])
+    assert LEFT not in problema.actions((15, 2))
+    assert RIGHT in problema.actions((15, 2))
+
+
+def test_grafo_de_estados_com_capacidade_limitada():
+    """
+    Testa o TranspositionStore usado por get_successors: arestas repetidas
+    não duplicam, revisitar um estado conta como hit e, acima da capacidade,
+    o estado usado há mais tempo é descartado.
+    """
+    grafo = TranspositionStore(capacity=2)
+    grafo.put("a", [("RIGHT", "b"), ("LEFT", "c")])
+    grafo.put("a", [("RIGHT", "b")])
+    assert grafo["a"] == [("RIGHT", "b"), ("LEFT", "c")]
+    assert grafo.hits == 1 and grafo.misses == 1
+
+    grafo.put("b", [])
+    grafo.get("a")          # "a" passa a ser o mais recente
+    grafo.put("c", [])
+    assert "b" not in grafo and "a" in grafo and len(grafo) == 2
+    assert grafo.evictions == 1
+
+    motor = PacmanEngine(graph_capacity=50)
+    for _ in range(200):
+        motor.step()
+        motor.get_successors(motor._snapshot())
+    assert len(motor._graph) <= 50
+    assert motor._graph.stats()["resident_bytes"] > 0
+
+
+def test_snapshot_com_bitboards():
+    """
+    Testa a comida do StateSnapshot como bitboards: comer uma pastilha
+    apaga só o bit dela, e snapshots iguais têm o mesmo hash.
+    """
+    motor = PacmanEngine()
+    inicial = motor._snapshot()
+    assert inicial.active_food == frozenset(motor.active_food)
+    assert motor.is_goal_state(inicial) is False
+
+    while motor.score == 0:
+        motor.step()
+    (comida,) = inicial.active_food - motor.active_food
+    depois = motor._snapshot()
+    assert depois.food_bits == inicial.food_bits ^ FOOD_BIT[comida]
+
+    recarregado = PacmanEngine()
+    recarregado._load_snapshot(depois)
+    assert recarregado._snapshot() == depois
+    assert hash(recarregado._snapshot()) == hash(depois)
+    assert recarregado.level[comida[0]][comida[1]] == 0
+
+
+def test_hash_de_zobrist_incremental():
+    """
+    Testa o hash de Zobrist: a parte da comida, atualizada por XOR a cada
+    comida comida, bate com o cálculo do zero, e o hash guardado no
+    snapshot muda quando o Pac-Man anda.
+    """
+    motor = PacmanEngine()
+    anterior = motor._snapshot()
+    for _ in range(400):
+        motor.step()
+    assert motor.score > 0
+    assert motor.food_key == food_hash(motor.food_bits, motor.capsule_bits)
+
+    atual = motor._snapshot()
+    assert hash(atual) != hash(anterior)
+    assert hash(atual) == hash(motor._snapshot())
+    assert len({anterior, atual, motor._snapshot()}) == 2
+
+
+def test_sucessor_puro_igual_ao_motor():
+    """
+    Testa successor(snapshot, ação): sem carregar nada no motor, dá o mesmo
+    estado que _load_snapshot + _advance_frame e não altera o snapshot.
+    """
+    motor = PacmanEngine()
+    for _ in range(250):
+        motor.step()
+    estado = motor._snapshot()
+
+    for acao in (RIGHT, LEFT, UP, DOWN):
+        referencia = PacmanEngine()
+        referencia._load_snapshot(estado)
+        referencia.direction = acao
+        referencia._advance_frame()
+        esperado = referencia._snapshot()
+        obtido = successor(estado, acao)
+        assert obtido == esperado
+        assert (obtido.score, obtido.power_counter, obtido.eaten_ghost) == \
+               (esperado.score, esperado.power_counter, esperado.eaten_ghost)
+
+    assert estado == motor._snapshot()
+    assert [nome for nome, _ in successors(estado)] == \
+           [nome for nome, _ in motor.get_successors(estado)]
+
+
+def test_macro_acoes_ate_o_ponto_de_decisao():
+    """
+    Testa macro_successors: cada aresta equivale a repetir successor() pelo
+    número de frames que ela custa, e a busca com macro-ações acha o mesmo
+    custo ótimo em frames com uma solução bem mais curta.
+    """
+    inicio = PacmanEngine().get_start_state()
+    for nome, destino, frames in macro_successors(inicio):
+        acao = {"RIGHT": RIGHT, "LEFT": LEFT, "UP": UP, "DOWN": DOWN}[nome]
+        estado = inicio
+        for _ in range(frames):
+            estado = successor(estado, acao)
+        assert estado == destino
+
+    comeu_3 = lambda estado: estado.score >= 30
+    por_frame = uniform_cost_search(PacmanSnapshotProblem(inicio, comeu_3, macro=False))
+    por_macro = uniform_cost_search(PacmanSnapshotProblem(inicio, comeu_3, macro=True))
+    assert por_macro.path_cost == por_frame.path_cost
+    assert len(por_macro.solution()) < len(por_frame.solution())
+
+
+def test_grafo_de_juncoes(mini_board):
+    """
+    Testa o JunctionGraph: o anel do mini labirinto vira um único corredor, e
+    no board real o plano por corredores tem o mesmo comprimento do A* no
+    grid, inclusive desviando de um fantasma.
+    """
+    anel = JunctionGraph(mini_board)
+    assert len(anel.junctions) == 1 and anel.num_edges == 2
+
+    grafo = JunctionGraph(boards)
+    assert len(grafo.junctions) < len(grafo.walkable) / 3
+    for inicio, objetivo, fantasmas in [((24, 15), (4, 2), []), ((24, 15), (4, 2), [(20, 15)]),
+                                        ((15, 0), (15, 29), [])]:
+        trechos = plan(grafo, inicio, objetivo, fantasmas)
+        celulas, acoes = [inicio], []
+        for trecho in trechos:
+            c, a = refine(trecho)
+            celulas += c[1:]
+            acoes += a
+        no = astar_search(PacmanGridProblem(inicio, objetivo, boards, fantasmas))
+        assert celulas[-1] == objetivo and len(acoes) == no.path_cost
+
+    # Com a tabela, o h consulta só as junções visitadas: mesmo plano, h exato
+    distancias = MazeDistances(boards, cache_dir=None)
+    assert plan(grafo, (24, 15), (4, 2), [(20, 15)], distancias) == plan(grafo, (24, 15), (4, 2), [(20, 15)])
+    problema = JunctionGraphProblem((24, 15), (4, 2), grafo, [], distancias)
+    assert problema.h(Node(state=(24, 15))) == distancias.distance((24, 15), (4, 2))
+
+
+def test_busca_espaco_tempo(mini_board):
+    """
+    Testa o PacmanSpaceTimeProblem e o GhostPredictor: uma célula só bloqueia
+    o caminho no passo em que está em perigo, e a trajetória prevista dos
+    fantasmas bate com a do motor (e fica em cache dentro do frame).
+    """
+    livre = bytearray(25)
+    perigo_em_12 = bytearray(25)
+    perigo_em_12[1 * 5 + 2] = 1
+
+    # (1, 2) perigosa no passo 1: vai e volta para deixar o perigo passar (4 passos, não 6)
+    problema = PacmanSpaceTimeProblem((1, 1), (1, 3), mini_board, [livre, perigo_em_12, livre])
+    no = astar_search(problema, problema.h)
+    assert no.solution() == [DOWN, UP, RIGHT, RIGHT] and no.state == ((1, 3), 2)
+    # actions(s) não depende da ordem das chamadas
+    antes = problema.actions(((1, 1), 0))
+    problema.actions(((1, 1), 1))
+    assert problema.actions(((1, 1), 0)) == antes and RIGHT not in antes
+    # Perigosa só no passo 2: passa por ela no passo 1 (caminho direto)
+    problema = PacmanSpaceTimeProblem((1, 1), (1, 3), mini_board, [livre, livre, perigo_em_12, livre])
+    no = astar_search(problema, problema.h)
+    assert no.solution() == [RIGHT, RIGHT]
+
+    jogo = PacmanEngine()
+    agente = GridAStarAgent(jogo)
+    for _ in range(400):
+        jogo.step(agente.get_action)
+    previsao = GhostPredictor().predict(jogo, 30)
+    for frame in range(31):
+        reais = [((y + 24) // 28, (x + 23) // 30)
+                 for x, y, morto in [(jogo.blinky_x, jogo.blinky_y, jogo.blinky_dead),
+                                     (jogo.inky_x, jogo.inky_y, jogo.inky_dead),
+                                     (jogo.pinky_x, jogo.pinky_y, jogo.pinky_dead),
+                                     (jogo.clyde_x, jogo.clyde_y, jogo.clyde_dead)] if not morto]
+        assert previsao[frame] == reais
+        jogo.step(agente.get_action)
+
+    preditor = GhostPredictor()
+    mascaras = preditor.danger_by_step(jogo)
+    assert preditor.danger_by_step(jogo) is mascaras and preditor.hits == 1
+    assert len(mascaras) == preditor.steps + 1
+
+
+def test_ara_star_com_prazo():
+    """
+    Testa o ARAStarPlanner: sem limite de tempo prova o ótimo do A*; com um
+    relógio que estoura depois de poucas leituras ainda devolve um primeiro
+    passo válido e um limite de subotimalidade coerente.
+    """
+    fantasmas = [(20, 15)]
+    otimo = astar_search(PacmanGridProblem((24, 15), (4, 2), boards, fantasmas)).path_cost
+
+    resultado = ARAStarPlanner(deadline=float("inf")).search(PacmanGridProblem((24, 15), (4, 2), boards, fantasmas))
+    assert resultado.complete and resultado.bound == 1.0 and resultado.cost == otimo
+    assert resultado.path[0] == (24, 15) and resultado.path[-1] == (4, 2)
+
+    for leituras in (5, 60, 400):
+        relogio = iter(range(10 ** 6)).__next__   # Cada leitura do relógio "gasta" 1 s
+        planejador = ARAStarPlanner(deadline=leituras, clock=relogio)
+        problema = PacmanGridProblem((24, 15), (4, 2), boards, fantasmas)
+        resultado = planejador.search(problema)
+        assert resultado.solution and resultado.solution[0] in problema.actions((24, 15))
+        assert resultado.expansions <= leituras
+        if resultado.complete:
+            assert otimo <= resultado.cost <= resultado.bound * otimo
+        else:
+            assert resultado.bound == float("inf")
+
+
+def test_astar_plano_igual_ao_aima(mini_board):
+    """
+    Testa o FlatGridAStar: mesmas ações do astar_search do AIMA (com e sem
+    fantasmas, pelo túnel e sem caminho), reaproveitando os buffers entre
+    as chamadas.
+    """
+    distancias = MazeDistances(boards, cache_dir=None)
+    plano = FlatGridAStar(boards)
+    casos = [((24, 15), (4, 2), []), ((24, 15), (4, 2), [(20, 15)]), ((15, 2), (15, 27), []),
+             ((4, 2), (4, 2), []), ((24, 15), (1, 1), [(2, 2)])]
+    for tabela in (None, distancias):
+        for inicio, objetivo, fantasmas in casos:
+            problema = PacmanGridProblem(inicio, objetivo, boards, fantasmas, tabela)
+            no = astar_search(problema, problema.h)
+            acoes = plano.solve(problema)
+            assert acoes == (no.solution() if no else None)
+            if acoes:
+                assert plano.path == [n.state for n in no.path()]
+    assert plano.generation == 2 * len(casos)
+
+    expandidas = set()
+    assert FlatGridAStar(mini_board).solve(PacmanGridProblem((1, 1), (3, 3), mini_board, []), expandidas)
+    assert (1, 1) in expandidas and (3, 3) not in expandidas
+
+
+def test_fila_de_baldes():
+    """
+    Testa a BucketQueue: menor f primeiro, empate resolvido pelo nó mais
+    profundo, remoção preguiçosa, e o mesmo custo ótimo que a PriorityQueue
+    no A* e na busca de custo uniforme.
+    """
+    fila = BucketQueue('min', f=lambda x: x[0], depth=lambda x: x[1])
+    for item in [(3, 0), (2, 1), (2, 5), (2, 3), (7, 9)]:
+        fila.append(item)
+    del fila[(2, 3)]
+    assert (2, 5) in fila and fila[(2, 5)] == 2 and len(fila) == 4
+    assert [fila.pop() for _ in range(4)] == [(2, 5), (2, 1), (3, 0), (7, 9)]
+    fila.append((1, 0)) # Chave menor que o cursor volta a ser a primeira
+    assert fila.pop() == (1, 0) and len(fila) == 0
+    with pytest.raises(ValueError):
+        fila.append((0.5, 0))
+
+    problema = PacmanGridProblem((24, 15), (4, 2), boards, [(20, 15)])
+    for busca in (lambda q: astar_search(problema, queue=q), lambda q: uniform_cost_search(problema, queue=q)):
+        assert busca(BucketQueue).path_cost == busca(PriorityQueue).path_cost
+
+
+def test_tabela_de_proximo_passo(tmp_path):
+    """
+    Testa a NextHopTable: a rota da tabela tem o comprimento da distância no
+    labirinto (inclusive pelo túnel), e a tabela gravada volta do disco em
+    mmap igual à original.
+    """
+    distancias = MazeDistances(boards, cache_dir=None)
+    rotas = NextHopTable(boards, cache_dir=tmp_path, distances=distancias)
+    for inicio, objetivo in [((24, 15), (4, 2)), ((15, 2), (15, 27)), ((2, 2), (29, 27))]:
+        celulas, acoes = rotas.route(inicio, objetivo)
+        assert celulas[0] == inicio and celulas[-1] == objetivo
+        assert len(acoes) == distancias.distance(inicio, objetivo)
+        assert rotas.next_action(inicio, objetivo) == acoes[0]
+    assert rotas.route((4, 2), (4, 2)) == ([(4, 2)], []) and rotas.next_action((4, 2), (4, 2)) is None
+
+    copia = NextHopTable(boards, cache_dir=tmp_path, distances=distancias)
+    assert type(copia.table).__name__ == "memmap" # Aberta do disco em mmap
+    assert (copia.table == rotas.table).all()
+
+
+def test_heuristica_de_marcos():
+    """
+    Testa a heurística ALT: no board os marcos ficam na componente principal
+    e o limite nunca passa da distância real; no mapa da Romênia do AIMA o
+    A* com a ALT acha o mesmo custo ótimo que com a heurística em linha reta.
+    O A* plano acha o mesmo plano com menos expansões que só com Manhattan.
+    """
+    from search import romania_map, GraphProblem
+
+    marcos = grid_landmarks(boards, k=8)
+    distancias = MazeDistances(boards, cache_dir=None)
+    assert marcos.k == 8 and all(distancias.distance(m, (24, 15)) < float("inf") for m in marcos.landmarks)
+    for a in distancias.cells[::7]:
+        for b in distancias.cells[::11]:
+            assert marcos.lower_bound(a, b) <= distancias.distance(a, b)
+    for m in marcos.landmarks: # Até um marco o limite é exato
+        assert marcos.lower_bound((24, 15), m) == distancias.distance((24, 15), m)
+
+    problema = PacmanGridProblem((24, 15), (4, 2), boards, [(20, 15)], landmarks=marcos)
+    assert astar_search(problema).path_cost == astar_search(PacmanGridProblem((24, 15), (4, 2), boards, [(20, 15)])).path_cost
+
+    # O A* plano (índices na mesma ordem dos marcos) e o D* Lite também usam o limite
+    com_marcos, manhattan = FlatGridAStar(boards), FlatGridAStar(boards)
+    solucao = com_marcos.solve(PacmanGridProblem((24, 15), (2, 27), boards, [], landmarks=marcos))
+    assert len(solucao) == len(manhattan.solve(PacmanGridProblem((24, 15), (2, 27), boards, []))) == 34
+    assert com_marcos.expansions < manhattan.expansions
+    assert DStarLitePlanner(boards, landmarks=marcos)._h((24, 15), (16, 12)) == 27 # Manhattan: 11
+
+    romenia = graph_landmarks(romania_map, k=4)
+    problema = GraphProblem('Arad', 'Bucharest', romania_map)
+    assert astar_search(problema, romenia.h_to('Bucharest')).path_cost == astar_search(problema).path_cost == 418
+
+
+def test_labirinto_gerado_e_board_compilado():
+    """
+    Testa o gerador e o compilador de boards: o mesmo seed dá o mesmo
+    labirinto, todo corredor é alcançável, o board original compila para as
+    posições fixas de antes e o motor, as transições puras e o agente jogam
+    num board gerado de outro tamanho.
+    """
+    original = compile_board(boards)
+    assert (original.width, original.height, original.player_start) == (900, 950, (450, 663))
+    assert original.ghost_starts[1][:2] == (440, 388) and original.box == (350, 550, 370, 480)
+    assert original.exit_target == (400, 12 * 28) # Linha aberta logo acima do portão (linha 13)
+    assert original.food_bit == FOOD_BIT
+
+    board = generate_board(25, 22, seed=7)
+    assert board == generate_board(25, 22, seed=7) and board != generate_board(25, 22, seed=8)
+    layout = compile_board(board)
+    assert (layout.rows, layout.cols, layout.width) == (25, 22, 660)
+    marcos = grid_landmarks(board, k=1)
+    assert all(marcos.distances(c)[0] < float("inf") for c in marcos.nodes) # Uma componente só
+    assert board[layout.gate[0]].count(9) == 2
+    saida = layout.exit_target[1] // 28 # Acima do portão, numa linha aberta, não no y do board original
+    assert saida < layout.gate[0] and any(board[saida][c] < 3 for c in range(layout.gate[1], layout.gate[2] + 1))
+    assert any(row[0] < 3 and row[-1] < 3 for row in board) # Túnel
+
+    motor = PacmanEngine(board=board)
+    agente = GridAStarAgent(motor, planner="routing")
+    for _ in range(400):
+        motor.step(agente.get_action)
+    assert motor.score > 0 and len(motor.level) == 25
+    estado = motor._snapshot()
+    for acao in (RIGHT, LEFT, UP, DOWN):
+        referencia = PacmanEngine(board=board)
+        referencia._load_snapshot(estado)
+        referencia.direction = acao
+        referencia._advance_frame()
+        assert successor(estado, acao, layout=layout) == referencia._snapshot()
+    with pytest.raises(ValueError):
+        generate_board(10, 10)
+
+
+def test_suite_de_benchmark_das_buscas():
+    """
+    Testa a suíte de benchmark: as cargas vêm de um jogo gravado, o
+    resultado é JSON com latências em percentis e os buscadores ótimos
+    concordam no custo de cada carga; comparar um resultado com ele mesmo
+    não acusa regressão.
+    """
+    import json
+    from benchmarks.bench_search_suite import record_workloads, run_suite, compare, percentile
+
+    assert percentile([5, 1, 4, 2, 3], 50) == 3 and percentile([5, 1, 4, 2, 3], 99) == 5
+    gravadas = record_workloads(games=[("default", {})], max_frames=600)
+    assert gravadas and all(inicio != alvo for inicio, alvo, _ in gravadas)
+
+    resultado = run_suite(n=12, recorded=gravadas, repeat=1,
+                          only={"astar", "uniform_cost", "bfs_graph", "flat_astar", "ara_star"})
+    resultado = json.loads(json.dumps(resultado))
+    assert resultado["meta"]["workloads"] == 12 and resultado["meta"]["calibration_ms"] > 0
+    astar = resultado["searchers"]["astar"]
+    assert astar["solved"] == 12 and astar["p50_us"] <= astar["p95_us"] <= astar["p99_us"] <= astar["max_us"]
+    assert all(s["matches_optimal"] for s in resultado["searchers"].values() if "matches_optimal" in s)
+    assert resultado["searchers"]["flat_astar"]["expansions"] == astar["expansions"]
+    _, regrediu = compare(resultado, resultado)
+    assert not regrediu
+
+
+def test_profiler_de_frames():
+    """
+    Testa o FrameProfiler com um relógio falso: as marcas somam cada trecho
+    na fase certa, o buffer circular guarda só os últimos `capacity` frames,
+    o tick fica fora do trabalho do frame e frames acima do orçamento contam
+    como perdidos. No motor, ligar o profiler não muda o jogo.
+    """
+    from env.profiler import FrameProfiler
+
+    agora = [0]
+    perfil = FrameProfiler(capacity=4, budget_ms=10, clock=lambda: agora[0])
+    for trabalho_ms in (1, 2, 3, 20, 5, 6):
+        agora[0] += 50_000_000
+        perfil.mark("tick")                  # Espera: não conta no orçamento
+        agora[0] += trabalho_ms * 1_000_000
+        perfil.mark("agent")
+        perfil.end_frame()
+    resumo = perfil.summary()
+    assert resumo["frames"] == 6 and resumo["window"] == 4 and resumo["dropped"] == 1
+    assert sorted(perfil.spans[perfil.phases.index("agent")]) == [3e6, 5e6, 6e6, 20e6]
+    assert resumo["phases"]["agent"]["p50_ms"] == 5 and resumo["phases"]["agent"]["p99_ms"] == 20
+    assert resumo["phases"]["frame"]["max_ms"] == 20 and resumo["phases"]["draw"]["max_ms"] == 0
+    assert "perdidos (> 10.0 ms): 1" in perfil.report()
+
+    motor = PacmanEngine()
+    motor.profiler = perfil = FrameProfiler(capacity=64)
+    referencia = PacmanEngine()
+    agente, agente_ref = GridAStarAgent(motor), GridAStarAgent(referencia)
+    for _ in range(100):
+        motor.step(agente.get_action)
+        perfil.end_frame()
+        referencia.step(agente_ref.get_action)
+    assert motor._snapshot() == referencia._snapshot()
+    fases = perfil.summary()["phases"]
+    assert all(fases[f]["max_ms"] > 0 for f in ("update", "agent", "move", "collisions"))
+
+
+def test_jogo_headless_termina_em_labirinto_gerado():
+    """
+    Testa que o jogo sem janela termina num labirinto gerado: um fantasma
+    indo e voltando entre os dois caminhos até a comida prende o Pac-Man
+    (33x30, seed 2). O loop para sozinho quando nada muda no placar; com
+    stall_frames (opcional) o agente arrisca passar e o jogo acaba de verdade.
+    """
+    from main import AStarGameLoop
+    from agents.astar_agent import STALL_FRAMES
+
+    loop = AStarGameLoop(headless=True, board=generate_board(33, 30, seed=2))
+    loop.run()
+    assert loop.stalled and not (loop.game.game_over or loop.game.game_won)
+
+    loop = AStarGameLoop(headless=True, board=generate_board(33, 30, seed=2))
+    loop.agent.stall_frames = STALL_FRAMES
+    loop.run(max_frames=30000, idle_limit=None)
+    assert loop.game.game_over or loop.game.game_won
+
+    loop = AStarGameLoop(headless=True, board=generate_board(25, 22, seed=0))
+    assert loop.run(idle_limit=1) == 2 and loop.stalled # Placar igual já no 2º frame
+
+
+def test_agente_com_marcos_sem_a_tabela(monkeypatch):
+    """
+    Testa o agente acima de MAX_TABLE_CELLS (limite zerado no board
+    original): sem a tabela de todos os pares o agente monta os marcos, a
+    BFS por camadas dá a mesma comida mais próxima do FoodIndex e todos os
+    modos do agente jogam.
+    """
+    import agents.astar_agent
+
+    monkeypatch.setattr(agents.astar_agent, "MAX_TABLE_CELLS", 0)
+    agente = GridAStarAgent(PacmanEngine())
+    assert agente.distances is None and agente.landmarks is not None
+    assert isinstance(agente.food_index, BFSFoodIndex)
+
+    tabela = FoodIndex(MazeDistances(boards, cache_dir=None))
+    comidas = {cell for cell in tabela.cells[::5]}
+    for cell in tabela.cells[::9]:
+        assert agente.food_index.nearest(cell, comidas.__contains__, len(comidas)) == \
+            tabela.nearest(cell, comidas.__contains__, len(comidas))
+
+    for planejador in ("astar", "incremental", "hierarchical", "space_time", "anytime"):
+        motor = PacmanEngine()
+        agente = GridAStarAgent(motor, planner=planejador)
+        for _ in range(300):
+            motor.step(agente.get_action)
+        assert motor.score > 0
+    with pytest.raises(ValueError): # A tabela de rotas sai da tabela de distâncias
+        GridAStarAgent(PacmanEngine(), planner="routing")
+
+
+def test_escolha_do_planejador():
+    """
+    Testa a escolha do planejador do agente: um por vez, e otimizações
+    pedidas para um planejador que não as usa dão erro em vez de sumirem.
+    Na linha de comando, dois modos juntos também são recusados.
+    """
+    import os
+    import subprocess
+    import sys
+
+    motor = PacmanEngine()
+    assert GridAStarAgent(motor).scheduler is not None
+    agente = GridAStarAgent(motor, planner="hierarchical")
+    assert agente.junctions is not None and agente.scheduler is None and agente.predictor is None
+    assert GridAStarAgent(motor, planner="anytime").flat is None
+    for planejador, opcoes in [("bfs", {}), ("hierarchical", {"scheduled": True}),
+                               ("incremental", {"plan_cache": True}), ("anytime", {"flat": True})]:
+        with pytest.raises(ValueError):
+            GridAStarAgent(motor, planner=planejador, **opcoes)
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    saida = subprocess.run([sys.executable, "main.py", "--headless", "--hierarchical", "--space-time"],
+                           cwd=raiz, capture_output=True, text=True)
+    assert saida.returncode != 0 and "--hierarchical, --space-time" in saida.stderr
@@ -714,9 +714,9 @@ class hashabledict(dict):
 
 
 # ______________________________________________________________________________
-# Queues: Stack, FIFOQueue, PriorityQueue
+# Queues: Stack, FIFOQueue, PriorityQueue, BucketQueue
 # Stack and FIFOQueue are implemented as list and collection.deque
-# PriorityQueue is implemented here
+# PriorityQueue and BucketQueue are implemented here
 
 
 class PriorityQueue:
@@ -724,10 +724,15 @@ class PriorityQueue:
     order) is returned first.
     If order is 'min', the item with minimum f(x) is
     returned first; if order is 'max', then it is the item with maximum f(x).
-    Also supports dict-like lookup."""
+    Also supports dict-like lookup.
+    Items must be hashable: an index from item to its heap entries makes
+    membership and lookup O(1), and deletion is lazy (stale entries are
+    skipped on pop), so del + append works as an O(log n) decrease-key."""
 
     def __init__(self, order='min', f=lambda x: x):
         self.heap = []
+        self.index = {}  # item -> list of live (f(item), item) entries
+        self.size = 0
         if order == 'min':
             self.f = f
         elif order == 'max':  # now item with max f(x)
@@ -737,7 +742,10 @@ class PriorityQueue:
 
     def append(self, item):
         """Insert item at its correct position."""
-        heapq.heappush(self.heap, (self.f(item), item))
+        entry = (self.f(item), item)
+        heapq.heappush(self.heap, entry)
+        self.index.setdefault(item, []).append(entry)
+        self.size += 1
 
     def extend(self, items):
         """Insert each item in items at its correct position."""
@@ -747,36 +755,194 @@ class PriorityQueue:
     def pop(self):
         """Pop and return the item (with min or max f(x) value)
         depending on the order."""
-        if self.heap:
-            return heapq.heappop(self.heap)[1]
-        else:
-            raise Exception('Trying to pop from empty PriorityQueue.')
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            item = entry[1]
+            live = self.index.get(item)
+            if live is None:
+                continue
+            for i, e in enumerate(live):
+                if e is entry:
+                    break
+            else:
+                continue  # stale entry left behind by __delitem__
+            del live[i]
+            if not live:
+                del self.index[item]
+            self.size -= 1
+            return item
+        raise Exception('Trying to pop from empty PriorityQueue.')
 
     def __len__(self):
         """Return current capacity of PriorityQueue."""
-        return len(self.heap)
+        return self.size
 
     def __contains__(self, key):
         """Return True if the key is in PriorityQueue."""
-        return any([item == key for _, item in self.heap])
+        return key in self.index
 
     def __getitem__(self, key):
         """Returns the first value associated with key in PriorityQueue.
         Raises KeyError if key is not present."""
-        for value, item in self.heap:
-            if item == key:
-                return value
-        raise KeyError(str(key) + " is not in the priority queue")
+        try:
+            return self.index[key][0][0]
+        except KeyError:
+            raise KeyError(str(key) + " is not in the priority queue")
 
     def __delitem__(self, key):
         """Delete the first occurrence of key."""
         try:
-            del self.heap[[item == key for _, item in self.heap].index(True)]
-        except ValueError:
+            live = self.index[key]
+        except KeyError:
             raise KeyError(str(key) + " is not in the priority queue")
+        del live[0]
+        if not live:
+            del self.index[key]
+        self.size -= 1
+        if len(self.heap) > 2 * self.size + 64:
+            self._compact()
+
+    def _compact(self):
+        """Drop stale entries so the heap does not grow with deleted items."""
+        self.heap = [entry for live in self.index.values() for entry in live]
         heapq.heapify(self.heap)
 
 
+class BucketQueue:
+    """A PriorityQueue for small non-negative integer priorities (Dial's buckets).
+    Items are kept in buckets indexed by f(item) and, inside a bucket, in
+    stacks indexed by depth(item); pop returns an item of minimum f and, among
+    those, the deepest one (the most recently added on ties). Append and pop are
+    O(1) amortized: the cursor only moves forward while the minimum f does not
+    decrease (UCS, or A* with a consistent heuristic) and jumps back when a
+    smaller key is appended. Same dict-like interface as PriorityQueue, with
+    lazy deletion.
+    Pays off where the frontier is large and f is monotone (A*, UCS). Greedy
+    best-first search keeps a small frontier whose f jumps up and down, and
+    there the C heap of PriorityQueue is just as fast: keep the default."""
+
+    def __init__(self, order='min', f=lambda x: x, depth=lambda x: getattr(x, 'depth', 0)):
+        if order != 'min':
+            raise ValueError("BucketQueue only supports order='min'.")
+        self.f = f
+        self.depth = depth
+        self.buckets = []  # f -> {depth: stack of entries}, only non-empty stacks
+        self.top = []      # f -> deepest depth in the bucket (-1 when empty)
+        self.cursor = 0    # no live entry has f below the cursor
+        self.index = {}    # item -> list of live (f(item), item) entries
+        self.size = 0
+
+    def append(self, item):
+        """Insert item in the bucket of f(item)."""
+        key = self.f(item)
+        if type(key) is not int:
+            key = self._integer(key)
+        elif key < 0:
+            raise ValueError("BucketQueue needs non-negative integer priorities, got " + str(key))
+        depth = self.depth(item)
+        buckets = self.buckets
+        if key >= len(buckets):
+            buckets.extend({} for _ in range(key + 1 - len(buckets)))
+            self.top.extend([-1] * (key + 1 - len(self.top)))
+        stacks = buckets[key]
+        entry = (key, item)
+        stack = stacks.get(depth)
+        if stack is None:
+            stacks[depth] = [entry]
+            if depth > self.top[key]:
+                self.top[key] = depth
+        else:
+            stack.append(entry)
+        if key < self.cursor:
+            self.cursor = key
+        live = self.index.get(item)
+        if live is None:
+            self.index[item] = [entry]
+        else:
+            live.append(entry)
+        self.size += 1
+
+    @staticmethod
+    def _integer(value):
+        try:
+            key = int(value)
+        except (OverflowError, ValueError):
+            key = None
+        if key is None or key != value or key < 0:
+            raise ValueError("BucketQueue needs non-negative integer priorities, got " + str(value))
+        return key
+
+    def extend(self, items):
+        """Insert each item in items."""
+        for item in items:
+            self.append(item)
+
+    def pop(self):
+        """Pop and return the deepest item with minimum f(x)."""
+        buckets, top, index = self.buckets, self.top, self.index
+        cursor = self.cursor
+        while self.size:
+            stacks = buckets[cursor]
+            if not stacks:
+                cursor += 1
+                continue
+            d = top[cursor]
+            stack = stacks[d]
+            entry = stack.pop()
+            if not stack:
+                # Empty stacks are dropped, so the next deepest is the max of the
+                # depths still present (a handful per bucket) rather than a scan
+                del stacks[d]
+                top[cursor] = max(stacks) if stacks else -1
+            item = entry[1]
+            live = index.get(item)
+            if live is None:
+                continue
+            if live[0] is entry:
+                del live[0]
+            else:
+                for i, e in enumerate(live):
+                    if e is entry:
+                        break
+                else:
+                    continue  # stale entry left behind by __delitem__
+                del live[i]
+            if not live:
+                del index[item]
+            self.size -= 1
+            self.cursor = cursor
+            return item
+        self.cursor = cursor
+        raise Exception('Trying to pop from empty BucketQueue.')
+
+    def __len__(self):
+        """Return current capacity of BucketQueue."""
+        return self.size
+
+    def __contains__(self, key):
+        """Return True if the key is in BucketQueue."""
+        return key in self.index
+
+    def __getitem__(self, key):
+        """Returns the first value associated with key in BucketQueue.
+        Raises KeyError if key is not present."""
+        try:
+            return self.index[key][0][0]
+        except KeyError:
+            raise KeyError(str(key) + " is not in the bucket queue")
+
+    def __delitem__(self, key):
+        """Delete the first occurrence of key."""
+        try:
+            live = self.index[key]
+        except KeyError:
+            raise KeyError(str(key) + " is not in the bucket queue")
+        del live[0]
+        if not live:
+            del self.index[key]
+        self.size -= 1
+
+
 # ______________________________________________________________________________
 # Useful Shorthands
 